@@ -1,5 +1,68 @@
+import csv
+import io
+import json
+
+from django.http import JsonResponse
 from django.utils import timezone
-from rest_framework.renderers import JSONRenderer
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def build_envelope(data, status_code: int) -> dict:
+    """
+    API 공통 응답 형식(status, message, data, code, timestamp)으로 감쌉니다.
+
+    Args:
+        data: 응답 데이터. "error" 키가 있는 dict면 message로 옮기고 data는 None
+        status_code (int): HTTP 응답 코드
+
+    Returns:
+        dict: 공통 응답 형식 dict
+    """
+    # 오류 메시지 추출 (DRF 기본 에러 포맷 대응)
+    message = ""
+    if isinstance(data, dict) and "error" in data:
+        message = data["error"]
+        data = None
+    else:
+        message = "요청이 성공적으로 처리되었습니다."
+
+    # 커스텀 포맷 구성
+    return {
+        "status": "success" if 200 <= status_code < 400 else "error",
+        "message": message,
+        "data": data,
+        "code": status_code,
+        "timestamp": timezone.now().isoformat() + "Z",
+    }
+
+
+def envelope_response(data, status_code: int = 200) -> JsonResponse:
+    """DRF를 거치지 않는 (async) 뷰에서 CustomJSONRenderer와 같은 형식의 JSON 응답을 생성합니다."""
+    return JsonResponse(
+        build_envelope(data, status_code),
+        status=status_code,
+        encoder=JSONEncoder,
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+def envelope_json(payload: str, status_code: int = 200) -> str:
+    """
+    이미 직렬화된 JSON 문자열을 다시 파싱하지 않고 공통 응답 형식의 data로 끼워 넣습니다.
+
+    Args:
+        payload (str): data에 들어갈 JSON 문자열
+        status_code (int): HTTP 응답 코드
+
+    Returns:
+        str: CustomJSONRenderer와 같은 형식의 JSON 문자열
+    """
+    placeholder = "\x00payload"
+    envelope = json.dumps(
+        build_envelope(placeholder, status_code), cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+    )
+    return envelope.replace(json.dumps(placeholder), payload, 1)
 
 
 class CustomJSONRenderer(JSONRenderer):
@@ -10,21 +73,82 @@ class CustomJSONRenderer(JSONRenderer):
         response = renderer_context.get("response", None)
         status_code = response.status_code if response else 200
 
-        # 오류 메시지 추출 (DRF 기본 에러 포맷 대응)
-        message = ""
-        if isinstance(data, dict) and "error" in data:
-            message = data["error"]
-            data = None
-        else:
-            message = "요청이 성공적으로 처리되었습니다."
-
-        # 커스텀 포맷 구성
-        response_data = {
-            "status": "success" if 200 <= status_code < 400 else "error",
-            "message": message,
-            "data": data,
-            "code": status_code,
-            "timestamp": timezone.now().isoformat() + "Z",
-        }
-
-        return super().render(response_data, accepted_media_type, renderer_context)
+        return super().render(build_envelope(data, status_code), accepted_media_type, renderer_context)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    ?format=ndjson 요청용 렌더러입니다.
+
+    행 데이터는 뷰에서 StreamingHttpResponse로 직접 전송하며,
+    이 렌더러는 오류 등 일반 Response를 한 줄의 JSON으로 렌더링합니다.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + "\n").encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    ?format=csv 요청용 렌더러입니다.
+
+    행 데이터는 뷰에서 StreamingHttpResponse로 직접 전송하며,
+    이 렌더러는 오류 등 일반 Response(dict)를 헤더 + 한 행의 CSV로 렌더링합니다.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if isinstance(data, dict):
+            writer.writerow(data.keys())
+            writer.writerow(data.values())
+        elif data is not None:
+            writer.writerow([data])
+        return buffer.getvalue().encode(self.charset)
+
+
+class ArrowStreamRenderer(NDJSONRenderer):
+    """
+    ?format=arrow 요청용 렌더러입니다.
+
+    결과는 뷰에서 Arrow IPC stream으로 직접 전송하며, 이 렌더러는 오류 응답만 JSON으로 렌더링합니다.
+    """
+
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+
+
+class ParquetRenderer(NDJSONRenderer):
+    """
+    ?format=parquet 요청용 렌더러입니다.
+
+    결과는 뷰에서 Parquet으로 직접 전송하며, 이 렌더러는 오류 응답만 JSON으로 렌더링합니다.
+    """
+
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Accept: text/event-stream 요청용 렌더러입니다.
+
+    이벤트는 뷰에서 StreamingHttpResponse로 직접 전송하며,
+    이 렌더러는 오류 등 일반 Response를 하나의 error 이벤트로 렌더링합니다.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+        return f"event: error\ndata: {payload}\n\n".encode(self.charset)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import json
 import os
 from pathlib import Path
 
@@ -35,6 +36,7 @@ ALLOWED_HOSTS = ["*"]
 # Application definition
 
 INSTALLED_APPS = [
+    "daphne",  # runserver를 ASGI(app.asgi)로 실행 (django.contrib.staticfiles보다 먼저 등록)
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -82,6 +84,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "app.wsgi.application"
+ASGI_APPLICATION = "app.asgi.application"
 
 
 # Database
@@ -151,6 +154,141 @@ REST_FRAMEWORK = {
         "rest_framework.parsers.JSONParser",
     ],
 }
+# 대상 DB 커넥션 풀 설정 (프로세스 단위)
+DDP_CONNECTION_POOL = {
+    "MIN_SIZE": int(os.environ.get("DDP_POOL_MIN_SIZE", 0)),  # 유지할 최소 유휴 커넥션 수
+    "MAX_SIZE": int(os.environ.get("DDP_POOL_MAX_SIZE", 10)),  # 풀당 최대 커넥션 수
+    "IDLE_TIMEOUT": float(os.environ.get("DDP_POOL_IDLE_TIMEOUT", 300)),  # 유휴 커넥션 정리 시간(초)
+    "ACQUIRE_TIMEOUT": float(os.environ.get("DDP_POOL_ACQUIRE_TIMEOUT", 30)),  # 커넥션 대여 대기 시간(초)
+}
+
+# 테이블 메타데이터 추출 설정
+DDP_META_EXTRACTION = {
+    "MAX_WORKERS": int(os.environ.get("DDP_META_EXTRACTION_WORKERS", 4)),  # 동시에 추출할 스키마 수 (풀 MAX_SIZE 이하)
+    "IMPORT_BATCH_SIZE": int(
+        os.environ.get("DDP_META_IMPORT_BATCH_SIZE", 2000)
+    ),  # 카탈로그 저장 시 INSERT 한 번에 담을 행 수
+}
+
+# 읽기 전용 작업의 replica 라우팅 설정 (connection_info에 replicas가 있는 경우)
+DDP_REPLICA_ROUTING = {
+    "MAX_LAG": float(
+        os.environ.get("DDP_REPLICA_MAX_LAG", 30)
+    ),  # 허용 복제 지연(초), connection_info의 max_replica_lag 우선
+    "LAG_CHECK_INTERVAL": float(os.environ.get("DDP_REPLICA_LAG_CHECK_INTERVAL", 5)),  # 복제 지연 확인 주기(초)
+    "RETRY_AFTER": float(os.environ.get("DDP_REPLICA_RETRY_AFTER", 30)),  # 접속 실패한 replica 제외 시간(초)
+}
+
+# 쿼리 실행 설정 (mode=stream)
+DDP_QUERY_EXECUTION = {
+    "FETCH_SIZE": int(os.environ.get("DDP_QUERY_FETCH_SIZE", 1000)),  # fetchmany 단위 행 수
+    "MAX_ROWS": int(os.environ.get("DDP_QUERY_MAX_ROWS", 10000)),  # 반환할 최대 행 수
+    "MAX_BYTES": int(os.environ.get("DDP_QUERY_MAX_BYTES", 16 * 1024 * 1024)),  # 반환할 최대 결과 크기(byte)
+}
+
+# 쿼리 실행 프로파일 (Database.execution_profile로 선택)
+DDP_EXECUTION_PROFILES = {
+    "default": {
+        "MAX_EXECUTION_TIME": int(os.environ.get("DDP_QUERY_MAX_EXECUTION_TIME", 30000)),  # SELECT 최대 실행 시간(ms)
+        "LOCK_WAIT_TIMEOUT": int(os.environ.get("DDP_QUERY_LOCK_WAIT_TIMEOUT", 10)),  # InnoDB 락 대기 시간(초)
+        "ISOLATION_LEVEL": "REPEATABLE READ",  # CONSISTENT SNAPSHOT은 REPEATABLE READ에서만 유효
+        "READ_ONLY": True,
+        "CONSISTENT_SNAPSHOT": True,
+    },
+    "long_running": {
+        "MAX_EXECUTION_TIME": int(os.environ.get("DDP_QUERY_LONG_MAX_EXECUTION_TIME", 300000)),
+        "LOCK_WAIT_TIMEOUT": int(os.environ.get("DDP_QUERY_LOCK_WAIT_TIMEOUT", 10)),
+        "ISOLATION_LEVEL": "REPEATABLE READ",
+        "READ_ONLY": True,
+        "CONSISTENT_SNAPSHOT": True,
+    },
+}
+
+# 쿼리 실행 전 EXPLAIN 비용 확인 설정
+DDP_QUERY_PREFLIGHT = {
+    "ENABLED": os.environ.get("DDP_QUERY_PREFLIGHT_ENABLED", "true").lower() == "true",
+    "MAX_ROWS_EXAMINED": int(os.environ.get("DDP_QUERY_MAX_ROWS_EXAMINED", 10_000_000)),  # 예상 읽기 행 수 상한
+    "FULL_SCAN_ROWS": int(os.environ.get("DDP_QUERY_FULL_SCAN_ROWS", 1_000_000)),  # 허용하지 않을 전체 스캔 행 수
+    "MAX_QUERY_COST": float(os.environ.get("DDP_QUERY_MAX_QUERY_COST", 0)),  # 예상 비용 상한 (0이면 확인 안 함)
+    "ACTION": os.environ.get("DDP_QUERY_PREFLIGHT_ACTION", "confirm"),  # 초과 시 confirm(확인 후 실행) 또는 reject
+}
+
+# 쿼리 결과 캐시 설정 (프로세스 단위 LRU)
+DDP_RESULT_CACHE = {
+    "ENABLED": os.environ.get("DDP_RESULT_CACHE_ENABLED", "true").lower() == "true",
+    "TTL": float(os.environ.get("DDP_RESULT_CACHE_TTL", 300)),  # 최대 보관 시간(초)
+    "MAX_ENTRIES": int(os.environ.get("DDP_RESULT_CACHE_MAX_ENTRIES", 256)),  # 최대 항목 수
+    "MAX_BYTES": int(os.environ.get("DDP_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)),  # 최대 추정 크기(byte)
+    "REVALIDATE_AFTER": float(os.environ.get("DDP_RESULT_CACHE_REVALIDATE_AFTER", 5)),  # UPDATE_TIME 재확인 주기(초)
+}
+
+# 테이블별 프롬프트 블록 캐시 설정 (Database.metadata_version이 바뀌면 다시 생성)
+DDP_PROMPT_CACHE = {
+    "ENABLED": os.environ.get("DDP_PROMPT_CACHE_ENABLED", "true").lower() == "true",
+    "MAX_DATABASES": int(os.environ.get("DDP_PROMPT_CACHE_MAX_DATABASES", 32)),  # 캐시할 최대 Database 수
+}
+
+# 테이블 선택기 호출 전 로컬 BM25 색인으로 후보 테이블을 줄이는 설정
+DDP_TABLE_RETRIEVAL = {
+    "ENABLED": os.environ.get("DDP_TABLE_RETRIEVAL_ENABLED", "true").lower() == "true",
+    "TOP_K": int(os.environ.get("DDP_TABLE_RETRIEVAL_TOP_K", 30)),  # 선택기에 전달할 최대 후보 테이블 수
+    "DECISIVE_MAX_TABLES": int(
+        os.environ.get("DDP_TABLE_RETRIEVAL_DECISIVE_MAX", 3)
+    ),  # 선택기 없이 사용할 최대 테이블 수
+    "DECISIVE_RATIO": float(os.environ.get("DDP_TABLE_RETRIEVAL_DECISIVE_RATIO", 3.0)),  # 상위/다음 점수 배수
+}
+
+# 전체 카탈로그가 작으면 테이블 선택기 호출 없이 전체 메타 정보를 사용하는 설정
+DDP_SELECTOR_BYPASS = {
+    "ENABLED": os.environ.get("DDP_SELECTOR_BYPASS_ENABLED", "true").lower() == "true",
+    "MAX_CATALOG_TOKENS": int(
+        os.environ.get("DDP_SELECTOR_BYPASS_MAX_TOKENS", 3000)
+    ),  # 선택기를 생략할 전체 meta_info 최대 토큰 수
+}
+
+# 선택된 테이블 사이의 FK 조인 경로 보완 설정
+DDP_JOIN_EXPANSION = {
+    "ENABLED": os.environ.get("DDP_JOIN_EXPANSION_ENABLED", "true").lower() == "true",
+    "MAX_HOPS": int(os.environ.get("DDP_JOIN_EXPANSION_MAX_HOPS", 3)),  # 두 테이블 사이에 허용할 최대 조인 수
+}
+
+# SQL 생성 프롬프트의 meta_info 토큰 예산 (초과 시 설명 절단 + 질문과 관련 없는 컬럼 생략)
+DDP_PROMPT_BUDGET = {
+    "META_TOKENS": int(os.environ.get("DDP_PROMPT_META_TOKENS", 6000)),  # meta_info 최대 토큰 수
+    "MAX_DESCRIPTION_CHARS": int(os.environ.get("DDP_PROMPT_MAX_DESCRIPTION_CHARS", 200)),  # 설명 최대 길이
+    "ENCODING": os.environ.get("DDP_PROMPT_TOKEN_ENCODING", "o200k_base"),  # tiktoken 인코딩
+}
+
+# 정규화한 질문 → 실행에 성공한 SQL 캐시 설정 (적중 시 테이블 선택/SQL 생성 LLM 호출 생략)
+DDP_SQL_CACHE = {
+    "ENABLED": os.environ.get("DDP_SQL_CACHE_ENABLED", "true").lower() == "true",
+    "TTL": float(os.environ.get("DDP_SQL_CACHE_TTL", 7 * 24 * 3600)),  # 최대 보관 시간(초)
+    "SYNONYMS": json.loads(os.environ.get("DDP_SQL_CACHE_SYNONYMS", "{}")),  # 동의어 사전 JSON {"top": "상위"}
+}
+
+# 결과 요약 전 로컬 통계 요약 설정 (요약 프롬프트에 행 전체 대신 통계와 표본 행 전달)
+DDP_RESULT_PROFILE = {
+    "TOP_K": int(os.environ.get("DDP_RESULT_PROFILE_TOP_K", 5)),  # 범주 컬럼별 빈도 상위 값 개수
+    "SAMPLE_ROWS": int(os.environ.get("DDP_RESULT_PROFILE_SAMPLE_ROWS", 10)),  # 표본 행 수
+    "MAX_BUCKETS": int(os.environ.get("DDP_RESULT_PROFILE_MAX_BUCKETS", 24)),  # 시계열 추이 버킷 최대 개수
+}
+
+# LLM(OpenAI) HTTP 클라이언트 설정 (프로세스 내 모든 에이전트가 커넥션 풀을 공유)
+DDP_LLM_CLIENT = {
+    "MAX_CONNECTIONS": int(os.environ.get("DDP_LLM_MAX_CONNECTIONS", 20)),  # 최대 동시 커넥션 수
+    "MAX_KEEPALIVE_CONNECTIONS": int(os.environ.get("DDP_LLM_MAX_KEEPALIVE", 10)),  # 유지할 keep-alive 커넥션 수
+    "KEEPALIVE_EXPIRY": float(os.environ.get("DDP_LLM_KEEPALIVE_EXPIRY", 60)),  # keep-alive 유지 시간(초)
+    "TIMEOUT": float(os.environ.get("DDP_LLM_TIMEOUT", 60)),  # 요청 타임아웃(초)
+    "MAX_RETRIES": int(os.environ.get("DDP_LLM_MAX_RETRIES", 2)),  # 재시도 횟수
+}
+
+# 비동기 쿼리 작업 설정
+DDP_QUERY_JOBS = {
+    "MAX_WORKERS": int(os.environ.get("DDP_QUERY_JOB_WORKERS", 4)),  # 동시에 실행할 최대 작업 수
+    "MAX_PENDING": int(os.environ.get("DDP_QUERY_JOB_MAX_PENDING", 32)),  # 실행 대기 가능한 최대 작업 수
+    "RESULT_TTL": float(os.environ.get("DDP_QUERY_JOB_RESULT_TTL", 3600)),  # 작업 결과 보관 시간(초)
+}
+
 # 로깅
 LOGGING = {
     "version": 1,
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+def _close_in_thread(iterator):
+    """제너레이터를 닫고(GeneratorExit) 이 스레드에서 연 ORM 커넥션을 정리합니다."""
+    try:
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+    finally:
+        connections.close_all()
+
+
+class ThreadedIterator:
+    """
+    sync iterator를 조각마다 한 번씩 전용 스레드에서 진행시키는 async iterator입니다.
+
+    ASGI에서 StreamingHttpResponse에 sync iterator를 넘기면 Django가 sync_to_async(list)로
+    전체를 읽은 뒤에야 전송을 시작합니다. 여기서는 조각마다 next를 sync_to_async로 호출하므로
+    생성된 조각이 바로 전송되고 메모리에는 한 조각만 유지됩니다.
+
+    제너레이터는 항상 같은 스레드에서 실행되므로 MySQL 커넥션과 스레드 로컬 ORM 커넥션을
+    그대로 사용할 수 있습니다. 끝까지 읽거나, 클라이언트가 연결을 끊어 취소되거나, 응답이 닫히면
+    (StreamingHttpResponse.close가 close를 호출) 진행 중인 조각이 끝난 뒤 그 스레드에서 닫힙니다.
+    """
+
+    def __init__(self, iterator):
+        """
+        Args:
+            iterator: 응답 조각을 생성하는 sync iterator (제너레이터)
+        """
+        self.iterator = iterator
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream")
+        self.next_chunk = sync_to_async(next, thread_sensitive=False, executor=self.executor)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed:
+            raise StopAsyncIteration
+        try:
+            chunk = await self.next_chunk(self.iterator, _DONE)
+        except BaseException:  # 취소(CancelledError) 포함
+            self.close()
+            raise
+        if chunk is _DONE:
+            self.close()
+            raise StopAsyncIteration
+        return chunk
+
+    def close(self):
+        """실행 중인 조각이 끝난 뒤 같은 스레드에서 제너레이터를 닫도록 예약합니다. (기다리지 않음)"""
+        if not self.closed:
+            self.closed = True
+            self.executor.submit(_close_in_thread, self.iterator)
+            self.executor.shutdown(wait=False)
+
+
+def streaming_response(request, iterator, **kwargs) -> StreamingHttpResponse:
+    """
+    sync iterator로 StreamingHttpResponse를 생성합니다.
+
+    ASGI 요청이면 ThreadedIterator로 감싸 조각 단위로 전송하고, WSGI 요청이면 그대로 사용합니다.
+
+    Args:
+        request: HTTP 요청 객체 (DRF Request 또는 HttpRequest)
+        iterator: 응답 조각을 생성하는 sync iterator
+        **kwargs: StreamingHttpResponse 인자 (content_type 등)
+
+    Returns:
+        StreamingHttpResponse: 스트리밍 응답
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        iterator = ThreadedIterator(iterator)
+    return StreamingHttpResponse(iterator, **kwargs)
@@ -0,0 +1,175 @@
+"""
+SQL 생성 API 동시 처리량 벤치마크 (WSGI 동기 뷰 vs ASGI 비동기 뷰)
+
+지연 시간이 고정된 가짜 OpenAI 엔드포인트(httpx MockTransport)를 LLM 클라이언트 레지스트리에 연결하고
+같은 질문을 동시에 요청해 처리 시간, 처리량, 응답 시간, 최대 동시 LLM 요청 수를 비교합니다.
+
+- WSGI: WSGIHandler(django.test.Client) + 동기 SQLGenerationView를 워커 스레드 수(--threads)만큼 병렬 실행
+  (gunicorn gthread 워커 하나와 같은 모델로, 동시 LLM 요청 수는 스레드 수로 제한됩니다.)
+- ASGI: ASGIHandler(django.test.AsyncClient) + AsyncSQLGenerationView를 하나의 이벤트 루프에서 동시 실행
+
+테이블 선택기/SQL 생성기 호출 2번이 모두 --latency만큼 걸리도록 하며, 질문 캐시(DDP_SQL_CACHE)는 끕니다.
+벤치마크가 저장한 LLMLog(model_name "benchmark")는 종료 시 삭제합니다.
+
+실행 (ddp-api 디렉토리에서):
+    poetry run python -m benchmarks.llm_concurrency_benchmark --database-id 1 --requests 200 --latency 0.5 --threads 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+import httpx
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")  # 가짜 엔드포인트만 호출
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import AsyncClient, Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from llm.agents.registry import llm_registry  # noqa: E402
+from llm.models import LLMLog  # noqa: E402
+from llm.services.prompt_cache import get_catalog_prompt  # noqa: E402
+
+
+class FakeChatCompletions:
+    """고정 지연 후 테이블 선택기/SQL 생성기 형식의 응답을 반환하는 가짜 Chat Completions 엔드포인트입니다."""
+
+    def __init__(self, latency: float, table_id: int):
+        self.latency = latency
+        self.table_id = table_id
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _response(self, request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        if "relevant_tables" in prompt:
+            content = json.dumps({"relevant_tables": [self.table_id]})
+        else:
+            content = json.dumps({"query": "SELECT 1;", "result": "SUCCESS"})
+        return httpx.Response(
+            200,
+            json={
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "benchmark",
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                ],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110},
+            },
+        )
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self._enter()
+        try:
+            time.sleep(self.latency)
+            return self._response(request)
+        finally:
+            self._exit()
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency)
+            return self._response(request)
+        finally:
+            self._exit()
+
+
+def run_wsgi(url: str, body: str, requests: int, threads: int) -> list[float]:
+    local = threading.local()
+
+    def call(_) -> float:
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.post(url, data=body, content_type="application/json")
+        assert response.status_code == 200, response.content
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(call, range(requests)))
+
+
+async def run_asgi(url: str, body: str, requests: int) -> list[float]:
+    client = AsyncClient()
+
+    async def call() -> float:
+        start = time.perf_counter()
+        response = await client.post(url, data=body, content_type="application/json")
+        assert response.status_code == 200, response.content
+        return (time.perf_counter() - start) * 1000
+
+    return await asyncio.gather(*(call() for _ in range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-id", type=int, required=True, help="테이블 메타데이터가 등록된 Database ID")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5, help="LLM 호출 1번의 지연 시간(초)")
+    parser.add_argument("--threads", type=int, default=8, help="WSGI 워커 스레드 수")
+    parser.add_argument("--question", default="이번 달 매출 상위 5개 상품")
+    args = parser.parse_args()
+
+    setup_test_environment()  # django.test.Client의 testserver 호스트 허용
+    settings.DDP_SQL_CACHE = {**getattr(settings, "DDP_SQL_CACHE", {}), "ENABLED": False}
+
+    catalog = get_catalog_prompt(args.database_id)
+    if not catalog.fragments:
+        raise SystemExit(f"Database(id={args.database_id})에 컬럼이 등록된 테이블이 없습니다.")
+    fake = FakeChatCompletions(args.latency, next(iter(catalog.fragments)))
+    llm_registry.use_transports(httpx.MockTransport(fake.handle), httpx.MockTransport(fake.ahandle))
+
+    body = json.dumps({"question": args.question}, ensure_ascii=False)
+    cases = {
+        "wsgi (sync)": lambda: run_wsgi(
+            reverse("generate-sql", args=[args.database_id]), body, args.requests, args.threads
+        ),
+        "asgi (async)": lambda: asyncio.run(
+            run_asgi(reverse("async-generate-sql", args=[args.database_id]), body, args.requests)
+        ),
+    }
+
+    print(f"requests={args.requests}, llm latency={args.latency}s x 2 calls, wsgi threads={args.threads}")
+    print(f"{'server':<14}{'total(s)':>10}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'peak llm':>10}")
+    try:
+        for name, run in cases.items():
+            fake.peak = 0
+            start = time.perf_counter()
+            timings = sorted(run())
+            total = time.perf_counter() - start
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(
+                f"{name:<14}{total:>10.2f}{len(timings) / total:>10.1f}"
+                f"{statistics.median(timings):>10.0f}{p95:>10.0f}{fake.peak:>10}"
+            )
+            llm_registry.use_transports(httpx.MockTransport(fake.handle), httpx.MockTransport(fake.ahandle))
+    finally:
+        llm_registry.use_transports()
+        LLMLog.objects.filter(model_name="benchmark").delete()
+
+
+if __name__ == "__main__":
+    main()
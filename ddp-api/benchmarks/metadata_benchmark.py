@@ -0,0 +1,171 @@
+"""
+테이블 메타데이터 추출 벤치마크 (information_schema JOIN vs 분리 조회 + 메모리 결합)
+
+합성 스키마(기본 10,000개 테이블)를 대상으로 기존 get_table_meta의 단일 LEFT JOIN 쿼리와
+tables/columns/key_column_usage를 따로 읽어 join_table_meta로 결합하는 방식을 비교하고,
+(스키마, 테이블, 컬럼)당 한 행만 생성되는지 확인합니다.
+
+합성 테이블은 UNIQUE + FK가 함께 걸린 parent_id 컬럼을 가지므로, 기존 JOIN 방식에서는
+key_column_usage 행 수만큼 컬럼 행이 중복됩니다.
+
+실행 (ddp-api 디렉토리에서):
+    # MySQL 서버에 합성 스키마 생성 후 측정 (CREATE/DROP 권한 필요)
+    poetry run python -m benchmarks.metadata_benchmark \\
+        --connection-info '{"host": "127.0.0.1", "user": "root", "password": "admin"}' --setup --tables 10000
+
+    # MySQL 없이 메모리 결합(join_table_meta) 비용만 측정
+    poetry run python -m benchmarks.metadata_benchmark --offline --tables 10000
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+django.setup()
+
+from ddp.utils.mysql_connector import MySQLConnector, join_table_meta  # noqa: E402
+
+SCHEMA = "ddp_meta_bench"
+COLUMNS_PER_TABLE = 8
+
+# 변경 전 get_table_meta의 단일 JOIN 쿼리
+LEGACY_SQL = """
+    SELECT
+        c.table_schema AS schema_name,
+        c.table_name AS table_name,
+        t.table_comment AS table_description,
+        c.column_name AS name,
+        c.column_comment AS description,
+        c.column_type AS data_type,
+        c.column_default AS default_value,
+        c.ordinal_position AS column_seq,
+        CASE c.is_nullable WHEN 'YES' THEN TRUE ELSE FALSE END AS is_nullable,
+        CASE c.column_key WHEN 'PRI' THEN TRUE ELSE FALSE END AS is_primary_key,
+        CASE c.column_key WHEN 'UNI' THEN TRUE ELSE FALSE END AS is_unique,
+        CASE WHEN k.referenced_table_name IS NOT NULL THEN TRUE ELSE FALSE END AS is_foreign_key,
+        k.referenced_table_name AS foreign_key_table,
+        k.referenced_column_name AS foreign_key_column
+    FROM information_schema.columns c
+    LEFT JOIN information_schema.key_column_usage k
+        ON c.table_schema = k.TABLE_SCHEMA AND c.table_name = k.TABLE_NAME AND c.column_name = k.COLUMN_NAME
+    LEFT JOIN information_schema.tables t
+        ON c.table_schema = t.TABLE_SCHEMA AND c.table_name = t.TABLE_NAME
+    WHERE c.table_schema IN (%s)
+    ORDER BY c.table_schema, c.table_name, c.ordinal_position
+"""
+
+
+def table_ddl(index: int) -> str:
+    parent = f"t{index - 1:05d}" if index else None
+    extra_columns = ", ".join(f"c{i} VARCHAR(64) COMMENT 'column {i}'" for i in range(COLUMNS_PER_TABLE - 2))
+    foreign_key = (
+        f", UNIQUE KEY uq_parent (parent_id), FOREIGN KEY (parent_id) REFERENCES {parent}(id)" if parent else ""
+    )
+    return (
+        f"CREATE TABLE {SCHEMA}.t{index:05d} (id INT PRIMARY KEY, parent_id INT, {extra_columns}{foreign_key}) "
+        f"COMMENT 'benchmark table {index}'"
+    )
+
+
+def setup_schema(connector: MySQLConnector, table_count: int):
+    connector.execute(f"DROP DATABASE IF EXISTS {SCHEMA}")
+    connector.execute(f"CREATE DATABASE {SCHEMA}")
+    start = time.perf_counter()
+    for index in range(table_count):
+        connector.cursor.execute(table_ddl(index))
+        if index and index % 1000 == 0:
+            print(f"  created {index} tables ({time.perf_counter() - start:.0f}s)")
+
+
+def duplicate_count(rows) -> int:
+    keys = Counter((row["schema_name"], row["table_name"], row["name"]) for row in rows)
+    return sum(count - 1 for count in keys.values() if count > 1)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_online(connection_info: str, table_count: int, setup: bool, drop: bool):
+    with MySQLConnector(connection_info=connection_info) as connector:
+        if setup:
+            print(f"creating {table_count} tables in {SCHEMA} ...")
+            setup_schema(connector, table_count)
+
+        legacy, legacy_ms = timed(lambda: connector.query(LEGACY_SQL, [SCHEMA]))
+        decomposed, decomposed_ms = timed(lambda: connector.get_table_meta(schema_list=[SCHEMA]))
+
+        if drop:
+            connector.execute(f"DROP DATABASE IF EXISTS {SCHEMA}")
+
+    print(f"{'method':<22}{'rows':>10}{'duplicates':>12}{'time(ms)':>12}")
+    print(f"{'LEFT JOIN (legacy)':<22}{len(legacy):>10,}{duplicate_count(legacy):>12,}{legacy_ms:>12.1f}")
+    print(f"{'decomposed + hash':<22}{len(decomposed):>10,}{duplicate_count(decomposed):>12,}{decomposed_ms:>12.1f}")
+    print(f"speedup: {legacy_ms / decomposed_ms:.1f}x")
+    assert duplicate_count(decomposed) == 0, "decomposed metadata contains duplicate column rows"
+
+
+def run_offline(table_count: int):
+    tables, columns, foreign_keys = [], [], []
+    for index in range(table_count):
+        name = f"t{index:05d}"
+        tables.append({"schema_name": SCHEMA, "table_name": name, "table_description": f"benchmark table {index}"})
+        for seq in range(1, COLUMNS_PER_TABLE + 1):
+            column = ["id", "parent_id", *(f"c{i}" for i in range(COLUMNS_PER_TABLE - 2))][seq - 1]
+            columns.append(
+                {
+                    "schema_name": SCHEMA,
+                    "table_name": name,
+                    "name": column,
+                    "description": "",
+                    "data_type": "int" if seq <= 2 else "varchar(64)",
+                    "default_value": None,
+                    "column_seq": seq,
+                    "is_nullable": "NO" if seq == 1 else "YES",
+                    "column_key": {1: "PRI", 2: "UNI"}.get(seq, ""),
+                }
+            )
+        if index:
+            foreign_keys.append(
+                {
+                    "schema_name": SCHEMA,
+                    "table_name": name,
+                    "name": "parent_id",
+                    "foreign_key_table": f"t{index - 1:05d}",
+                    "foreign_key_column": "id",
+                }
+            )
+
+    rows, elapsed_ms = timed(lambda: join_table_meta(tables, columns, foreign_keys))
+    print(f"join_table_meta: tables={table_count:,}, rows={len(rows):,}, {elapsed_ms:.1f}ms")
+    assert duplicate_count(rows) == 0, "joined metadata contains duplicate column rows"
+    assert len(rows) == len(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connection-info", help="MySQL 접속 정보 JSON")
+    parser.add_argument("--tables", type=int, default=10000)
+    parser.add_argument("--setup", action="store_true", help=f"{SCHEMA} 스키마를 새로 생성")
+    parser.add_argument("--drop", action="store_true", help=f"측정 후 {SCHEMA} 스키마 삭제")
+    parser.add_argument("--offline", action="store_true", help="MySQL 없이 메모리 결합만 측정")
+    args = parser.parse_args()
+
+    if args.offline:
+        run_offline(args.tables)
+    elif args.connection_info:
+        json.loads(args.connection_info)  # 형식 확인
+        run_online(args.connection_info, args.tables, args.setup, args.drop)
+    else:
+        parser.error("--connection-info 또는 --offline이 필요합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+execute-sql 결과 형태(shape)별 페이로드 크기/직렬화 시간 벤치마크
+
+기존 dict 행(rows) 형태와 columnar/tuples 압축 형태를 같은 합성 데이터로 비교합니다.
+dict 행은 DictCursor가 반환하는 형태 그대로, 압축 형태는 튜플 커서 결과에서
+to_compact_result로 변환하는 비용까지 포함해 측정합니다.
+
+실행 (ddp-api 디렉토리에서):
+    poetry run python -m benchmarks.result_payload_benchmark --rows 10000 --cols 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+django.setup()
+
+from llm.tools.result_formatter import to_compact_result  # noqa: E402
+from rest_framework.utils.encoders import JSONEncoder  # noqa: E402
+
+# (MySQL 타입명, 값 생성 함수) - 주문/매출 조회 결과와 비슷한 컬럼 구성
+COLUMN_KINDS = [
+    ("long", lambda i: i),
+    ("var_string", lambda i: f"product-{random.randint(1, 5000)}"),
+    ("newdecimal", lambda i: Decimal(random.randint(100, 10_000_000)) / 100),
+    ("datetime", lambda i: datetime(2025, 1, 1) + timedelta(seconds=random.randint(0, 31_536_000))),
+    ("date", lambda i: date(2025, 1, 1) + timedelta(days=random.randint(0, 364))),
+    ("longlong", lambda i: random.randint(0, 1_000_000)),
+    ("double", lambda i: random.random() * 1000),
+]
+
+
+def make_dataset(row_count: int, col_count: int):
+    kinds = [COLUMN_KINDS[i % len(COLUMN_KINDS)] for i in range(col_count)]
+    columns = [{"name": f"{kind[0]}_column_{i}", "type": kind[0]} for i, kind in enumerate(kinds)]
+    tuples = [tuple(make(i) for _, make in kinds) for i in range(row_count)]
+    return columns, tuples
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    timings = []
+    payload = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(42)
+    columns, tuples = make_dataset(args.rows, args.cols)
+    names = [column["name"] for column in columns]
+    dict_rows = [dict(zip(names, row)) for row in tuples]  # DictCursor 결과와 동일한 형태
+
+    def dump(data) -> bytes:
+        # CustomJSONRenderer(DRF JSONRenderer)와 같은 인코더 사용
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    cases = {
+        "rows (dict)": lambda: dump({"columns": names, "rows": dict_rows}),
+        "columnar": lambda: dump(to_compact_result(columns, tuples, "columnar")),
+        "tuples": lambda: dump(to_compact_result(columns, tuples, "tuples")),
+    }
+
+    print(f"rows={args.rows}, cols={args.cols}, repeat={args.repeat} (median)")
+    print(f"{'shape':<14}{'bytes':>14}{'ratio':>9}{'time(ms)':>12}{'ratio':>9}")
+    base_ms, base_bytes = None, None
+    for name, fn in cases.items():
+        elapsed_ms, size = measure(fn, args.repeat)
+        base_ms, base_bytes = base_ms or elapsed_ms, base_bytes or size
+        print(f"{name:<14}{size:>14,}{size / base_bytes:>9.2f}{elapsed_ms:>12.1f}{elapsed_ms / base_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
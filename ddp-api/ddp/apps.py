@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DdpConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ddp"
+
+    def ready(self):
+        from ddp import signals  # noqa: F401
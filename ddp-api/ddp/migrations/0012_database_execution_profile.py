@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0011_rename_eng_name_column_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="database",
+            name="execution_profile",
+            field=models.CharField(
+                db_comment="쿼리 실행 프로파일 (settings.DDP_EXECUTION_PROFILES의 키)", default="default", max_length=64
+            ),
+        ),
+    ]
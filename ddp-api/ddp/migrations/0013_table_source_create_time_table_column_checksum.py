@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0012_database_execution_profile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="table",
+            name="source_create_time",
+            field=models.DateTimeField(blank=True, db_comment="원본 테이블 CREATE_TIME", null=True),
+        ),
+        migrations.AddField(
+            model_name="table",
+            name="column_checksum",
+            field=models.CharField(blank=True, db_comment="원본 컬럼/FK 정의 checksum", max_length=64, null=True),
+        ),
+    ]
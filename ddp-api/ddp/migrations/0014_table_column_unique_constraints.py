@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:10
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """unique 제약 추가 전, 같은 키의 테이블/컬럼 중 가장 먼저 저장된 행만 남깁니다."""
+    Table = apps.get_model("ddp", "Table")
+    Column = apps.get_model("ddp", "Column")
+
+    duplicated_tables = (
+        Table.objects.values("database_id", "schema_name", "name")
+        .annotate(keep_id=Min("id"), count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicated_tables:
+        duplicates = Table.objects.filter(
+            database_id=row["database_id"], schema_name=row["schema_name"], name=row["name"]
+        ).exclude(id=row["keep_id"])
+        # 남길 테이블에 없는 컬럼은 옮기고 나머지는 테이블과 함께 삭제
+        kept_columns = set(Column.objects.filter(table_id=row["keep_id"]).values_list("name", flat=True))
+        Column.objects.filter(table__in=duplicates).exclude(name__in=kept_columns).update(table_id=row["keep_id"])
+        duplicates.delete()
+
+    duplicated_columns = (
+        Column.objects.values("table_id", "name")
+        .annotate(keep_id=Min("id"), count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicated_columns:
+        Column.objects.filter(table_id=row["table_id"], name=row["name"]).exclude(id=row["keep_id"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0013_table_source_create_time_table_column_checksum"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="table",
+            constraint=models.UniqueConstraint(
+                fields=("database", "schema_name", "name"), name="uniq_table_database_schema_name"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="column",
+            constraint=models.UniqueConstraint(fields=("table", "name"), name="uniq_column_table_name"),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0014_table_column_unique_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="database",
+            name="metadata_version",
+            field=models.PositiveIntegerField(default=0, db_comment="Table/Column 변경 시 증가하는 카탈로그 버전"),
+        ),
+        migrations.CreateModel(
+            name="CatalogSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(max_length=16)),
+                (
+                    "version",
+                    models.PositiveIntegerField(db_comment="스냅샷 생성 시점의 Database.metadata_version"),
+                ),
+                ("payload", models.TextField(db_comment="직렬화된 카탈로그 JSON")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "database",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="ddp.database"),
+                ),
+            ],
+            options={
+                "db_table": "catalog_snapshot",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("database", "kind", "version"), name="uniq_catalog_snapshot_version"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -6,6 +6,10 @@ class Database(models.Model):
     description = models.TextField(db_comment="데이터베이스 설명")
     connection_info = models.TextField(blank=True, null=True, db_comment="데이터베이스 접속 정보 JSON 문자열")
     db_type = models.CharField(max_length=255, blank=True, null=True, db_comment="DB 종류")
+    execution_profile = models.CharField(
+        max_length=64, default="default", db_comment="쿼리 실행 프로파일 (settings.DDP_EXECUTION_PROFILES의 키)"
+    )
+    metadata_version = models.PositiveIntegerField(default=0, db_comment="Table/Column 변경 시 증가하는 카탈로그 버전")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -18,9 +22,16 @@ class Table(models.Model):
     schema_name = models.CharField(max_length=255, blank=False, null=False)
     name = models.CharField(max_length=255, blank=False, null=False)
     description = models.TextField()
+    source_create_time = models.DateTimeField(blank=True, null=True, db_comment="원본 테이블 CREATE_TIME")
+    column_checksum = models.CharField(max_length=64, blank=True, null=True, db_comment="원본 컬럼/FK 정의 checksum")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["database", "schema_name", "name"], name="uniq_table_database_schema_name"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -41,5 +52,27 @@ class Column(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["table", "name"], name="uniq_column_table_name"),
+        ]
+
     def __str__(self):
         return self.name
+
+
+class CatalogSnapshot(models.Model):
+    KIND_META = "meta"  # 테이블 + 컬럼 (TableMetaView)
+    KIND_TABLES = "tables"  # 테이블 목록 (TableView)
+
+    database = models.ForeignKey(Database, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=16)
+    version = models.PositiveIntegerField(db_comment="스냅샷 생성 시점의 Database.metadata_version")
+    payload = models.TextField(db_comment="직렬화된 카탈로그 JSON")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "catalog_snapshot"
+        constraints = [
+            models.UniqueConstraint(fields=["database", "kind", "version"], name="uniq_catalog_snapshot_version"),
+        ]
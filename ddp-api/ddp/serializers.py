@@ -7,12 +7,15 @@ class DatabaseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Database
         fields = "__all__"
+        read_only_fields = ["metadata_version"]
 
 
 class TableSerializer(serializers.ModelSerializer):
     class Meta:
         model = Table
         fields = "__all__"
+        # unique 제약 중복은 create()에서 기존 객체를 반환하므로 UniqueTogetherValidator를 사용하지 않음
+        validators = []
 
     def create(self, validated_data):
         """
@@ -40,6 +43,8 @@ class ColumnSerializer(serializers.ModelSerializer):
     class Meta:
         model = Column
         fields = "__all__"
+        # unique 제약 중복은 create()에서 기존 객체를 반환하므로 UniqueTogetherValidator를 사용하지 않음
+        validators = []
 
     def create(self, validated_data):
         """
@@ -0,0 +1,140 @@
+import json
+
+from app.renderers import envelope_json
+from ddp.models import CatalogSnapshot, Column, Database, Table
+from ddp.serializers import ColumnMetaSerializer, TableSerializer
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def bump_metadata_version(database_id: int):
+    """
+    Database.metadata_version을 1 증가시켜 저장된 카탈로그 스냅샷을 무효화합니다.
+
+    Args:
+        database_id (int): 데이터베이스 ID
+    """
+    Database.objects.filter(pk=database_id).update(metadata_version=F("metadata_version") + 1)
+
+
+def catalog_etag(database_id: int, kind: str, version: int) -> str:
+    return f'"catalog-{database_id}-{kind}-{version}"'
+
+
+def _serialize_meta(database_id: int) -> list:
+    """TableMetaView 응답 형식의 카탈로그를 테이블/컬럼 쿼리 2번으로 생성합니다."""
+    columns = {}
+    for column in Column.objects.filter(table__database_id=database_id).order_by("table_id", "column_seq"):
+        columns.setdefault(column.table_id, []).append(column)
+
+    return [
+        {
+            "schema_name": table.schema_name,
+            "table_name": table.name,
+            "table_description": table.description,
+            "columns": ColumnMetaSerializer(columns.get(table.id, []), many=True).data,
+        }
+        for table in Table.objects.filter(database_id=database_id).order_by("id")
+    ]
+
+
+def _serialize_tables(database_id: int) -> list:
+    return TableSerializer(Table.objects.filter(database_id=database_id).order_by("id"), many=True).data
+
+
+SERIALIZERS = {
+    CatalogSnapshot.KIND_META: _serialize_meta,
+    CatalogSnapshot.KIND_TABLES: _serialize_tables,
+}
+
+
+def build_catalog_snapshot(database_id: int, kind: str) -> CatalogSnapshot:
+    """
+    현재 metadata_version의 카탈로그를 직렬화해 저장하고 이전 버전 스냅샷을 정리합니다.
+
+    버전과 테이블/컬럼을 같은 트랜잭션에서 읽으므로 스냅샷 내용은 해당 버전과 일치합니다.
+
+    Args:
+        database_id (int): 데이터베이스 ID
+        kind (str): CatalogSnapshot.KIND_META 또는 CatalogSnapshot.KIND_TABLES
+
+    Returns:
+        CatalogSnapshot: 생성된 스냅샷. 데이터베이스가 없으면 None
+    """
+    with transaction.atomic():
+        version = Database.objects.filter(pk=database_id).values_list("metadata_version", flat=True).first()
+        if version is None:
+            return None
+        payload = json.dumps(SERIALIZERS[kind](database_id), cls=JSONEncoder, ensure_ascii=False)
+
+    try:
+        with transaction.atomic():
+            snapshot = CatalogSnapshot.objects.create(
+                database_id=database_id, kind=kind, version=version, payload=payload
+            )
+    except IntegrityError:
+        # 동시 요청이 같은 버전의 스냅샷을 먼저 저장한 경우
+        return CatalogSnapshot.objects.get(database_id=database_id, kind=kind, version=version)
+
+    CatalogSnapshot.objects.filter(database_id=database_id, kind=kind, version__lt=version).delete()
+    return snapshot
+
+
+def get_catalog_snapshot(database_id: int, kind: str, with_payload: bool = True) -> CatalogSnapshot:
+    """
+    현재 metadata_version의 카탈로그 스냅샷을 반환합니다. 없으면 생성합니다.
+
+    스냅샷이 있으면 (database, kind, version) unique 인덱스 조회 한 번으로 끝나므로
+    카탈로그 크기와 관계없이 비용이 일정합니다.
+
+    Args:
+        database_id (int): 데이터베이스 ID
+        kind (str): CatalogSnapshot.KIND_META 또는 CatalogSnapshot.KIND_TABLES
+        with_payload (bool): False이면 ETag 비교용으로 payload를 읽지 않습니다.
+
+    Returns:
+        CatalogSnapshot: 스냅샷. 데이터베이스가 없으면 None
+    """
+    queryset = CatalogSnapshot.objects.filter(
+        database_id=database_id, kind=kind, version=F("database__metadata_version")
+    )
+    if not with_payload:
+        queryset = queryset.defer("payload")
+    snapshot = queryset.first()
+    if snapshot is not None:
+        return snapshot
+    return build_catalog_snapshot(database_id, kind)
+
+
+def catalog_response(request, database_id: int, kind: str) -> HttpResponse:
+    """
+    카탈로그 스냅샷을 ETag와 함께 응답합니다. If-None-Match가 현재 버전과 같으면 304를 반환합니다.
+
+    본문은 다른 API와 같은 공통 응답 형식(status, message, data, code, timestamp)이며,
+    저장된 payload를 다시 직렬화하지 않고 data에 그대로 끼워 넣습니다. ETag는 payload 버전 기준입니다.
+
+    Args:
+        request (Request): If-None-Match 헤더를 포함할 수 있는 요청
+        database_id (int): 데이터베이스 ID
+        kind (str): CatalogSnapshot.KIND_META 또는 CatalogSnapshot.KIND_TABLES
+
+    Returns:
+        HttpResponse: 직렬화된 스냅샷(200) 또는 304 응답
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    snapshot = get_catalog_snapshot(database_id, kind, with_payload=not if_none_match)
+    if snapshot is None:
+        return HttpResponse(envelope_json("[]"), content_type="application/json")
+
+    etag = catalog_etag(database_id, kind, snapshot.version)
+    client_etags = [value.removeprefix("W/") for value in parse_etags(if_none_match or "")]
+    if etag in client_etags or "*" in client_etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(envelope_json(snapshot.payload), content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"  # 매번 ETag로 재검증
+    return response
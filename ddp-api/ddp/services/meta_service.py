@@ -1,9 +1,37 @@
+import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from ddp.models import Database
-from ddp.serializers import ColumnSerializer, TableSerializer
+from ddp.models import Column, Database, Table
+from ddp.services.catalog_service import bump_metadata_version
+from ddp.utils.connection_pool import get_pool_config
 from ddp.utils.mysql_connector import MySQLConnector
-from django.db import transaction
+from django.conf import settings
+from django.db import connections, router, transaction
+
+DEFAULT_EXTRACTION_CONFIG = {
+    "MAX_WORKERS": 4,
+    "IMPORT_BATCH_SIZE": 2000,
+}
+
+# 원본 information_schema 값으로 저장/갱신하는 컬럼 필드
+COLUMN_FIELDS = [
+    "description",
+    "data_type",
+    "default_value",
+    "column_seq",
+    "is_nullable",
+    "is_primary_key",
+    "is_unique",
+    "is_foreign_key",
+    "foreign_key_table",
+    "foreign_key_column",
+]
+
+
+def get_extraction_config() -> dict:
+    """settings.DDP_META_EXTRACTION 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_EXTRACTION_CONFIG, **getattr(settings, "DDP_META_EXTRACTION", {})}
 
 
 def extract_schema_metadata(connection_info: str) -> list:
@@ -17,31 +45,29 @@ def extract_schema_metadata(connection_info: str) -> list:
         list: 스키마 메타데이터 리스트
     """
 
-    connector = MySQLConnector(connection_info=connection_info)
-    metadata = connector.get_schema_meta()
-    connector.close()
+    with MySQLConnector(connection_info=connection_info, read_only=True) as connector:
+        metadata = connector.get_schema_meta()
     return metadata
 
 
-def extract_table_metadata(connection_info: str, schema_list: list) -> list:
+def _extract_schema(connection_info: str, schema: str) -> list:
+    """스키마 하나의 테이블/컬럼 메타데이터를 풀에서 대여한 커넥션으로 추출합니다."""
+    with MySQLConnector(connection_info=connection_info, read_only=True) as connector:
+        return connector.get_table_meta(schema_list=[schema])
+
+
+def group_table_metadata(rows: list) -> list:
     """
-    MySQL 서버로부터 테이블 메타데이터를 추출합니다.
+    컬럼 단위 메타데이터 행을 테이블 단위로 묶습니다.
 
     Args:
-        connection_info (str): 접속 정보
-        schema_list (list): 스키마 이름 리스트
+        rows (list): get_table_meta 결과 (스키마, 테이블, 컬럼 순서로 정렬)
 
     Returns:
-        list: 테이블 메타데이터 리스트
+        list: [{"schema_name", "table_name", "table_description", "columns": [...]}, ...]
     """
-
-    connector = MySQLConnector(connection_info=connection_info)
-    metadata = connector.get_table_meta(schema_list=schema_list)
-    connector.close()
-
     tables = defaultdict(list)
-    for row in metadata:
-        table = row["table_name"]
+    for row in rows:
         column = {
             "schema_name": row["schema_name"],
             "table_description": row["table_description"],
@@ -58,51 +84,186 @@ def extract_table_metadata(connection_info: str, schema_list: list) -> list:
             "foreign_key_column": row["foreign_key_column"],
         }  # 컬럼 정보만 추려서 dict 구성
 
-        tables[table].append(column)
+        # 스키마가 달라도 테이블명이 같을 수 있으므로 (스키마, 테이블)로 구분
+        tables[(row["schema_name"], row["table_name"])].append(column)
 
     # 변환
     output = []
-    for table_name, columns in tables.items():
-        tables = []
+    for (schema_name, table_name), columns in tables.items():
         output.append(
             {
                 "table_name": table_name,
                 "table_description": columns[0].get("table_description", ""),  # 중복
-                "schema_name": columns[0].get("schema_name", ""),
+                "schema_name": schema_name,
                 "columns": columns,
             }
         )
     return output
 
 
+def iter_table_metadata(connection_info: str, schema_list: list):
+    """
+    스키마별로 테이블 메타데이터를 병렬 추출하며 진행 상황을 순차적으로 생성합니다.
+
+    스키마마다 커넥션 풀에서 커넥션을 하나씩 대여해 최대 MAX_WORKERS개를 동시에 조회하며,
+    결과는 완료 순서와 관계없이 스키마명 순서로 병합됩니다.
+
+    Args:
+        connection_info (str): 접속 정보
+        schema_list (list): 스키마 이름 리스트 (비어 있으면 모든 사용자 스키마)
+
+    Yields:
+        dict:
+            - {"type": "progress", "schema": str, "done": int, "total": int, "tables": int}
+            - 마지막에 {"type": "result", "metadata": [...]}
+    """
+    if not schema_list:
+        schema_list = [row["schema_name"] for row in extract_schema_metadata(connection_info)]
+    schema_list = sorted(set(schema_list))
+
+    workers = max(1, min(get_extraction_config()["MAX_WORKERS"], get_pool_config()["MAX_SIZE"], len(schema_list)))
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meta-extract")
+    try:
+        futures = {executor.submit(_extract_schema, connection_info, schema): schema for schema in schema_list}
+        for done, future in enumerate(as_completed(futures), start=1):
+            schema = futures[future]
+            results[schema] = future.result()
+            tables = len({row["table_name"] for row in results[schema]})
+            logging.info(f"테이블 메타데이터 추출 진행: {done}/{len(schema_list)} ({schema}, {tables} tables)")
+            yield {"type": "progress", "schema": schema, "done": done, "total": len(schema_list), "tables": tables}
+    finally:
+        # 오류 또는 클라이언트 연결 종료 시 아직 시작하지 않은 스키마는 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    rows = [row for schema in schema_list for row in results[schema]]
+    yield {"type": "result", "metadata": group_table_metadata(rows)}
+
+
+def extract_table_metadata(connection_info: str, schema_list: list) -> list:
+    """
+    MySQL 서버로부터 테이블 메타데이터를 추출합니다.
+
+    Args:
+        connection_info (str): 접속 정보
+        schema_list (list): 스키마 이름 리스트
+
+    Returns:
+        list: 테이블 메타데이터 리스트
+    """
+    for event in iter_table_metadata(connection_info, schema_list):
+        if event["type"] == "result":
+            return event["metadata"]
+
+
+def _validate_catalog(metadata: list) -> list:
+    """
+    가져올 카탈로그의 필수 값과 길이를 확인하고 (스키마, 테이블) 단위로 중복을 제거합니다.
+
+    Args:
+        metadata (list): [{"schema_name", "table_name", "table_description", "columns": [...]}, ...]
+
+    Returns:
+        list: 검증된 테이블 목록 (같은 테이블/컬럼이 여러 번 있으면 마지막 값을 사용)
+
+    Raises:
+        ValueError: 필수 값이 없거나 255자를 넘는 경우
+    """
+    tables = {}
+    for index, table in enumerate(metadata):
+        schema_name, table_name = table.get("schema_name"), table.get("table_name")
+        if not schema_name or not table_name:
+            raise ValueError(f"metadata[{index}]: schema_name, table_name은 필수입니다.")
+        if len(schema_name) > 255 or len(table_name) > 255:
+            raise ValueError(f"metadata[{index}]: 스키마/테이블명은 255자를 넘을 수 없습니다.")
+
+        columns = {}
+        for column in table.get("columns", []):
+            name = column.get("name")
+            if not name or len(name) > 255:
+                raise ValueError(f"{schema_name}.{table_name}: 컬럼명이 비어 있거나 255자를 넘습니다.")
+            if not column.get("data_type"):
+                raise ValueError(f"{schema_name}.{table_name}.{name}: data_type은 필수입니다.")
+            columns[name] = column
+        tables[(schema_name, table_name)] = {**table, "columns": list(columns.values())}
+    return list(tables.values())
+
+
+def _upsert_options(model, unique_fields: list, update_fields: list) -> dict:
+    """bulk_create(update_conflicts=True) 옵션을 DB 백엔드에 맞게 구성합니다."""
+    options = {"update_conflicts": True, "update_fields": update_fields}
+    # MySQL은 ON DUPLICATE KEY UPDATE로 모든 unique 인덱스를 사용하므로 대상 컬럼을 지정하지 않음
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        options["unique_fields"] = unique_fields
+    return options
+
+
+def _upsert_keeping_descriptions(model, objs: list, unique_fields: list, update_fields: list, batch_size: int):
+    """
+    bulk upsert하되 description이 비어 있는 행은 기존 설명을 덮어쓰지 않도록
+    description을 갱신 대상에서 제외하고 별도 배치로 upsert합니다.
+    """
+    described = [obj for obj in objs if obj.description]
+    undescribed = [obj for obj in objs if not obj.description]
+    for rows, fields in ((described, update_fields), (undescribed, [f for f in update_fields if f != "description"])):
+        if rows:
+            model.objects.bulk_create(rows, batch_size=batch_size, **_upsert_options(model, unique_fields, fields))
+
+
 def create_tables_and_columns(database: Database, metadata: list) -> tuple:
     """
     데이터베이스에 테이블과 컬럼을 생성합니다.
 
+    (database, schema_name, name), (table, name) unique 제약을 이용해 bulk upsert하므로
+    이미 저장된 테이블/컬럼은 전달된 값으로 갱신됩니다. 단, 설명(코멘트)이 비어 있으면
+    기존에 작성된 설명을 유지합니다.
+    하나의 트랜잭션에서 배치 INSERT ... ON DUPLICATE KEY UPDATE와 테이블 ID 조회만 실행합니다.
+
     Args:
         database (Database): 데이터베이스 객체
         metadata (list): 메타데이터 리스트
 
     Returns:
-        tuple: 생성된 테이블과 컬럼 리스트
+        tuple: (저장된 테이블 수, 저장된 컬럼 수)
+
+    Raises:
+        ValueError: 메타데이터 검증에 실패한 경우
     """
+    metadata = _validate_catalog(metadata)
+    batch_size = get_extraction_config()["IMPORT_BATCH_SIZE"]
+
     with transaction.atomic():
-        # 테이블 생성
-        for table in metadata:
-            table["database"] = database.id
-            table["name"] = table["table_name"]
-            table["description"] = table["table_description"]
-            columns = table.pop("columns", [])
-
-            table_serializer = TableSerializer(data=table, many=False)
-            table_serializer.is_valid(raise_exception=True)
-            table_serializer.save()
-            table = table_serializer.data
-
-            # 테이블 ID 주입
-            for column in columns:
-                column["table"] = table["id"]
-            # 컬럼 생성
-            column_serializer = ColumnSerializer(data=columns, many=True)
-            column_serializer.is_valid(raise_exception=True)
-            column_serializer.save()
+        tables = [
+            Table(
+                database=database,
+                schema_name=table["schema_name"],
+                name=table["table_name"],
+                description=table.get("table_description") or "",
+            )
+            for table in metadata
+        ]
+        _upsert_keeping_descriptions(
+            Table, tables, ["database", "schema_name", "name"], ["description", "updated_at"], batch_size
+        )
+
+        # MySQL은 bulk_create 후 PK를 채워 주지 않으므로 다시 조회
+        table_ids = {
+            (schema_name, name): table_id
+            for table_id, schema_name, name in Table.objects.filter(
+                database=database, schema_name__in={table["schema_name"] for table in metadata}
+            ).values_list("id", "schema_name", "name")
+        }
+
+        columns = [
+            Column(
+                table_id=table_ids[(table["schema_name"], table["table_name"])],
+                name=column["name"],
+                **{field: column.get(field, Column._meta.get_field(field).get_default()) for field in COLUMN_FIELDS},
+            )
+            for table in metadata
+            for column in table["columns"]
+        ]
+        _upsert_keeping_descriptions(Column, columns, ["table", "name"], [*COLUMN_FIELDS, "updated_at"], batch_size)
+        bump_metadata_version(database.id)
+
+    return len(tables), len(columns)
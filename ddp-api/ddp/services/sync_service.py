@@ -0,0 +1,176 @@
+import logging
+import time
+
+from ddp.models import Column, Database, Table
+from ddp.services.catalog_service import bump_metadata_version
+from ddp.services.meta_service import COLUMN_FIELDS
+from ddp.utils.mysql_connector import MySQLConnector
+from django.db import transaction
+from django.utils import timezone
+
+# 변경된 테이블의 컬럼을 조회할 때 한 번에 필터링할 테이블 수
+TABLE_BATCH_SIZE = 500
+
+
+def _column_values(row: dict) -> dict:
+    values = {field: row[field] for field in COLUMN_FIELDS}
+    values["is_nullable"] = bool(values["is_nullable"])
+    values["is_primary_key"] = bool(values["is_primary_key"])
+    values["is_unique"] = bool(values["is_unique"])
+    values["is_foreign_key"] = bool(values["is_foreign_key"])
+    return values
+
+
+def _fetch_columns(connector: MySQLConnector, keys: list) -> dict:
+    """변경된 테이블의 컬럼 메타데이터를 배치 단위로 조회합니다. {(schema, table): [row, ...]}"""
+    columns = {}
+    for start in range(0, len(keys), TABLE_BATCH_SIZE):
+        batch = keys[start : start + TABLE_BATCH_SIZE]
+        wanted = set(batch)
+        rows = connector.get_table_meta(
+            schema_list=sorted({schema for schema, _ in batch}), table_list=sorted({name for _, name in batch})
+        )
+        for row in rows:
+            key = (row["schema_name"], row["table_name"])
+            if key in wanted:
+                columns.setdefault(key, []).append(row)
+    return columns
+
+
+def _sync_columns(table: Table, live_rows: list, existing: list, summary: dict) -> tuple[list, list, list]:
+    """테이블 하나의 컬럼을 비교해 (생성, 수정, 삭제 ID) 목록을 반환합니다."""
+    stored = {column.name: column for column in existing}
+    created, updated = [], []
+    for row in live_rows:
+        values = _column_values(row)
+        column = stored.pop(row["name"], None)
+        if column is None:
+            created.append(Column(table=table, name=row["name"], **values))
+            continue
+        # 원본 코멘트가 비어 있으면 사용자가 작성한 설명을 유지
+        if not values["description"]:
+            values["description"] = column.description
+        if any(getattr(column, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(column, field, value)
+            updated.append(column)
+    deleted = [column.id for column in stored.values()]
+
+    summary["columns"]["added"] += len(created)
+    summary["columns"]["updated"] += len(updated)
+    summary["columns"]["deleted"] += len(deleted)
+    return created, updated, deleted
+
+
+def sync_database_metadata(database: Database, schema_list: list = None) -> dict:
+    """
+    저장된 Table/Column 메타데이터를 원본 DB의 information_schema와 증분 동기화합니다.
+
+    테이블별 CREATE_TIME과 컬럼/FK 정의 checksum(get_table_signatures)을 저장된 값과 비교해
+    새로 생긴 테이블과 변경된 테이블의 컬럼만 조회하고, 추가/수정/삭제를 bulk로 반영합니다.
+    원본에서 사라진 테이블은 삭제됩니다. (컬럼은 CASCADE)
+
+    Args:
+        database (Database): 동기화할 데이터베이스
+        schema_list (list, optional): 동기화할 스키마. 없으면 이미 저장된 테이블의 스키마
+
+    Returns:
+        dict: {
+            "tables": {"added", "updated", "deleted", "unchanged"},
+            "columns": {"added", "updated", "deleted"},
+            "changed_tables": ["schema.table", ...],
+            "elapsed_ms": float,
+        }
+    """
+    start = time.perf_counter()
+    if not schema_list:
+        schema_list = sorted(set(Table.objects.filter(database=database).values_list("schema_name", flat=True)))
+    summary = {
+        "tables": {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0},
+        "columns": {"added": 0, "updated": 0, "deleted": 0},
+        "changed_tables": [],
+    }
+    if not schema_list:
+        return {**summary, "elapsed_ms": 0.0}
+
+    stored = {
+        (table.schema_name, table.name): table
+        for table in Table.objects.filter(database=database, schema_name__in=schema_list)
+    }
+    with MySQLConnector(database, read_only=True) as connector:
+        signatures = {
+            (row["schema_name"], row["table_name"]): row for row in connector.get_table_signatures(schema_list)
+        }
+        changed = [
+            key
+            for key, signature in signatures.items()
+            if key not in stored
+            or stored[key].column_checksum != signature["checksum"]
+            or stored[key].source_create_time != signature["create_time"]
+        ]
+        live_columns = _fetch_columns(connector, changed)
+
+    removed = [table.id for key, table in stored.items() if key not in signatures]
+    summary["tables"]["unchanged"] = len(signatures) - len(changed)
+    summary["changed_tables"] = [f"{schema}.{name}" for schema, name in sorted(changed)]
+
+    now = timezone.now()  # bulk_update는 auto_now(updated_at)를 적용하지 않으므로 직접 설정
+    with transaction.atomic():
+        new_tables = []
+        updated_tables = []
+        for key in changed:
+            signature = signatures[key]
+            table = stored.get(key)
+            if table is None:
+                table = Table(database=database, schema_name=key[0], name=key[1], description="")
+                new_tables.append(table)
+            else:
+                table.updated_at = now
+                updated_tables.append(table)
+            if signature["table_description"]:
+                table.description = signature["table_description"]
+            table.source_create_time = signature["create_time"]
+            table.column_checksum = signature["checksum"]
+
+        Table.objects.bulk_create(new_tables)
+        Table.objects.bulk_update(
+            updated_tables, ["description", "source_create_time", "column_checksum", "updated_at"]
+        )
+        if new_tables:
+            # MySQL은 bulk_create 후 PK를 채워 주지 않으므로 다시 조회
+            created_keys = {(table.schema_name, table.name) for table in new_tables}
+            for table in Table.objects.filter(database=database, schema_name__in=schema_list):
+                if (table.schema_name, table.name) in created_keys:
+                    stored[(table.schema_name, table.name)] = table
+        summary["tables"]["added"] = len(new_tables)
+        summary["tables"]["updated"] = len(updated_tables)
+
+        existing_columns = {}
+        for column in Column.objects.filter(table_id__in=[stored[key].id for key in changed]):
+            existing_columns.setdefault(column.table_id, []).append(column)
+
+        to_create, to_update, to_delete = [], [], []
+        for key in changed:
+            table = stored[key]
+            created, updated, deleted = _sync_columns(
+                table, live_columns.get(key, []), existing_columns.get(table.id, []), summary
+            )
+            to_create += created
+            to_update += updated
+            to_delete += deleted
+
+        for column in to_update:
+            column.updated_at = now
+        Column.objects.filter(id__in=to_delete).delete()
+        Column.objects.bulk_update(to_update, [*COLUMN_FIELDS, "updated_at"])
+        Column.objects.bulk_create(to_create)
+
+        summary["tables"]["deleted"] = len(removed)
+        Table.objects.filter(id__in=removed).delete()
+
+        if changed or removed:
+            bump_metadata_version(database.id)
+
+    summary["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 4)
+    logging.info(f"메타데이터 동기화 완료: database={database.id}, {summary['tables']}, {summary['columns']}")
+    return summary
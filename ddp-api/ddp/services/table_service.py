@@ -16,9 +16,8 @@ def create_tables_and_columns(database, table_list):
     table_serializer.save()
 
     # 컬럼 추출 + 테이블 ID 매핑 + 저장
-    connector = MySQLConnector(database)
-    columns = connector.get_column_meta(table_serializer.data)
-    connector.close()
+    with MySQLConnector(database, read_only=True) as connector:
+        columns = connector.get_column_meta(table_serializer.data)
 
     column_serializer = ColumnSerializer(data=columns, many=True)
     column_serializer.is_valid(raise_exception=True)
@@ -0,0 +1,32 @@
+from ddp.models import Column, Database, Table
+from ddp.services.catalog_service import bump_metadata_version
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# bulk_create/bulk_update/QuerySet.delete는 여기서 처리하지 않으므로
+# 해당 경로(meta_service, sync_service)에서 bump_metadata_version을 직접 호출합니다.
+
+
+@receiver(post_save, sender=Table)
+def table_saved(sender, instance: Table, **kwargs):
+    bump_metadata_version(instance.database_id)
+
+
+@receiver(post_delete, sender=Table)
+def table_deleted(sender, instance: Table, origin=None, **kwargs):
+    # Database 삭제에 따른 CASCADE와 QuerySet 단위 삭제는 제외
+    if origin is instance:
+        bump_metadata_version(instance.database_id)
+
+
+@receiver(post_save, sender=Column)
+def column_saved(sender, instance: Column, **kwargs):
+    Database.objects.filter(table__id=instance.table_id).update(metadata_version=F("metadata_version") + 1)
+
+
+@receiver(post_delete, sender=Column)
+def column_deleted(sender, instance: Column, origin=None, **kwargs):
+    # 테이블 삭제에 따른 CASCADE는 table_deleted에서 한 번만 반영
+    if origin is instance:
+        Database.objects.filter(table__id=instance.table_id).update(metadata_version=F("metadata_version") + 1)
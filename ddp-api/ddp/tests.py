@@ -1,5 +1,17 @@
-from ddp.utils.mysql_connector import MySQLConnector
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import MySQLdb
+from ddp.services.meta_service import create_tables_and_columns, iter_table_metadata
+from ddp.services.sync_service import _sync_columns, sync_database_metadata
+from ddp.utils.connection_pool import ConnectionPool
+from ddp.utils.mysql_connector import MySQLConnector, join_table_meta
+from ddp.utils.replica_router import acquire_connection, measure_lag, parse_topology
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -85,6 +97,392 @@ class MySQLConnectorTest(TestCase):
         # print(response.json())
 
 
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch("ddp.utils.connection_pool.MySQLdb.connect", side_effect=lambda **kwargs: mock.Mock())
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = ConnectionPool({"host": "test-db"}, max_size=2, acquire_timeout=0.1)
+
+    def test_reuse_released_connection(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+
+        self.assertIs(self.pool.acquire(), conn)
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertEqual(self.pool.stats()["reused"], 1)
+
+    def test_acquire_timeout_when_exhausted(self):
+        self.pool.acquire()
+        self.pool.acquire()
+
+        with self.assertRaises(ConnectionError):
+            self.pool.acquire()
+
+    def test_dead_connection_is_replaced(self):
+        conn = self.pool.acquire()
+        conn.ping.side_effect = MySQLdb.OperationalError("gone away")
+        self.pool.release(conn)
+
+        self.assertIsNot(self.pool.acquire(), conn)
+        self.assertEqual(self.pool.stats()["ping_failures"], 1)
+        self.assertEqual(self.pool.stats()["size"], 1)
+
+
+class ExecutionProfileTest(SimpleTestCase):
+    def setUp(self):
+        self.pool, self.conn = mock.Mock(), mock.Mock()
+        patcher = mock.patch(
+            "ddp.utils.mysql_connector.acquire_connection", return_value=("primary", self.pool, self.conn)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connector = MySQLConnector(connection_info='{"host": "test-db"}')
+
+    def test_profile_opens_read_only_snapshot(self):
+        self.connector.apply_profile(
+            {
+                "MAX_EXECUTION_TIME": 5000,
+                "ISOLATION_LEVEL": "repeatable read",
+                "READ_ONLY": True,
+                "CONSISTENT_SNAPSHOT": True,
+            }
+        )
+
+        statements = [call.args[0] for call in self.connector.cursor.execute.call_args_list]
+        self.assertEqual(statements[0], "SET SESSION max_execution_time = %s")
+        self.assertIn("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ", statements)
+        self.assertEqual(statements[-1], "START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+
+    def test_session_vars_reset_before_release(self):
+        self.connector.apply_profile({"MAX_EXECUTION_TIME": 5000, "LOCK_WAIT_TIMEOUT": 5})
+        self.connector.close()
+
+        self.conn.cursor.return_value.execute.assert_called_with(
+            "SET SESSION max_execution_time = DEFAULT, innodb_lock_wait_timeout = DEFAULT"
+        )
+        self.pool.release.assert_called_once_with(self.conn, discard=False)
+
+
+class ReplicaRoutingTest(SimpleTestCase):
+    TOPOLOGY = {
+        "primary": {"host": "primary", "user": "ddp", "password": "pw"},
+        "replicas": [{"host": "replica-a", "weight": 3}, {"host": "replica-b"}],
+        "max_replica_lag": 10,
+    }
+
+    def setUp(self):
+        self.pools = {}
+
+        def get_pool(config, database_id=None, role="primary"):
+            return self.pools.setdefault(config["host"], mock.Mock(name=config["host"]))
+
+        mock.patch("ddp.utils.replica_router.get_pool", side_effect=get_pool).start()
+        mock.patch("ddp.utils.replica_router._states", {}).start()
+        self.lag = mock.patch("ddp.utils.replica_router.measure_lag", return_value=0.0).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_replica_inherits_primary_credentials(self):
+        primary, replicas, max_lag = parse_topology(self.TOPOLOGY)
+
+        self.assertEqual(primary["host"], "primary")
+        self.assertEqual(replicas[0], ("replica0", {"host": "replica-a", "user": "ddp", "password": "pw"}, 3.0))
+        self.assertEqual(max_lag, 10)
+
+    def test_flat_config_drops_routing_keys(self):
+        primary, replicas, max_lag = parse_topology({"host": "primary", "user": "ddp", "max_replica_lag": 5})
+
+        self.assertEqual(primary, {"host": "primary", "user": "ddp"})  # MySQLdb.connect 인자로 그대로 사용
+        self.assertEqual(replicas, [])
+        self.assertEqual(max_lag, 5)
+
+    def test_writes_go_to_primary(self):
+        role, pool, _ = acquire_connection(self.TOPOLOGY, database_id=1)
+
+        self.assertEqual(role, "primary")
+        self.assertIs(pool, self.pools["primary"])
+
+    def test_lagging_and_down_replicas_fall_back_to_primary(self):
+        self.lag.return_value = 60.0
+        self.pools["replica-b"] = mock.Mock()
+        self.pools["replica-b"].acquire.side_effect = MySQLdb.OperationalError(2003, "down")
+
+        role, _, _ = acquire_connection(self.TOPOLOGY, database_id=1, read_only=True)
+
+        self.assertEqual(role, "primary")
+        self.pools["replica-a"].release.assert_called_once()
+
+    def test_measure_lag_reads_mysql_and_mariadb_columns(self):
+        conn = mock.Mock()
+        cursor = conn.cursor.return_value
+        for row, lag in (
+            ({"Seconds_Behind_Source": 3}, 3.0),  # MySQL 8.0.22+
+            ({"Seconds_Behind_Master": 4}, 4.0),  # MariaDB 10.5+ (SHOW REPLICA STATUS)
+            ({"Seconds_Behind_Master": None}, float("inf")),  # 복제 스레드 중지
+            (None, 0.0),  # 복제 설정 없음
+        ):
+            cursor.fetchone.return_value = row
+            self.assertEqual(measure_lag(conn), lag)
+
+
+class ParallelMetaExtractionTest(SimpleTestCase):
+    @staticmethod
+    def schema_rows(connection_info, schema):
+        return [
+            {
+                "schema_name": schema,
+                "table_name": "users",
+                "table_description": "",
+                "name": name,
+                "description": "",
+                "data_type": "int",
+                "default_value": None,
+                "column_seq": seq,
+                "is_nullable": False,
+                "is_primary_key": seq == 1,
+                "is_unique": False,
+                "is_foreign_key": False,
+                "foreign_key_table": None,
+                "foreign_key_column": None,
+            }
+            for seq, name in enumerate(["id", "name"], start=1)
+        ]
+
+    @mock.patch("ddp.services.meta_service._extract_schema")
+    def test_merge_in_schema_order_with_progress(self, extract):
+        extract.side_effect = self.schema_rows
+
+        events = list(iter_table_metadata('{"host": "test-db"}', ["sales", "hr", "sales"]))
+
+        self.assertEqual([e["type"] for e in events], ["progress", "progress", "result"])
+        self.assertEqual(events[-2]["done"], 2)
+        # 같은 이름의 테이블도 스키마별로 구분되어 스키마명 순서로 병합
+        metadata = events[-1]["metadata"]
+        self.assertEqual([(t["schema_name"], t["table_name"]) for t in metadata], [("hr", "users"), ("sales", "users")])
+        self.assertEqual([c["name"] for c in metadata[0]["columns"]], ["id", "name"])
+
+    @mock.patch("ddp.views.meta_view.iter_table_metadata")
+    async def test_asgi_progress_events_arrive_during_extraction(self, iter_metadata):
+        release, resumed = threading.Event(), threading.Event()
+
+        def events(connection_info, schema_list):
+            yield {"type": "progress", "schema": "sales", "done": 1, "total": 2}
+            release.wait(5)
+            resumed.set()
+            yield {"type": "result", "metadata": []}
+
+        iter_metadata.side_effect = events
+        response = await self.async_client.post(
+            f"{reverse('table_extract')}?progress=true",
+            {"connection_info": '{"host": "test-db"}', "schema_list": ["sales", "hr"]},
+            content_type="application/json",
+        )
+        content = aiter(response.streaming_content)
+
+        self.assertEqual(json.loads(await anext(content))["type"], "progress")
+        self.assertFalse(resumed.is_set())
+        release.set()
+        self.assertEqual([json.loads(chunk)["type"] async for chunk in content], ["result"])
+
+
+class JoinTableMetaTest(SimpleTestCase):
+    def test_one_row_per_column(self):
+        tables = [{"schema_name": "shop", "table_name": "orders", "table_description": "주문"}]
+        columns = [
+            {
+                "schema_name": "shop",
+                "table_name": "orders",
+                "name": name,
+                "description": "",
+                "data_type": "int",
+                "default_value": None,
+                "column_seq": seq,
+                "is_nullable": "NO",
+                "column_key": key,
+            }
+            for seq, (name, key) in enumerate([("id", "PRI"), ("user_id", "UNI")], start=1)
+        ]
+        # user_id에 FK가 두 개 걸려 있어도 한 행만 생성
+        foreign_keys = [
+            {
+                "schema_name": "shop",
+                "table_name": "orders",
+                "name": "user_id",
+                "foreign_key_table": table,
+                "foreign_key_column": "id",
+            }
+            for table in ("users", "members")
+        ]
+
+        rows = join_table_meta(tables, columns, foreign_keys)
+
+        self.assertEqual([row["name"] for row in rows], ["id", "user_id"])
+        self.assertEqual(rows[0]["table_description"], "주문")
+        self.assertTrue(rows[0]["is_primary_key"])
+        self.assertFalse(rows[0]["is_foreign_key"])
+        self.assertEqual((rows[1]["is_unique"], rows[1]["foreign_key_table"]), (True, "users"))
+
+
+class MetadataSyncTest(SimpleTestCase):
+    def test_sync_columns_keeps_user_description(self):
+        table = Table(id=1, schema_name="shop", name="orders")
+        existing = [
+            Column(id=10, table=table, name="id", description="주문 ID", data_type="int", column_seq=1),
+            Column(id=11, table=table, name="memo", description="", data_type="text", column_seq=2),
+        ]
+        live = [
+            {
+                "name": "id",
+                "description": "",
+                "data_type": "bigint",
+                "default_value": None,
+                "column_seq": 1,
+                "is_nullable": False,
+                "is_primary_key": True,
+                "is_unique": False,
+                "is_foreign_key": False,
+                "foreign_key_table": None,
+                "foreign_key_column": None,
+            },
+            {
+                "name": "user_id",
+                "description": "회원",
+                "data_type": "int",
+                "default_value": None,
+                "column_seq": 2,
+                "is_nullable": True,
+                "is_primary_key": False,
+                "is_unique": False,
+                "is_foreign_key": True,
+                "foreign_key_table": "users",
+                "foreign_key_column": "id",
+            },
+        ]
+        summary = {"columns": {"added": 0, "updated": 0, "deleted": 0}}
+
+        created, updated, deleted = _sync_columns(table, live, existing, summary)
+
+        self.assertEqual([column.name for column in created], ["user_id"])
+        self.assertEqual([(column.data_type, column.description) for column in updated], [("bigint", "주문 ID")])
+        self.assertEqual(deleted, [11])
+        self.assertEqual(summary["columns"], {"added": 1, "updated": 1, "deleted": 1})
+
+
+class MetadataSyncUpdatedAtTest(TestCase):
+    def test_sync_refreshes_updated_at_of_changed_rows(self):
+        database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        table = Table.objects.create(database=database, schema_name="shop", name="orders", column_checksum="old")
+        Column.objects.create(table=table, name="id", data_type="int", column_seq=1)
+        past = timezone.now() - timedelta(days=1)
+        Table.objects.update(updated_at=past)
+        Column.objects.update(updated_at=past)
+        live = {
+            "name": "id",
+            "description": "",
+            "data_type": "bigint",
+            "default_value": None,
+            "column_seq": 1,
+            "is_nullable": False,
+            "is_primary_key": True,
+            "is_unique": False,
+            "is_foreign_key": False,
+            "foreign_key_table": None,
+            "foreign_key_column": None,
+        }
+        signature = {
+            "schema_name": "shop",
+            "table_name": "orders",
+            "table_description": "",
+            "create_time": None,
+            "checksum": "new",
+        }
+
+        with (
+            mock.patch("ddp.services.sync_service.MySQLConnector") as connector_class,
+            mock.patch("ddp.services.sync_service._fetch_columns", return_value={("shop", "orders"): [live]}),
+        ):
+            connector_class.return_value.__enter__.return_value.get_table_signatures.return_value = [signature]
+            summary = sync_database_metadata(database, ["shop"])
+
+        self.assertEqual((summary["tables"]["updated"], summary["columns"]["updated"]), (1, 1))
+        self.assertGreater(Table.objects.get().updated_at, past)
+        column = Column.objects.get()
+        self.assertEqual(column.data_type, "bigint")
+        self.assertGreater(column.updated_at, past)
+
+
+class CatalogImportTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+
+    def metadata(self, description: str) -> list:
+        columns = [{"name": name, "data_type": "int", "column_seq": seq} for seq, name in enumerate(["id", "user_id"])]
+        return [{"schema_name": "shop", "table_name": "orders", "table_description": description, "columns": columns}]
+
+    def test_import_upserts_tables_and_columns(self):
+        self.assertEqual(create_tables_and_columns(self.database, self.metadata("주문")), (1, 2))
+        self.assertEqual(create_tables_and_columns(self.database, self.metadata("주문 내역")), (1, 2))
+
+        self.assertEqual(Table.objects.get().description, "주문 내역")
+        self.assertEqual(Column.objects.count(), 2)
+
+    def test_import_keeps_descriptions_when_comment_is_empty(self):
+        metadata = self.metadata("주문")
+        metadata[0]["columns"][0]["description"] = "주문 ID"
+        create_tables_and_columns(self.database, metadata)
+
+        metadata = self.metadata("")
+        metadata[0]["columns"][1]["description"] = "회원 ID"
+        metadata[0]["columns"][0]["data_type"] = "bigint"
+        self.assertEqual(create_tables_and_columns(self.database, metadata), (1, 2))
+
+        self.assertEqual(Table.objects.get().description, "주문")
+        self.assertEqual(
+            list(Column.objects.order_by("column_seq").values_list("name", "data_type", "description")),
+            [("id", "bigint", "주문 ID"), ("user_id", "int", "회원 ID")],
+        )
+
+    def test_import_rejects_missing_table_name(self):
+        with self.assertRaises(ValueError):
+            create_tables_and_columns(self.database, [{"schema_name": "shop", "columns": []}])
+
+
+class CatalogSnapshotTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        self.table = Table.objects.create(database=self.database, schema_name="shop", name="orders", description="주문")
+        Column.objects.create(table=self.table, name="id", data_type="int", column_seq=1)
+
+    def test_meta_returns_not_modified_until_catalog_changes(self):
+        url = f"/api/ddp/db/{self.database.id}/meta/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual((body["status"], body["code"]), ("success", 200))
+        self.assertEqual(body["data"][0]["columns"][0]["name"], "id")
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Column.objects.create(table=self.table, name="user_id", data_type="int", column_seq=2)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["data"][0]["columns"]), 2)
+
+    def test_tables_keep_response_envelope(self):
+        response = self.client.get(f"/api/ddp/db/{self.database.id}/table/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(set(body), {"status", "message", "data", "code", "timestamp"})
+        self.assertEqual([table["name"] for table in body["data"]], ["orders"])
+        self.assertTrue(response.has_header("ETag"))
+
+
 # 1. 데이터베이스 연결 테스트
 # 2. 스키마 메타데이터 추출
 # 3. 선택된 스키마 중에서 테이블 메타데이터 추출
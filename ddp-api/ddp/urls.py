@@ -2,9 +2,11 @@ from ddp.views.column_view import ColumnDetailView
 from ddp.views.database_view import (
     DatabaseConnectionView,
     DatabaseDetailView,
+    DatabasePoolStatsView,
     DatabaseView,
 )
 from ddp.views.meta_view import (
+    DatabaseMetaSyncView,
     SchemaMetaExtractView,
     TableMetaExtractView,
     TableMetaView,
@@ -17,7 +19,9 @@ urlpatterns = [
     path("db/", view=DatabaseView.as_view(), name="database"),
     path("db/<int:pk>/", view=DatabaseDetailView.as_view(), name="database_detail"),
     path("db/connect/", view=DatabaseConnectionView.as_view(), name="database_connect"),
+    path("db/pool/", view=DatabasePoolStatsView.as_view(), name="database_pool_stats"),
     path("db/<int:pk>/meta/", view=TableMetaView.as_view(), name="metadata"),
+    path("db/<int:pk>/meta/sync/", view=DatabaseMetaSyncView.as_view(), name="metadata_sync"),
     # table
     path("db/<int:pk>/table/", view=TableView.as_view(), name="table_list"),
     path("table/<int:pk>/", view=TableDetailView.as_view(), name="table_detail"),
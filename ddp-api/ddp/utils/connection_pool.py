@@ -0,0 +1,272 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import MySQLdb
+from django.conf import settings
+from MySQLdb.cursors import DictCursor
+
+DEFAULT_POOL_CONFIG = {
+    "MIN_SIZE": 0,
+    "MAX_SIZE": 10,
+    "IDLE_TIMEOUT": 300,
+    "ACQUIRE_TIMEOUT": 30,
+}
+
+
+def get_pool_config() -> dict:
+    """settings.DDP_CONNECTION_POOL 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_POOL_CONFIG, **getattr(settings, "DDP_CONNECTION_POOL", {})}
+
+
+def connection_fingerprint(connection_json: dict) -> str:
+    """
+    접속 정보로부터 풀 식별용 지문(fingerprint)을 생성합니다.
+
+    Args:
+        connection_json (dict): MySQL 접속 정보
+
+    Returns:
+        str: 접속 정보의 sha256 해시 앞 16자리
+    """
+    normalized = json.dumps(connection_json, sort_keys=True, default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+class ConnectionPool:
+    """하나의 접속 정보에 대한 MySQL 커넥션 풀입니다."""
+
+    def __init__(self, connection_json: dict, min_size=0, max_size=10, idle_timeout=300, acquire_timeout=30):
+        """
+        Args:
+            connection_json (dict): MySQLdb.connect에 전달할 접속 정보
+            min_size (int): 유휴 상태로 유지할 최소 커넥션 수
+            max_size (int): 동시에 열 수 있는 최대 커넥션 수
+            idle_timeout (float): 유휴 커넥션을 정리하기까지의 시간(초)
+            acquire_timeout (float): 커넥션 대여 대기 최대 시간(초)
+        """
+        self.connection_json = connection_json
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = deque()  # (conn, last_used)
+        self._size = 0  # 풀이 관리 중인 전체 커넥션 수 (유휴 + 대여 중)
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"created": 0, "reused": 0, "waits": 0, "evicted": 0, "discarded": 0, "ping_failures": 0}
+
+        self.fill()
+
+    def _open(self):
+        return MySQLdb.connect(cursorclass=DictCursor, **self.connection_json)
+
+    def fill(self):
+        """유휴 커넥션 수가 min_size가 될 때까지 커넥션을 미리 생성합니다."""
+        with self._cond:
+            while self._size < self.min_size:
+                self._idle.append((self._open(), time.monotonic()))
+                self._size += 1
+                self._stats["created"] += 1
+
+    def _evict_idle(self):
+        """idle_timeout을 넘긴 유휴 커넥션을 min_size까지 정리합니다. (lock 보유 상태에서 호출)"""
+        now = time.monotonic()
+        # 가장 오래된 커넥션이 왼쪽에 위치
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._stats["evicted"] += 1
+            _close_quietly(conn)
+
+    def acquire(self):
+        """
+        풀에서 커넥션을 대여합니다. 유휴 커넥션은 ping으로 생존 여부를 확인한 뒤 반환합니다.
+
+        Returns:
+            MySQLdb.Connection: 사용 가능한 커넥션
+
+        Raises:
+            ConnectionError: acquire_timeout 동안 커넥션을 얻지 못한 경우
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("Connection pool is closed.")
+                    self._evict_idle()
+
+                    if self._idle:
+                        conn, _ = self._idle.pop()  # 가장 최근에 반납된 커넥션 우선
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise ConnectionError("Timed out waiting for a pooled database connection.")
+                    self._stats["waits"] += 1
+                    self._cond.wait(remaining)
+
+            # ping 및 신규 커넥션 생성은 lock 밖에서 수행
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    self._forget(notify=True)
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+                return conn
+
+            try:
+                conn.ping()
+            except MySQLdb.Error as e:
+                logging.warning(f"유휴 커넥션 ping 실패, 폐기합니다: {e}")
+                _close_quietly(conn)
+                self._forget(stat="ping_failures", notify=True)
+                continue
+
+            with self._cond:
+                self._stats["reused"] += 1
+            return conn
+
+    def _forget(self, stat: str = None, notify: bool = False):
+        """풀이 관리하던 커넥션 하나를 집계에서 제외합니다."""
+        with self._cond:
+            self._size -= 1
+            if stat:
+                self._stats[stat] += 1
+            if notify:
+                self._cond.notify()
+
+    def release(self, conn, discard: bool = False):
+        """
+        대여한 커넥션을 풀에 반납합니다.
+
+        열려 있는 트랜잭션(SELECT 시 생성된 스냅샷 포함)은 롤백한 뒤 반납하여
+        다음 사용자가 오래된 스냅샷을 보지 않도록 합니다.
+
+        Args:
+            conn (MySQLdb.Connection): 반납할 커넥션
+            discard (bool): True이면 풀에 반납하지 않고 커넥션을 닫습니다.
+        """
+        if not discard:
+            try:
+                conn.rollback()
+            except MySQLdb.Error as e:
+                logging.warning(f"커넥션 반납 중 롤백 실패, 폐기합니다: {e}")
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += 1
+                _close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._evict_idle()
+            self._cond.notify()
+
+    def close(self):
+        """유휴 커넥션을 모두 닫고 풀을 종료합니다. 대여 중인 커넥션은 반납 시 닫힙니다."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                _close_quietly(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """풀 상태 및 누적 통계를 반환합니다."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._stats,
+            }
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_json: dict, database_id: int = None, role: str = "primary") -> ConnectionPool:
+    """
+    접속 정보에 해당하는 프로세스 단위 커넥션 풀을 반환합니다. 없으면 생성합니다.
+
+    풀은 (Database.id, 서버 role, 접속 정보 지문)으로 식별되며, 같은 Database/role의
+    접속 정보가 변경되면 이전 풀은 닫힙니다.
+
+    Args:
+        connection_json (dict): MySQL 접속 정보
+        database_id (int, optional): Database 모델의 ID
+        role (str): "primary" 또는 "replica0", "replica1", ...
+
+    Returns:
+        ConnectionPool: 커넥션 풀
+    """
+    prefix = f"db:{database_id}:{role}" if database_id is not None else "adhoc"
+    key = f"{prefix}:{connection_fingerprint(connection_json)}"
+
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if database_id is not None:
+                for stale_key in [k for k in _pools if k.startswith(f"{prefix}:")]:
+                    logging.info(f"접속 정보 변경으로 커넥션 풀 종료: {stale_key}")
+                    _pools.pop(stale_key).close()
+
+            config = get_pool_config()
+            pool = ConnectionPool(
+                connection_json,
+                min_size=config["MIN_SIZE"],
+                max_size=config["MAX_SIZE"],
+                idle_timeout=config["IDLE_TIMEOUT"],
+                acquire_timeout=config["ACQUIRE_TIMEOUT"],
+            )
+            _pools[key] = pool
+            logging.info(f"커넥션 풀 생성: {key}")
+    return pool
+
+
+def pool_stats() -> dict:
+    """
+    프로세스 내 모든 커넥션 풀의 통계를 반환합니다.
+
+    Returns:
+        dict: {pool_key: {"size": int, "idle": int, "in_use": int, ...}}
+    """
+    with _pools_lock:
+        pools = dict(_pools)
+    return {key: pool.stats() for key, pool in pools.items()}
+
+
+def close_all_pools():
+    """모든 커넥션 풀을 종료합니다."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from collections import defaultdict
@@ -5,32 +6,93 @@ from textwrap import dedent
 
 import MySQLdb
 from ddp.models import Database
-from MySQLdb.cursors import DictCursor
+from ddp.utils.replica_router import acquire_connection, parse_topology
+from MySQLdb.constants import FIELD_TYPE
+from MySQLdb.cursors import SSDictCursor
+
+# FIELD_TYPE 코드 → 타입명 (CHAR/INTERVAL 같은 별칭보다 정식 이름 우선)
+FIELD_TYPE_NAMES = {}
+for _name, _code in vars(FIELD_TYPE).items():
+    if _name.isupper():
+        FIELD_TYPE_NAMES.setdefault(_code, _name.lower())
+
+# 문장 실행 시간 초과 오류 코드 (MySQL max_execution_time, MariaDB max_statement_time, 락 대기 시간 초과)
+TIMEOUT_ERROR_CODES = (3024, 1969, 1205)
+
+ISOLATION_LEVELS = ("READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE")
+
+
+class QueryTimeoutError(RuntimeError):
+    """실행 프로파일의 시간 제한을 넘어 쿼리가 중단된 경우 발생합니다."""
+
+
+def is_timeout_error(error: Exception) -> bool:
+    """MySQLdb 오류가 문장 실행 시간/락 대기 시간 초과인지 확인합니다."""
+    return isinstance(error, MySQLdb.Error) and bool(error.args) and error.args[0] in TIMEOUT_ERROR_CODES
 
 
 class MySQLConnector:
-    """MySQL 데이터베이스와 연결하고 메타데이터를 추출하는 클래스입니다."""
+    """
+    MySQL 데이터베이스와 연결하고 메타데이터를 추출하는 클래스입니다.
+
+    커넥션은 프로세스 단위 커넥션 풀에서 대여하며, with 문으로 사용하면
+    블록을 벗어날 때 자동으로 풀에 반납됩니다.
+
+        with MySQLConnector(database) as connector:
+            rows = connector.query("SELECT 1")
+    """
 
-    def __init__(self, db: Database = None, connection_info=None):
+    def __init__(self, db: Database = None, connection_info=None, read_only: bool = False, role: str = None):
         """
         Args:
             db: 데이터베이스 객체
+            connection_info (str, optional): JSON 문자열 접속 정보 (db 대신 사용)
+            read_only (bool): 읽기 전용 작업이면 True (접속 정보에 replica가 있으면 replica로 라우팅)
+            role (str, optional): 접속할 서버 지정 ("primary", "replica0", ...)
         """
         self.db = db
         self.connection_info = connection_info or self.db.connection_info
+        self.read_only = read_only
+        self.role = role  # 실제로 접속한 서버
+        self.pool = None
         self.conn = None
         self.cursor = None
+        self.stream_cursor = None
+        self.discard = False  # True이면 close 시 커넥션을 풀에 반납하지 않고 닫음
+        self.session_vars = []  # apply_profile로 변경한 세션 변수 (반납 전 DEFAULT로 복원)
         self.connect()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def close(self):
         """
-        커넥션을 닫습니다.
+        커서를 닫고 커넥션을 풀에 반납합니다.
+
+        discard가 True이면 커서보다 커넥션을 먼저 닫습니다. unbuffered 커서를 닫으면
+        남은 행을 모두 읽어 버리기 때문에, 결과를 끝까지 읽지 않은 스트림은 커넥션을
+        끊는 편이 훨씬 빠릅니다.
         """
-        if self.cursor:
-            self.cursor.close()
+        if self.conn and self.discard:
+            self.pool.release(self.conn, discard=True)
+            self.conn = None
+        for cursor in (self.stream_cursor, self.cursor):
+            if cursor:
+                try:
+                    cursor.close()
+                except Exception:
+                    self.discard = True
+        self.stream_cursor = None
+        self.cursor = None
+        if self.conn and self.session_vars:
+            self.reset_session()
         if self.conn:
-            self.conn.close()
-        logging.info("MySQL 커넥션 종료")
+            self.pool.release(self.conn, discard=self.discard)
+            self.conn = None
+            logging.info("MySQL 커넥션 반납")
 
     def execute(self, sql: str, params=None):
         """
@@ -66,6 +128,103 @@ class MySQLConnector:
             logging.info(f"쿼리 결과: {len(data)} rows")
         return data
 
+    def execute_stream(self, sql: str, params=None, cursorclass=SSDictCursor):
+        """
+        unbuffered 서버 사이드 커서로 SQL 쿼리를 실행하고 커서를 반환합니다.
+
+        결과는 서버에 남아 있다가 fetchmany 호출 시점에 필요한 만큼만 전송되므로
+        결과 크기와 관계없이 메모리 사용량이 일정합니다. 결과를 끝까지 읽지 않고
+        중단하는 경우 discard를 True로 설정해야 합니다.
+
+        Args:
+            sql (str): 실행할 SQL 쿼리
+            params (tuple, optional): 쿼리 파라미터. 기본값은 None.
+            cursorclass: 사용할 unbuffered 커서 클래스 (기본값: SSDictCursor)
+
+        Returns:
+            Cursor: 실행된 서버 사이드 커서
+        """
+        self.stream_cursor = self.conn.cursor(cursorclass)
+        self.stream_cursor.execute(sql, params or ())
+        return self.stream_cursor
+
+    def apply_profile(self, profile: dict):
+        """
+        실행 프로파일의 세션 변수를 설정하고 읽기 전용 트랜잭션을 시작합니다.
+
+        커넥션은 풀에서 재사용되므로 대여할 때마다 설정하며, 변경한 세션 변수는
+        반납 전에 DEFAULT로 되돌립니다. (트랜잭션은 반납 시 롤백으로 종료)
+
+        Args:
+            profile (dict): 실행 프로파일
+                - MAX_EXECUTION_TIME: SELECT 문 최대 실행 시간(ms), 0이면 제한 없음
+                - LOCK_WAIT_TIMEOUT: InnoDB 락 대기 시간(초), None이면 서버 기본값
+                - ISOLATION_LEVEL: 트랜잭션 격리 수준, None이면 서버 기본값
+                - READ_ONLY: START TRANSACTION READ ONLY 사용 여부
+                - CONSISTENT_SNAPSHOT: WITH CONSISTENT SNAPSHOT 사용 여부
+        """
+        max_execution_time = int(profile.get("MAX_EXECUTION_TIME") or 0)
+        try:
+            self.cursor.execute("SET SESSION max_execution_time = %s", (max_execution_time,))
+            self.session_vars.append("max_execution_time")
+        except MySQLdb.OperationalError:
+            # MariaDB는 max_statement_time(초)을 사용
+            self.cursor.execute("SET SESSION max_statement_time = %s", (max_execution_time / 1000,))
+            self.session_vars.append("max_statement_time")
+
+        if profile.get("LOCK_WAIT_TIMEOUT") is not None:
+            self.cursor.execute("SET SESSION innodb_lock_wait_timeout = %s", (int(profile["LOCK_WAIT_TIMEOUT"]),))
+            self.session_vars.append("innodb_lock_wait_timeout")
+
+        isolation_level = profile.get("ISOLATION_LEVEL")
+        if isolation_level:
+            if isolation_level.upper() not in ISOLATION_LEVELS:
+                raise ValueError(f"Unsupported isolation level: {isolation_level}")
+            # 다음 트랜잭션에만 적용되므로 복원할 필요 없음
+            self.cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level.upper()}")
+
+        characteristics = []
+        if profile.get("CONSISTENT_SNAPSHOT"):
+            characteristics.append("WITH CONSISTENT SNAPSHOT")
+        if profile.get("READ_ONLY"):
+            characteristics.append("READ ONLY")
+        if characteristics:
+            self.cursor.execute(f"START TRANSACTION {', '.join(characteristics)}")
+
+    def reset_session(self):
+        """apply_profile로 변경한 세션 변수를 DEFAULT로 복원합니다. 실패하면 커넥션을 폐기합니다."""
+        if not self.discard:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute("SET SESSION " + ", ".join(f"{name} = DEFAULT" for name in self.session_vars))
+            except MySQLdb.Error as e:
+                logging.warning(f"세션 변수 복원 실패, 커넥션을 폐기합니다: {e}")
+                self.discard = True
+            finally:
+                cursor.close()
+        self.session_vars = []
+
+    @staticmethod
+    def describe_columns(description) -> list[dict]:
+        """
+        cursor.description을 컬럼명/타입명 목록으로 변환합니다.
+
+        Args:
+            description: DB-API cursor.description
+
+        Returns:
+            list: [{"name": "id", "type": "long"}, {"name": "price", "type": "newdecimal", "precision": 11, "scale": 2}, ...]
+        """
+        columns = []
+        for desc in description or ():
+            column = {"name": desc[0], "type": FIELD_TYPE_NAMES.get(desc[1], "unknown")}
+            if desc[1] in (FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL):
+                # 표시 길이에는 소수점과 부호(signed)가 포함됨. 부호 여부를 알 수 없으므로 자릿수를 작게 잡지 않도록 소수점만 제외
+                column["precision"] = max((desc[4] or 0) - (1 if desc[5] else 0), 1)
+                column["scale"] = desc[5]
+            columns.append(column)
+        return columns
+
     @staticmethod
     def check_connection(connection_json: dict) -> bool:
         """
@@ -79,11 +238,13 @@ class MySQLConnector:
                 - database: 접속할 데이터베이스명
                 - port: MySQL 포트 (기본값: 3306)
                 - charset: 문자셋 (기본값: utf8mb4)
+                primary/replicas 형식이면 primary 접속을 확인합니다.
 
         Returns:
             bool: 접속 성공 시 True, 실패 시 False
         """
         try:
+            connection_json, _, _ = parse_topology(connection_json)  # primary 접속 확인
             logging.info(f"MySQL 접속 시도: {connection_json}")
             connection = MySQLdb.connect(**connection_json)
             connection.close()
@@ -97,17 +258,14 @@ class MySQLConnector:
         return False
 
     def connect(self):
-        """데이터베이스에 접속해 커넥션을 반환"""
-
-        logging.info(f"DB 접속 시도: {self.connection_info}")
+        """커넥션 풀에서 커넥션을 대여하고 커서를 초기화합니다."""
 
         connection_json = json.loads(self.connection_info)
         try:
-            if self.check_connection(connection_json):
-                self.conn = MySQLdb.connect(cursorclass=DictCursor, **connection_json)
-                self.cursor = self.conn.cursor()  # 커서 초기화
-            else:
-                raise ConnectionError("Failed to connect to the database.")
+            self.role, self.pool, self.conn = acquire_connection(
+                connection_json, database_id=self.db.id if self.db else None, read_only=self.read_only, role=self.role
+            )
+            self.cursor = self.conn.cursor()  # 커서 초기화
         except MySQLdb.Error as e:
             raise ConnectionError(f"Failed to connect to database: {e}")
 
@@ -130,53 +288,188 @@ class MySQLConnector:
         logging.info(f"추출된 메타데이터: {data}")
         return data
 
-    def get_table_meta(self, schema_list: list = None):
+    def get_table_meta(self, schema_list: list = None, table_list: list = None):
         """
         주어진 데이터베이스의 테이블 메타데이터를 추출합니다.
 
+        information_schema의 tables, columns, key_column_usage를 JOIN하지 않고 각각 한 번씩
+        조회한 뒤 join_table_meta로 결합합니다. 필터는 세 조회 모두에 적용됩니다.
+
         Args:
             schema_list (list): 스키마 리스트
+            table_list (list, optional): 테이블명 리스트
 
         Returns:
-            list: 테이블 메타데이터 리스트
+            list: 테이블 메타데이터 리스트 (스키마, 테이블, 컬럼 순서로 정렬, 컬럼당 한 행)
         """
-        where_query = ""
-        if schema_list:
-            schema_text = ",".join([f"'{schema}'" for schema in schema_list])
-            where_query += f" AND c.table_schema IN ({schema_text})"
-        # 메타데이터 추출 로직을 여기에 추가합니다.
-        sql = f"""
-            SELECT 
-                c.table_schema AS schema_name,
-                c.table_name AS table_name,
-                t.table_comment AS table_description,
-                c.column_name AS name,
-                c.column_comment AS description,
-                c.column_type AS data_type,
-                c.column_default AS default_value,
-                c.ordinal_position AS column_seq,
-                CASE c.is_nullable WHEN 'YES' THEN TRUE ELSE FALSE END AS is_nullable,
-                CASE c.column_key WHEN 'PRI' THEN TRUE ELSE FALSE END AS is_primary_key,
-                CASE c.column_key WHEN 'UNI' THEN TRUE ELSE FALSE END AS is_unique,
-                CASE WHEN k.referenced_table_name IS NOT NULL THEN TRUE ELSE FALSE END AS is_foreign_key,
-                k.referenced_table_name AS foreign_key_table,
-                k.referenced_column_name AS foreign_key_column
-            FROM 
-                information_schema.columns c
-            LEFT JOIN 
-                information_schema.key_column_usage k
-                ON c.table_schema = k.TABLE_SCHEMA
-                AND c.table_name = k.TABLE_NAME
-                AND c.column_name = k.COLUMN_NAME
-            LEFT JOIN 
-                information_schema.tables t
-                ON c.table_schema = t.TABLE_SCHEMA
-                AND c.table_name = t.TABLE_NAME
-            WHERE 1=1
-                {where_query}
-                AND c.table_schema NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
-            ORDER BY c.table_schema, c.table_name, c.ordinal_position;
+        where_query, params = self._meta_filter(schema_list, table_list)
+
+        tables = self.query(
+            f"""
+            SELECT table_schema AS schema_name, table_name, table_comment AS table_description
+            FROM information_schema.tables
+            WHERE {where_query}
+            """,
+            params,
+        )
+        columns = self.query(
+            f"""
+            SELECT
+                table_schema AS schema_name,
+                table_name,
+                column_name AS name,
+                column_comment AS description,
+                column_type AS data_type,
+                column_default AS default_value,
+                ordinal_position AS column_seq,
+                is_nullable,
+                column_key
+            FROM information_schema.columns
+            WHERE {where_query}
+            ORDER BY table_schema, table_name, ordinal_position
+            """,
+            params,
+        )
+        foreign_keys = self.query(
+            f"""
+            SELECT
+                table_schema AS schema_name,
+                table_name,
+                column_name AS name,
+                referenced_table_name AS foreign_key_table,
+                referenced_column_name AS foreign_key_column
+            FROM information_schema.key_column_usage
+            WHERE {where_query}
+                AND referenced_table_name IS NOT NULL
+            ORDER BY table_schema, table_name, column_name, constraint_name
+            """,
+            params,
+        )
+        return join_table_meta(tables, columns, foreign_keys)
+
+    def get_table_signatures(self, schema_list: list = None, table_list: list = None) -> list:
         """
+        테이블별 변경 감지용 정보(CREATE_TIME, 컬럼/FK 정의 checksum)를 조회합니다.
 
-        data = self.query(sql)
-        return data
+        컬럼과 FK 정의는 서버에서 GROUP_CONCAT + MD5로 요약하므로 컬럼 행을 전송하지 않습니다.
+
+        Args:
+            schema_list (list): 스키마 리스트
+            table_list (list, optional): 테이블명 리스트
+
+        Returns:
+            list: [{"schema_name", "table_name", "table_description", "create_time", "checksum"}, ...]
+        """
+        where_query, params = self._meta_filter(schema_list, table_list)
+        self.cursor.execute("SET SESSION group_concat_max_len = %s", (16 * 1024 * 1024,))
+        self.session_vars.append("group_concat_max_len")
+
+        tables = self.query(
+            f"""
+            SELECT table_schema AS schema_name, table_name, table_comment AS table_description, create_time
+            FROM information_schema.tables
+            WHERE {where_query}
+            """,
+            params,
+        )
+        column_checksums = self.query(
+            f"""
+            SELECT
+                table_schema AS schema_name,
+                table_name,
+                MD5(GROUP_CONCAT(
+                    CONCAT_WS(CHAR(31), column_name, column_type, IFNULL(column_default, CHAR(0)),
+                        is_nullable, column_key, column_comment, ordinal_position)
+                    ORDER BY ordinal_position SEPARATOR '\\n'
+                )) AS checksum
+            FROM information_schema.columns
+            WHERE {where_query}
+            GROUP BY table_schema, table_name
+            """,
+            params,
+        )
+        fk_checksums = self.query(
+            f"""
+            SELECT
+                table_schema AS schema_name,
+                table_name,
+                MD5(GROUP_CONCAT(
+                    CONCAT_WS(CHAR(31), column_name, referenced_table_name, referenced_column_name)
+                    ORDER BY column_name, constraint_name SEPARATOR '\\n'
+                )) AS checksum
+            FROM information_schema.key_column_usage
+            WHERE {where_query}
+                AND referenced_table_name IS NOT NULL
+            GROUP BY table_schema, table_name
+            """,
+            params,
+        )
+
+        # CHAR(0) 등 binary 값이 섞이면 MD5 결과가 bytes로 반환될 수 있음
+        columns = {(row["schema_name"], row["table_name"]): _to_text(row["checksum"]) for row in column_checksums}
+        foreign_keys = {(row["schema_name"], row["table_name"]): _to_text(row["checksum"]) for row in fk_checksums}
+        signatures = []
+        for table in tables:
+            key = (table["schema_name"], table["table_name"])
+            digest = "|".join([columns.get(key) or "", foreign_keys.get(key) or "", table["table_description"] or ""])
+            signatures.append({**table, "checksum": hashlib.sha256(digest.encode("utf-8")).hexdigest()})
+        return signatures
+
+    @staticmethod
+    def _meta_filter(schema_list: list = None, table_list: list = None) -> tuple[str, list]:
+        """information_schema 조회용 스키마/테이블 필터 조건과 파라미터를 생성합니다."""
+        conditions = ["table_schema NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')"]
+        params = []
+        for column, values in (("table_schema", schema_list), ("table_name", table_list)):
+            if values:
+                conditions.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+                params.extend(values)
+        return " AND ".join(conditions), params
+
+
+def _to_text(value):
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else value
+
+
+def join_table_meta(tables: list, columns: list, foreign_keys: list) -> list:
+    """
+    information_schema에서 따로 읽은 테이블/컬럼/FK 정보를 (스키마, 테이블, 컬럼) 키로 결합합니다.
+
+    한 컬럼에 FK가 여러 개면 제약 조건명 순서상 첫 번째 FK를 사용하므로 컬럼당 한 행만 생성됩니다.
+
+    Args:
+        tables (list): [{"schema_name", "table_name", "table_description"}, ...]
+        columns (list): [{"schema_name", "table_name", "name", ..., "is_nullable", "column_key"}, ...]
+        foreign_keys (list): [{"schema_name", "table_name", "name", "foreign_key_table", "foreign_key_column"}, ...]
+
+    Returns:
+        list: get_table_meta 결과 행 목록
+    """
+    descriptions = {(row["schema_name"], row["table_name"]): row["table_description"] for row in tables}
+    references = {}
+    for row in foreign_keys:
+        references.setdefault((row["schema_name"], row["table_name"], row["name"]), row)
+
+    data = []
+    for column in columns:
+        key = (column["schema_name"], column["table_name"])
+        reference = references.get((*key, column["name"]))
+        data.append(
+            {
+                "schema_name": column["schema_name"],
+                "table_name": column["table_name"],
+                "table_description": descriptions.get(key),
+                "name": column["name"],
+                "description": column["description"],
+                "data_type": column["data_type"],
+                "default_value": column["default_value"],
+                "column_seq": column["column_seq"],
+                "is_nullable": column["is_nullable"] == "YES",
+                "is_primary_key": column["column_key"] == "PRI",
+                "is_unique": column["column_key"] == "UNI",
+                "is_foreign_key": reference is not None,
+                "foreign_key_table": reference["foreign_key_table"] if reference else None,
+                "foreign_key_column": reference["foreign_key_column"] if reference else None,
+            }
+        )
+    return data
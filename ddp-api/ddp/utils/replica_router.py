@@ -0,0 +1,214 @@
+import logging
+import math
+import random
+import threading
+import time
+
+import MySQLdb
+from ddp.utils.connection_pool import connection_fingerprint, get_pool
+from django.conf import settings
+
+DEFAULT_REPLICA_CONFIG = {
+    "MAX_LAG": 30,
+    "LAG_CHECK_INTERVAL": 5,
+    "RETRY_AFTER": 30,
+}
+
+PRIMARY = "primary"
+ROUTING_KEYS = ("max_replica_lag", "weight")  # MySQLdb.connect에 전달하지 않는 라우팅 설정
+
+
+def get_replica_config() -> dict:
+    """settings.DDP_REPLICA_ROUTING 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_REPLICA_CONFIG, **getattr(settings, "DDP_REPLICA_ROUTING", {})}
+
+
+def _connect_args(config: dict) -> dict:
+    """접속 정보에서 라우팅 설정을 제외합니다."""
+    return {key: value for key, value in config.items() if key not in ROUTING_KEYS}
+
+
+def parse_topology(connection_json: dict) -> tuple[dict, list, float]:
+    """
+    접속 정보를 primary와 replica 목록으로 분리합니다.
+
+    단일 서버 접속 정보({"host": ..., "user": ...})는 라우팅 설정(max_replica_lag 등)을 뺀 뒤 primary로 사용합니다.
+    replica 항목에 없는 값(user, password, database 등)은 primary 값을 사용합니다.
+
+        {
+            "primary": {"host": "db-primary", "user": "...", "password": "...", "database": "..."},
+            "replicas": [{"host": "db-replica-1", "weight": 2}, {"host": "db-replica-2"}],
+            "max_replica_lag": 10
+        }
+
+    Args:
+        connection_json (dict): Database.connection_info를 파싱한 값
+
+    Returns:
+        tuple: (primary 접속 정보, [(role, replica 접속 정보, weight), ...], 허용 복제 지연(초))
+    """
+    max_lag = connection_json.get("max_replica_lag", get_replica_config()["MAX_LAG"])
+    if "primary" not in connection_json:
+        return _connect_args(connection_json), [], max_lag
+
+    primary = _connect_args(connection_json["primary"])
+    replicas = []
+    for index, replica in enumerate(connection_json.get("replicas", [])):
+        weight = float(replica.get("weight", 1))
+        if weight <= 0:
+            continue
+        config = {**primary, **_connect_args(replica)}
+        replicas.append((f"replica{index}", config, weight))
+    return primary, replicas, max_lag
+
+
+def get_role_config(connection_json: dict, role: str) -> dict:
+    """role("primary", "replica0", ...)에 해당하는 접속 정보를 반환합니다."""
+    primary, replicas, _ = parse_topology(connection_json)
+    if role == PRIMARY:
+        return primary
+    for name, config, _ in replicas:
+        if name == role:
+            return config
+    raise ValueError(f"Unknown connection role: {role}")
+
+
+class ReplicaState:
+    """replica 서버 하나의 장애/복제 지연 상태입니다."""
+
+    def __init__(self):
+        self.down_until = 0.0
+        self.lag = None  # None: 미확인
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def is_down(self) -> bool:
+        return time.monotonic() < self.down_until
+
+    def mark_down(self, retry_after: float):
+        self.down_until = time.monotonic() + retry_after
+
+    def needs_lag_check(self, interval: float) -> bool:
+        return time.monotonic() - self.checked_at > interval
+
+    def update_lag(self, lag):
+        self.lag = lag
+        self.checked_at = time.monotonic()
+
+
+_states: dict[str, ReplicaState] = {}
+_states_lock = threading.Lock()
+
+
+def _get_state(config: dict) -> ReplicaState:
+    key = connection_fingerprint(config)
+    with _states_lock:
+        return _states.setdefault(key, ReplicaState())
+
+
+def measure_lag(conn):
+    """
+    replica의 복제 지연(초)을 조회합니다.
+
+    Returns:
+        float | None: 지연 시간. 복제가 멈췄으면 inf, 권한 부족 등으로 확인할 수 없으면 None
+    """
+    cursor = conn.cursor()
+    try:
+        # MySQL 8.0.22+ / 이전 버전. MariaDB 10.5+는 SHOW REPLICA STATUS에도 Seconds_Behind_Master를 반환
+        for sql in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+            try:
+                cursor.execute(sql)
+            except MySQLdb.Error:
+                continue
+            row = cursor.fetchone()
+            if not row:
+                return 0.0  # 복제 설정이 없는 서버
+            row = row if isinstance(row, dict) else {}
+            lag = next(
+                (row[column] for column in ("Seconds_Behind_Source", "Seconds_Behind_Master") if column in row), None
+            )
+            return math.inf if lag is None else float(lag)
+        return None
+    finally:
+        cursor.close()
+
+
+def _weighted_order(replicas: list) -> list:
+    """weight에 비례한 확률로 replica 시도 순서를 정합니다."""
+    return sorted(replicas, key=lambda replica: random.random() ** (1.0 / replica[2]), reverse=True)
+
+
+def acquire_connection(connection_json: dict, database_id: int = None, read_only: bool = False, role: str = None):
+    """
+    접속 정보에 맞는 서버의 커넥션 풀에서 커넥션을 대여합니다.
+
+    read_only 작업은 장애 상태가 아니고 복제 지연이 허용치 이내인 replica 중 하나로 보내며,
+    가능한 replica가 없으면 primary를 사용합니다. 접속에 실패한 replica는 RETRY_AFTER초 동안,
+    지연이 큰 replica는 다음 지연 확인 때까지 제외됩니다.
+
+    Args:
+        connection_json (dict): Database.connection_info를 파싱한 값
+        database_id (int, optional): Database 모델의 ID
+        read_only (bool): replica로 보낼 수 있는 읽기 전용 작업인지 여부
+        role (str, optional): 특정 서버를 지정할 때 사용 (예: KILL QUERY 대상 서버)
+
+    Returns:
+        tuple: (role, ConnectionPool, MySQLdb.Connection)
+    """
+    if role:
+        pool = get_pool(get_role_config(connection_json, role), database_id=database_id, role=role)
+        return role, pool, pool.acquire()
+
+    primary, replicas, max_lag = parse_topology(connection_json)
+    if read_only and replicas:
+        config = get_replica_config()
+        for name, replica_config, _ in _weighted_order(replicas):
+            state = _get_state(replica_config)
+            if state.is_down():
+                continue
+            lagging = state.lag is not None and state.lag > max_lag
+            if lagging and not state.needs_lag_check(config["LAG_CHECK_INTERVAL"]):
+                continue
+
+            pool = get_pool(replica_config, database_id=database_id, role=name)
+            try:
+                conn = pool.acquire()
+            except MySQLdb.Error as e:
+                logging.warning(f"replica 접속 실패, {config['RETRY_AFTER']}초 동안 제외합니다: {name}: {e}")
+                state.mark_down(config["RETRY_AFTER"])
+                continue
+            except ConnectionError as e:  # 풀 대기 시간 초과
+                logging.warning(f"replica 커넥션 풀 대기 시간 초과: {name}: {e}")
+                continue
+
+            if state.needs_lag_check(config["LAG_CHECK_INTERVAL"]):
+                with state.lock:
+                    if state.needs_lag_check(config["LAG_CHECK_INTERVAL"]):
+                        try:
+                            state.update_lag(measure_lag(conn))
+                        except MySQLdb.Error as e:
+                            logging.warning(f"replica 복제 지연 확인 실패: {name}: {e}")
+                            state.update_lag(None)
+            if state.lag is not None and state.lag > max_lag:
+                logging.warning(f"replica 복제 지연 {state.lag}초로 제외합니다: {name}")
+                pool.release(conn)
+                continue
+            return name, pool, conn
+
+    pool = get_pool(primary, database_id=database_id, role=PRIMARY)
+    return PRIMARY, pool, pool.acquire()
+
+
+def replica_stats() -> dict:
+    """replica별 장애/복제 지연 상태를 반환합니다. (키: 접속 정보 지문)"""
+    with _states_lock:
+        states = dict(_states)
+    return {
+        key: {
+            "down": state.is_down(),
+            "lag": None if state.lag == math.inf else state.lag,
+            "replication_stopped": state.lag == math.inf,
+        }
+        for key, state in states.items()
+    }
@@ -1,6 +1,7 @@
 from ddp.models import Database
 from ddp.serializers import DatabaseSerializer
 from ddp.services.database_service import validate_and_check_connection
+from ddp.utils.connection_pool import pool_stats
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -53,7 +54,8 @@ class DatabaseView(APIView):
                 ),
                 "connection_info": openapi.Schema(
                     type=openapi.TYPE_STRING,
-                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'})",
+                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'}). "
+                    "읽기 전용 replica가 있으면 {'primary': {...}, 'replicas': [{'host': 'replica-1', 'weight': 2}], 'max_replica_lag': 30}",
                 ),
             },
             required=["name", "connection_info"],
@@ -134,7 +136,8 @@ class DatabaseDetailView(APIView):
                 ),
                 "connection_info": openapi.Schema(
                     type=openapi.TYPE_STRING,
-                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'})",
+                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'}). "
+                    "읽기 전용 replica가 있으면 {'primary': {...}, 'replicas': [{'host': 'replica-1', 'weight': 2}], 'max_replica_lag': 30}",
                 ),
             },
             required=[],
@@ -208,7 +211,8 @@ class DatabaseConnectionView(APIView):
             properties={
                 "connection_info": openapi.Schema(
                     type=openapi.TYPE_STRING,
-                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'})",
+                    description="JSON 형식의 데이터베이스 접속 정보 (예: {'host': 'db', 'user': 'root', 'password': 'admin', 'database': 'test'}). "
+                    "읽기 전용 replica가 있으면 {'primary': {...}, 'replicas': [{'host': 'replica-1', 'weight': 2}], 'max_replica_lag': 30}",
                 ),
             },
             required=["connection_info"],
@@ -232,3 +236,38 @@ class DatabaseConnectionView(APIView):
         if success:
             return Response({"message": message}, status=status.HTTP_200_OK)
         return Response({"error": message}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class DatabasePoolStatsView(APIView):
+    """대상 DB 커넥션 풀 상태 API"""
+
+    http_method_names = ["get"]
+
+    @swagger_auto_schema(
+        operation_description="현재 프로세스의 커넥션 풀 통계 조회 API",
+        responses={
+            200: openapi.Response(
+                description="커넥션 풀 통계 조회 성공",
+                examples={
+                    "application/json": {
+                        "db:1:primary:3f2a9c0d1e2b4a5c": {
+                            "size": 3,
+                            "idle": 2,
+                            "in_use": 1,
+                            "min_size": 0,
+                            "max_size": 10,
+                            "created": 3,
+                            "reused": 120,
+                            "waits": 0,
+                            "evicted": 0,
+                            "discarded": 0,
+                            "ping_failures": 0,
+                        }
+                    }
+                },
+            )
+        },
+    )
+    def get(self, request: Request):
+        """커넥션 풀 통계 조회 API"""
+        return Response(pool_stats(), status=status.HTTP_200_OK)
@@ -1,15 +1,21 @@
-from ddp.models import Column, Database, Table
-from ddp.serializers import ColumnMetaSerializer
+import json
+
+from app.streaming import streaming_response
+from ddp.models import CatalogSnapshot, Database
+from ddp.services.catalog_service import catalog_response
 from ddp.services.meta_service import (
     create_tables_and_columns,
     extract_schema_metadata,
     extract_table_metadata,
+    iter_table_metadata,
 )
+from ddp.services.sync_service import sync_database_metadata
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
 
@@ -86,6 +92,18 @@ class TableMetaExtractView(APIView):
             },
             required=["connection_info", "schema_list"],
         ),
+        manual_parameters=[
+            openapi.Parameter(
+                "progress",
+                openapi.IN_QUERY,
+                description=(
+                    "true이면 스키마별 추출 진행 상황을 NDJSON으로 스트리밍합니다. "
+                    '({"type": "progress", "schema", "done", "total", "tables"} ... {"type": "result", "metadata"})'
+                ),
+                type=openapi.TYPE_STRING,
+                default="false",
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="테이블 메타데이터 추출 성공",
@@ -128,37 +146,46 @@ class TableMetaExtractView(APIView):
             return Response({"message": "Invalid JSON format in connection_info"}, status=404)
 
         schema_list = request.data.get("schema_list", [])
+        if request.query_params.get("progress", "false").lower() == "true":
+            return self.stream(request, connection_info, schema_list)
         try:
             metadata = extract_table_metadata(connection_info, schema_list)
             return Response(metadata, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def stream(self, request: Request, connection_info: str, schema_list: list):
+        """스키마별 추출 진행 상황과 최종 결과를 NDJSON으로 스트리밍합니다."""
+
+        def events():
+            try:
+                for event in iter_table_metadata(connection_info, schema_list):
+                    yield json.dumps(event, cls=JSONEncoder, ensure_ascii=False) + "\n"
+            except Exception as e:
+                yield json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False) + "\n"
+
+        response = streaming_response(request, events(), content_type="application/x-ndjson; charset=utf-8")
+        response["X-Accel-Buffering"] = "no"  # NGINX 응답 버퍼링 비활성화
+        return response
+
 
 class TableMetaView(APIView):
     """테이블 메타 정보 API"""
 
+    @swagger_auto_schema(
+        operation_description="저장된 테이블/컬럼 메타 정보 조회 API (ETag, If-None-Match 지원)",
+        manual_parameters=[
+            openapi.Parameter("If-None-Match", openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False),
+        ],
+        responses={
+            200: openapi.Response(description="메타 정보 조회 성공"),
+            304: openapi.Response(description="카탈로그 변경 없음"),
+        },
+    )
     def get(self, request: Request, pk: int):
         """메타 정보 상세 조회 API"""
         try:
-            tables = Table.objects.filter(database_id=pk)
-
-            meta_info = []
-            for table in tables:
-                columns = Column.objects.filter(table=table).order_by("column_seq")
-                serialized_columns = ColumnMetaSerializer(columns, many=True).data
-
-                meta_info.append(
-                    {
-                        "schema_name": table.schema_name,
-                        "table_name": table.name,
-                        "table_description": table.description,
-                        "columns": serialized_columns,
-                    }
-                )
-
-            return Response(meta_info, status=status.HTTP_200_OK)
-
+            return catalog_response(request, pk, CatalogSnapshot.KIND_META)
         except Exception as e:
             return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -173,7 +200,61 @@ class TableMetaView(APIView):
         if not metadata:
             return Response({"message": "'metadata' is required"}, status=404)
         try:
-            create_tables_and_columns(database, metadata)
-            return Response({"message": "Tables and columns created successfully"}, status=status.HTTP_201_CREATED)
+            table_count, column_count = create_tables_and_columns(database, metadata)
+            return Response(
+                {"message": "Tables and columns created successfully", "tables": table_count, "columns": column_count},
+                status=status.HTTP_201_CREATED,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class DatabaseMetaSyncView(APIView):
+    """저장된 메타데이터 증분 동기화 API"""
+
+    http_method_names = ["post"]
+
+    @swagger_auto_schema(
+        operation_description="원본 DB의 information_schema와 비교해 변경된 테이블/컬럼만 동기화하는 API",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "schema_list": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                    description="동기화할 스키마 목록 (없으면 이미 저장된 스키마 전체)",
+                ),
+            },
+        ),
+        responses={
+            200: openapi.Response(
+                description="동기화 성공",
+                examples={
+                    "application/json": {
+                        "tables": {"added": 1, "updated": 2, "deleted": 0, "unchanged": 9997},
+                        "columns": {"added": 9, "updated": 1, "deleted": 1},
+                        "changed_tables": ["shop.orders", "shop.coupons", "shop.users"],
+                        "elapsed_ms": 412.3,
+                    }
+                },
+            ),
+            404: openapi.Response(
+                description="데이터베이스를 찾을 수 없음",
+                examples={"application/json": {"error": "Database not found"}},
+            ),
+        },
+    )
+    def post(self, request: Request, pk: int):
+        """메타데이터 증분 동기화 API"""
+        try:
+            database = Database.objects.get(pk=pk)
+        except Database.DoesNotExist:
+            return Response({"error": "Database not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            summary = sync_database_metadata(database, request.data.get("schema_list") or None)
+            return Response(summary, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,11 +1,11 @@
 import logging
 
-from ddp.models import Database, Table
+from ddp.models import CatalogSnapshot, Database, Table
 from ddp.serializers import TableSerializer
+from ddp.services.catalog_service import catalog_response
 from ddp.services.table_service import create_tables_and_columns
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -17,7 +17,7 @@ class TableView(APIView):
     http_method_names = ["get", "post"]
 
     @swagger_auto_schema(
-        operation_description="테이블 목록 조회 API",
+        operation_description="테이블 목록 조회 API (ETag, If-None-Match 지원)",
         responses={
             200: openapi.Response(
                 description="테이블 목록 조회 성공",
@@ -39,14 +39,13 @@ class TableView(APIView):
                         },
                     ]
                 },
-            )
+            ),
+            304: openapi.Response(description="카탈로그 변경 없음"),
         },
     )
     def get(self, request: Request, pk: int):
         """테이블 목록 조회 API"""
-        tables = Table.objects.filter(database_id=pk).all()
-        serializer = TableSerializer(tables, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return catalog_response(request, pk, CatalogSnapshot.KIND_TABLES)
 
 
 class TableDetailView(APIView):
@@ -1,12 +1,12 @@
 # llm_agent/agents/query_generator.py
 import json
 import logging
+from typing import Iterator
 
 from langchain.prompts import PromptTemplate
-from langchain_core.messages.ai import AIMessage
 from langchain_core.runnables import Runnable
-from langchain_openai import ChatOpenAI
-from llm.utils.logger import save_llm_log
+from llm.agents.registry import llm_registry
+from llm.utils.logger import asave_llm_log, save_llm_log
 
 # You are an elite data analyst who must generate precise MySQL queries under extreme urgency.
 # The fate of the mission depends on generating ONE perfect SQL query that answers the user's question using the metadata provided.
@@ -66,20 +66,9 @@ from llm.utils.logger import save_llm_log
 
 # Question:
 # {question}
-def build_query_generator_agent(model: str = "gpt-4o", temperature: float = 0) -> Runnable:
-    """
-    자연어 질문을 SQL 쿼리로 바꾸는 LangChain 에이전트를 생성합니다.
-
-    Args:
-        model (str): 사용할 OpenAI 모델
-        temperature (float): 창의성 정도 (0은 가장 논리적)
-
-    Returns:
-        LLMChain: LangChain 기반 SQL 생성 체인
-    """
-    prompt = PromptTemplate(
-        input_variables=["question", "meta_info"],
-        template="""
+QUERY_GENERATOR_PROMPT = PromptTemplate(
+    input_variables=["question", "meta_info"],
+    template="""
 You are an expert in creating MySQL queries.
 You should help me create the MySQL query I need for the 'Question' I give. 
 Your answers should ONLY be based on the form given below and should follow the answer and format guidelines.
@@ -116,23 +105,48 @@ Use the given 'Meta Info' to create an appropriate query for 'Question'.
 - Question
 {question}
 """,
-    )
+)
 
-    llm = ChatOpenAI(
-        model=model,
-        temperature=temperature,
-    )
 
-    return prompt | llm
+def build_query_generator_agent(model: str = "gpt-4o", temperature: float = 0) -> Runnable:
+    """
+    자연어 질문을 SQL 쿼리로 바꾸는 LangChain 에이전트를 반환합니다.
 
+    체인은 (model, temperature)별로 한 번만 생성되어 프로세스 전체에서 재사용됩니다.
+
+    Args:
+        model (str): 사용할 OpenAI 모델
+        temperature (float): 창의성 정도 (0은 가장 논리적)
 
-def generate_sql_query(question: str, meta_info: str) -> dict:
+    Returns:
+        LLMChain: LangChain 기반 SQL 생성 체인
+    """
+    return llm_registry.get_chain("query_generator", QUERY_GENERATOR_PROMPT, model, temperature)
+
+
+def _parse_generated_sql(content: str, log_id: str) -> dict:
+    """LLM 응답 본문을 SQL JSON 객체로 변환합니다."""
+    try:
+        if "```json" in content:
+            content = content.split("```json")[1].strip()
+            content = content.split("```")[0].strip()
+
+        logging.info(f"[QueryGenerator] Result: {content}")
+        result = json.loads(content)  # Updated to use 'content' instead of 'response.text()'
+        result["id"] = log_id
+        return result
+    except json.JSONDecodeError:
+        return {"result": "ERROR", "message": "Invalid response format from LLM"}
+
+
+def generate_sql_query(question: str, meta_info: str, meta_tokens: int = None) -> dict:
     """
     자연어 질문과 메타데이터를 기반으로 SQL 쿼리를 생성합니다.
 
     Args:
         question (str): 사용자의 자연어 질문
         meta_info (str): 테이블/컬럼 설명
+        meta_tokens (int, optional): meta_info 토큰 수 (LLMLog에 기록)
 
     Returns:
         dict: 생성된 SQL 쿼리 JSON 객체
@@ -144,17 +158,52 @@ def generate_sql_query(question: str, meta_info: str) -> dict:
     filled_prompt = prompt.format(question=question, meta_info=meta_info)
     logging.info(f"[QueryGenerator] Prompt:\n{filled_prompt}")
     response = chain.invoke({"question": question, "meta_info": meta_info})
-    try:
-        content = response.content
+    log = save_llm_log(question=question, ai_response=response, agent="query_generator", meta_tokens=meta_tokens)
+    return _parse_generated_sql(response.content, log.id)
 
-        if "```json" in content:
-            content = content.split("```json")[1].strip()
-            content = content.split("```")[0].strip()
 
-        logging.info(f"[QueryGenerator] Result: {content}")
-        log = save_llm_log(question=question, ai_response=response, agent="query_generator")
-        result = json.loads(content)  # Updated to use 'content' instead of 'response.text()'
-        result["id"] = log.id
-        return result
-    except json.JSONDecodeError:
-        return {"result": "ERROR", "message": "Invalid response format from LLM"}
+async def agenerate_sql_query(question: str, meta_info: str, meta_tokens: int = None) -> dict:
+    """
+    generate_sql_query의 비동기 버전입니다.
+
+    LLM 호출(ainvoke)과 LLMLog 저장(async ORM)을 기다리는 동안 이벤트 루프의 다른 요청을 처리할 수 있습니다.
+
+    Returns:
+        dict: generate_sql_query와 같은 결과
+    """
+    chain = build_query_generator_agent()
+    logging.info(f"[QueryGenerator] Prompt:\n{chain.first.format(question=question, meta_info=meta_info)}")
+    response = await chain.ainvoke({"question": question, "meta_info": meta_info})
+    log = await asave_llm_log(question=question, ai_response=response, agent="query_generator", meta_tokens=meta_tokens)
+    return _parse_generated_sql(response.content, log.id)
+
+
+def stream_sql_query(question: str, meta_info: str, meta_tokens: int = None) -> Iterator[tuple[str, object]]:
+    """
+    generate_sql_query와 같은 SQL 생성을 LLM 토큰이 도착하는 대로 스트리밍합니다.
+
+    스트림이 끝나면 chunk를 합친 응답으로 LLMLog를 저장하고 결과를 반환합니다.
+    소비자가 중간에 제너레이터를 닫으면 LLM 스트림 요청도 함께 닫히며 LLMLog는 저장하지 않습니다.
+
+    Args:
+        question (str): 사용자의 자연어 질문
+        meta_info (str): 테이블/컬럼 설명
+        meta_tokens (int, optional): meta_info 토큰 수 (LLMLog에 기록)
+
+    Yields:
+        tuple[str, object]:
+        - ("token", str): LLM 응답 조각
+        - ("result", dict): 마지막에 한 번, generate_sql_query와 같은 결과
+    """
+    chain = build_query_generator_agent()
+    logging.info(f"[QueryGenerator] Prompt:\n{chain.first.format(question=question, meta_info=meta_info)}")
+    response = None
+    for chunk in chain.stream({"question": question, "meta_info": meta_info}):
+        response = chunk if response is None else response + chunk
+        if chunk.content:
+            yield "token", chunk.content
+    if response is None:
+        yield "result", {"result": "ERROR", "message": "Empty response from LLM"}
+        return
+    log = save_llm_log(question=question, ai_response=response, agent="query_generator", meta_tokens=meta_tokens)
+    yield "result", _parse_generated_sql(response.content, log.id)
@@ -0,0 +1,187 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+from django.conf import settings
+from langchain.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+DEFAULT_LLM_CLIENT_CONFIG = {
+    "MAX_CONNECTIONS": 20,
+    "MAX_KEEPALIVE_CONNECTIONS": 10,
+    "KEEPALIVE_EXPIRY": 60,
+    "TIMEOUT": 60,
+    "MAX_RETRIES": 2,
+}
+
+
+def get_llm_client_config() -> dict:
+    """settings.DDP_LLM_CLIENT 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_LLM_CLIENT_CONFIG, **getattr(settings, "DDP_LLM_CLIENT", {})}
+
+
+class LoopLocalAsyncClient(httpx.AsyncClient):
+    """
+    실행 중인 이벤트 루프마다 별도의 httpx.AsyncClient로 요청을 보내는 AsyncClient입니다.
+
+    AsyncClient의 커넥션은 처음 사용한 이벤트 루프에 묶입니다. WSGI 서버의 async 뷰처럼 요청마다
+    새 이벤트 루프(async_to_sync)에서 실행되면 이전 루프의 keep-alive 커넥션은 사용할 수 없으므로,
+    루프별로 커넥션 풀을 두고 같은 루프 안에서만 커넥션을 재사용합니다.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Args:
+            **kwargs: 루프별 httpx.AsyncClient 생성 인자 (limits, timeout, transport)
+        """
+        super().__init__(**kwargs)
+        self._client_kwargs = kwargs
+        self._loop_lock = threading.Lock()
+        self._loop_clients = weakref.WeakKeyDictionary()  # {event loop: httpx.AsyncClient}
+
+    def client_for_loop(self) -> httpx.AsyncClient:
+        """현재 실행 중인 이벤트 루프의 AsyncClient를 반환합니다. (없으면 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            client = self._loop_clients.get(loop)
+            if client is None:
+                # 닫힌 루프의 클라이언트는 커넥션이 루프를 참조해 약한 참조만으로는 정리되지 않음
+                for closed in [key for key in self._loop_clients if key.is_closed()]:
+                    del self._loop_clients[closed]
+                client = self._loop_clients[loop] = httpx.AsyncClient(**self._client_kwargs)
+        return client
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self.client_for_loop().send(request, **kwargs)
+
+    async def aclose(self):
+        """현재 루프의 AsyncClient를 닫습니다."""
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            client = self._loop_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+        await super().aclose()
+
+
+class LLMClientRegistry:
+    """
+    프로세스 단위로 공유하는 LLM HTTP 커넥션 풀, ChatOpenAI 클라이언트, 에이전트 체인 레지스트리입니다.
+
+    모든 ChatOpenAI는 같은 httpx.Client/AsyncClient를 사용하므로 에이전트가 달라도 LLM 엔드포인트와의
+    keep-alive 커넥션을 재사용합니다. 생성은 lock으로 보호하며, 생성된 체인은 상태가 없어 여러 스레드에서
+    동시에 invoke해도 안전합니다.
+
+    ainvoke 커넥션 풀은 이벤트 루프별로 유지합니다. (LoopLocalAsyncClient)
+    """
+
+    def __init__(self, transport: httpx.BaseTransport = None, async_transport: httpx.AsyncBaseTransport = None):
+        """
+        Args:
+            transport (httpx.BaseTransport, optional): 동기 HTTP transport (테스트/벤치마크용 LLM 엔드포인트 대체)
+            async_transport (httpx.AsyncBaseTransport, optional): 비동기 HTTP transport
+        """
+        self._lock = threading.Lock()
+        self._transport = transport
+        self._async_transport = async_transport
+        self._http_client = None
+        self._http_async_client = None
+        self._models = {}  # {(model, temperature): ChatOpenAI}
+        self._chains = {}  # {(agent, model, temperature): Runnable}
+
+    def _limits(self, config: dict) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=config["MAX_CONNECTIONS"],
+            max_keepalive_connections=config["MAX_KEEPALIVE_CONNECTIONS"],
+            keepalive_expiry=config["KEEPALIVE_EXPIRY"],
+        )
+
+    def _ensure_http_clients(self):
+        """공유 HTTP 클라이언트를 생성합니다. (lock 보유 상태에서 호출)"""
+        if self._http_client is None:
+            config = get_llm_client_config()
+            self._http_client = httpx.Client(
+                limits=self._limits(config), timeout=config["TIMEOUT"], transport=self._transport
+            )
+            self._http_async_client = LoopLocalAsyncClient(
+                limits=self._limits(config), timeout=config["TIMEOUT"], transport=self._async_transport
+            )
+
+    def get_model(self, model: str, temperature: float = 0) -> ChatOpenAI:
+        """
+        (model, temperature)별로 한 번만 생성한 ChatOpenAI 클라이언트를 반환합니다.
+
+        Args:
+            model (str): OpenAI 모델명
+            temperature (float): 샘플링 온도
+
+        Returns:
+            ChatOpenAI: 공유 HTTP 커넥션 풀을 사용하는 클라이언트
+        """
+        key = (model, float(temperature))
+        llm = self._models.get(key)
+        if llm is not None:
+            return llm
+        with self._lock:
+            llm = self._models.get(key)
+            if llm is None:
+                self._ensure_http_clients()
+                config = get_llm_client_config()
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    http_client=self._http_client,
+                    http_async_client=self._http_async_client,
+                    timeout=config["TIMEOUT"],
+                    max_retries=config["MAX_RETRIES"],
+                    stream_usage=True,  # 스트리밍 응답에도 토큰 사용량 포함 (LLMLog 기록용)
+                )
+                self._models[key] = llm
+        return llm
+
+    def get_chain(self, agent: str, prompt: PromptTemplate, model: str, temperature: float = 0) -> Runnable:
+        """
+        (agent, model, temperature)별로 한 번만 생성한 prompt | llm 체인을 반환합니다.
+
+        Args:
+            agent (str): 에이전트 이름 (query_generator, table_selector, result_summarizer)
+            prompt (PromptTemplate): 에이전트 프롬프트 (모듈 상수)
+            model (str): OpenAI 모델명
+            temperature (float): 샘플링 온도
+
+        Returns:
+            Runnable: 재사용 가능한 체인
+        """
+        key = (agent, model, float(temperature))
+        chain = self._chains.get(key)
+        if chain is None:
+            llm = self.get_model(model, temperature)
+            with self._lock:
+                chain = self._chains.setdefault(key, prompt | llm)
+        return chain
+
+    def close(self):
+        """공유 HTTP 클라이언트를 닫고 캐시된 클라이언트/체인을 비웁니다."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._http_async_client = None  # 루프별 AsyncClient는 이벤트 루프 밖에서 닫지 않음
+            self._models.clear()
+            self._chains.clear()
+
+    def use_transports(self, transport: httpx.BaseTransport = None, async_transport: httpx.AsyncBaseTransport = None):
+        """기존 클라이언트를 닫고 이후 생성할 클라이언트가 주어진 transport를 사용하도록 합니다."""
+        self.close()
+        with self._lock:
+            self._transport = transport
+            self._async_transport = async_transport
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"models": [list(key) for key in self._models], "chains": [list(key) for key in self._chains]}
+
+
+llm_registry = LLMClientRegistry()
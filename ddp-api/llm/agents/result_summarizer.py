@@ -1,22 +1,25 @@
+import json
 import logging
 
+from django.conf import settings
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from llm.utils.logger import save_llm_log
+from llm.agents.registry import llm_registry
+from llm.tools.result_profiler import profile_result
+from llm.utils.logger import asave_llm_log, save_llm_log
 
+DEFAULT_RESULT_PROFILE_CONFIG = {
+    "TOP_K": 5,
+    "SAMPLE_ROWS": 10,
+    "MAX_BUCKETS": 24,
+}
 
-def summarize_query_result(question: str, columns: list[str], rows: list, model="gpt-4o") -> str:
-    is_timeseries = any(
-        "date" in col.lower() or "at" in col.lower() or "일자" in col or "일시" in col for col in columns
-    )
-    print(is_timeseries)
-    prompt = PromptTemplate(
-        input_variables=["question", "columns", "rows", "is_timeseries"],
-        template="""
+RESULT_SUMMARIZER_PROMPT = PromptTemplate(
+    input_variables=["question", "columns", "row_count", "column_stats", "trend", "sample_rows", "is_timeseries"],
+    template="""
 You are a professional data analyst.
 
 Your task is to:
-1. Generate a clear and factual Korean summary based on the user's question and the query result.
+1. Generate a clear and factual Korean summary based on the user's question and the statistics of the query result.
 2. Recommend the most appropriate chart type for visualizing the data.
 3. Structure the chart data according to the chart type, so it can be used directly in frontend components.
 
@@ -25,13 +28,21 @@ Your task is to:
 Inputs:
 - Question: {question}
 - Columns: {columns}
-- Rows: {rows}
+- Row Count: {row_count}
+- Column Statistics: {column_stats}
+- Trend: {trend}
+- Sample Rows: {sample_rows}
 - Is Time Series: {is_timeseries} (true or false)
 
+'Column Statistics' and 'Trend' were computed over ALL rows of the result:
+- numeric columns: min, max, mean, sum / categorical columns: distinct count and the most frequent values
+- 'Trend': row count and sums of numeric columns per time bucket of 'time_column' (null if there is no time column)
+'Sample Rows' are only a few evenly spaced example rows. Do NOT compute totals, counts or averages from them.
+
 ---
 
 Instructions:
-1. Write a concise summary in **Korean**, based ONLY on the data and question.
+1. Write a concise summary in **Korean**, based ONLY on the statistics and question.
 2. Avoid assumptions, vague expressions, or embellishments. Be factual and data-driven.
 3. Mention important values such as totals, counts, averages, max/min, trends, etc., if relevant.
 4. If 'Is Time Series' is true, the summary MUST reflect temporal trends (e.g., increase/decrease over time, peaks, daily/monthly averages) And MUST order the data accordingly.
@@ -74,21 +85,74 @@ Respond in the following JSON format:
   }}
 }}
 """,
-    )
+)
+
+
+def get_result_profile_config() -> dict:
+    """settings.DDP_RESULT_PROFILE 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_RESULT_PROFILE_CONFIG, **getattr(settings, "DDP_RESULT_PROFILE", {})}
+
 
-    llm = ChatOpenAI(model=model, temperature=0)
-    chain = prompt | llm
-    logging.info(
-        f"[ResultSummarizer] Prompt:\n{prompt.format(question=question, columns=columns, rows=rows, is_timeseries=is_timeseries)}"
+def _to_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+def _summary_inputs(question: str, columns: list[str], rows: list) -> dict:
+    """
+    요약 프롬프트 입력값을 생성합니다.
+
+    행 전체 대신 로컬에서 계산한 통계(result_profiler)를 전달하므로 프롬프트 크기는 행 수와 관계없이 일정합니다.
+    """
+    config = get_result_profile_config()
+    profile = profile_result(
+        columns,
+        rows,
+        top_k=config["TOP_K"],
+        sample_rows=config["SAMPLE_ROWS"],
+        max_buckets=config["MAX_BUCKETS"],
     )
-    result = chain.invoke(
-        {"question": question, "columns": ", ".join(columns), "rows": rows, "is_timeseries": is_timeseries}
-    )  # 최대 10줄만 사용
-    logging.info(f"[ResultSummarizer] Result: {result.content}")
-    # LLM 로그 저장 (선택 사항)
-    save_llm_log(question=question, ai_response=result, agent="result_summarizer")
-    content = result.content
+    is_timeseries = profile["trend"] is not None or any(
+        "date" in col.lower() or "at" in col.lower() or "일자" in col or "일시" in col for col in columns
+    )
+    return {
+        "question": question,
+        "columns": ", ".join(columns),
+        "row_count": profile["row_count"],
+        "column_stats": _to_json(profile["columns"]),
+        "trend": _to_json(profile["trend"]),
+        "sample_rows": _to_json(profile["sample"]),
+        "is_timeseries": is_timeseries,
+    }
+
+
+def _summary_content(content: str) -> str:
     if "```json" in content:
         content = content.split("```json")[1].strip()
         content = content.split("```")[0].strip()
     return content.strip()
+
+
+def summarize_query_result(question: str, columns: list[str], rows: list, model="gpt-4o") -> str:
+    prompt = RESULT_SUMMARIZER_PROMPT
+    inputs = _summary_inputs(question, columns, rows)
+
+    chain = llm_registry.get_chain("result_summarizer", prompt, model, 0)
+    logging.info(f"[ResultSummarizer] Prompt:\n{prompt.format(**inputs)}")
+    result = chain.invoke(inputs)
+    logging.info(f"[ResultSummarizer] Result: {result.content}")
+    # LLM 로그 저장 (선택 사항)
+    save_llm_log(question=question, ai_response=result, agent="result_summarizer")
+    return _summary_content(result.content)
+
+
+async def asummarize_query_result(question: str, columns: list[str], rows: list, model="gpt-4o") -> str:
+    """summarize_query_result의 비동기 버전입니다. (ainvoke + async ORM)"""
+    prompt = RESULT_SUMMARIZER_PROMPT
+    inputs = _summary_inputs(question, columns, rows)
+
+    chain = llm_registry.get_chain("result_summarizer", prompt, model, 0)
+    logging.info(f"[ResultSummarizer] Prompt:\n{prompt.format(**inputs)}")
+    result = await chain.ainvoke(inputs)
+    logging.info(f"[ResultSummarizer] Result: {result.content}")
+    await asave_llm_log(question=question, ai_response=result, agent="result_summarizer")
+    return _summary_content(result.content)
@@ -2,14 +2,12 @@ import json
 import logging
 
 from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from llm.utils.logger import save_llm_log
+from llm.agents.registry import llm_registry
+from llm.utils.logger import asave_llm_log, save_llm_log
 
-
-def select_relevant_tables(question: str, table_list: list[str], model="gpt-4o-mini", temperature=0) -> list[str]:
-    prompt = PromptTemplate(
-        input_variables=["question", "table_list"],
-        template="""
+TABLE_SELECTOR_PROMPT = PromptTemplate(
+    input_variables=["question", "table_list"],
+    template="""
 You are a SQL assistant.
 
 Given the user question and the list of available table names, select only the relevant tables that would be used to answer the question.
@@ -23,16 +21,11 @@ Respond ONLY with the JSON object. No explanation. Do NOT wrap the JSON in tripl
 Respond in JSON format:
 {{ "relevant_tables": [1, 2] }}
 """,
-    )
+)
 
-    llm = ChatOpenAI(model=model, temperature=temperature)
-    chain = prompt | llm
-    filled_prompt = prompt.format(question=question, table_list=table_list)
-    logging.info(f"[TableSelector] Prompt:\n{filled_prompt}")
-    response = chain.invoke({"question": question, "table_list": "\n".join(table_list)})
 
-    save_llm_log(question=question, ai_response=response, agent="table_selector")
-    content = response.content
+def _parse_relevant_tables(content: str) -> list:
+    """선택기 응답 본문에서 테이블 ID 목록을 추출합니다."""
     if "```json" in content:
         content = content.split("```json")[1].strip()
         content = content.split("```")[0].strip()
@@ -44,3 +37,29 @@ Respond in JSON format:
         return response_json.get("relevant_tables", [])
     except Exception:
         return []
+
+
+def select_relevant_tables(question: str, table_list: list[str], model="gpt-4o-mini", temperature=0) -> list[str]:
+    prompt = TABLE_SELECTOR_PROMPT
+
+    chain = llm_registry.get_chain("table_selector", prompt, model, temperature)
+    filled_prompt = prompt.format(question=question, table_list=table_list)
+    logging.info(f"[TableSelector] Prompt:\n{filled_prompt}")
+    response = chain.invoke({"question": question, "table_list": "\n".join(table_list)})
+
+    save_llm_log(question=question, ai_response=response, agent="table_selector")
+    return _parse_relevant_tables(response.content)
+
+
+async def aselect_relevant_tables(
+    question: str, table_list: list[str], model="gpt-4o-mini", temperature=0
+) -> list[str]:
+    """select_relevant_tables의 비동기 버전입니다. (ainvoke + async ORM)"""
+    prompt = TABLE_SELECTOR_PROMPT
+
+    chain = llm_registry.get_chain("table_selector", prompt, model, temperature)
+    logging.info(f"[TableSelector] Prompt:\n{prompt.format(question=question, table_list=table_list)}")
+    response = await chain.ainvoke({"question": question, "table_list": "\n".join(table_list)})
+
+    await asave_llm_log(question=question, ai_response=response, agent="table_selector")
+    return _parse_relevant_tables(response.content)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0006_alter_queryexecutionlog_table"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queryexecutionlog",
+            name="scanned_rows",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="queryexecutionlog",
+            name="truncated",
+            field=models.BooleanField(default=False),
+        ),
+    ]
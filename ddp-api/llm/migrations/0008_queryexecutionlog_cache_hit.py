@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0007_queryexecutionlog_scanned_rows_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queryexecutionlog",
+            name="cache_hit",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0011_rename_eng_name_column_name_and_more"),
+        ("llm", "0008_queryexecutionlog_cache_hit"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueryJob",
+            fields=[
+                ("id", models.CharField(max_length=32, primary_key=True, serialize=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("succeeded", "succeeded"),
+                            ("failed", "failed"),
+                            ("cancelled", "cancelled"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("summarize", models.BooleanField(default=False)),
+                ("mode", models.CharField(default="buffered", max_length=16)),
+                ("shape", models.CharField(default="rows", max_length=16)),
+                ("use_cache", models.BooleanField(default=True)),
+                ("connection_id", models.BigIntegerField(blank=True, null=True)),
+                ("result", models.TextField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "database",
+                    models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to="ddp.database"),
+                ),
+                (
+                    "llm_log",
+                    models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to="llm.llmlog"),
+                ),
+            ],
+            options={
+                "db_table": "query_job",
+            },
+        ),
+    ]
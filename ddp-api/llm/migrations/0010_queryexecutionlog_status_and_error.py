@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0009_queryjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queryexecutionlog",
+            name="status",
+            field=models.CharField(default="SUCCESS", max_length=16),
+        ),
+        migrations.AddField(
+            model_name="queryexecutionlog",
+            name="error",
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0010_queryexecutionlog_status_and_error"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queryjob",
+            name="connection_role",
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
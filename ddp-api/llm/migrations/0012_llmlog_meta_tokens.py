@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0011_queryjob_connection_role"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="llmlog",
+            name="meta_tokens",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ddp", "0015_database_metadata_version_catalogsnapshot"),
+        ("llm", "0012_llmlog_meta_tokens"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SQLGenerationCache",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("catalog_version", models.IntegerField()),
+                ("question_key", models.CharField(max_length=64)),
+                ("normalized_question", models.TextField()),
+                ("query", models.TextField()),
+                ("hit_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_hit_at", models.DateTimeField(blank=True, null=True)),
+                ("database", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="ddp.database")),
+                (
+                    "source_log",
+                    models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to="llm.llmlog"),
+                ),
+            ],
+            options={
+                "db_table": "sql_generation_cache",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("database", "catalog_version", "question_key"), name="uniq_sql_cache_question"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("llm", "0013_sqlgenerationcache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="queryjob",
+            name="confirmed",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="queryjob",
+            name="preflight",
+            field=models.BooleanField(blank=True, null=True),
+        ),
+    ]
@@ -10,6 +10,7 @@ class LLMLog(models.Model):
     prompt_tokens = models.IntegerField()
     completion_tokens = models.IntegerField()
     total_tokens = models.IntegerField()
+    meta_tokens = models.IntegerField(blank=True, null=True)  # 프롬프트에 포함된 meta_info 토큰 수 (로컬 계산)
     agent = models.CharField(max_length=128, blank=True, null=True)  # LLM 호출 에이전트
     # 생성 시간
     created_at = models.DateTimeField(auto_now_add=True)
@@ -23,9 +24,75 @@ class QueryExecutionLog(models.Model):
     query = models.TextField()
     llm_log = models.ForeignKey(LLMLog, on_delete=models.SET_NULL, null=True)
     row_count = models.IntegerField()
+    scanned_rows = models.IntegerField(blank=True, null=True)  # 커서에서 읽은 행 수
+    truncated = models.BooleanField(default=False)  # 행/용량 상한으로 결과가 잘렸는지 여부
+    cache_hit = models.BooleanField(default=False)  # 결과 캐시 적중 여부
     elapsed_ms = models.FloatField()
+    status = models.CharField(max_length=16, default="SUCCESS")  # SUCCESS, ERROR, TIMEOUT
+    error = models.TextField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "query_execution_log"
+
+
+class QueryJob(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "pending"),
+        (STATUS_RUNNING, "running"),
+        (STATUS_SUCCEEDED, "succeeded"),
+        (STATUS_FAILED, "failed"),
+        (STATUS_CANCELLED, "cancelled"),
+    ]
+
+    id = models.CharField(max_length=32, primary_key=True)  # 작업 ID (uuid4 hex)
+    database = models.ForeignKey("ddp.Database", on_delete=models.SET_NULL, null=True)
+    llm_log = models.ForeignKey(LLMLog, on_delete=models.SET_NULL, null=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    # 실행 옵션
+    summarize = models.BooleanField(default=False)
+    mode = models.CharField(max_length=16, default="buffered")
+    shape = models.CharField(max_length=16, default="rows")
+    use_cache = models.BooleanField(default=True)
+    preflight = models.BooleanField(blank=True, null=True)  # EXPLAIN 비용 사전 확인 여부 (None이면 서버 설정)
+    confirmed = models.BooleanField(default=False)  # 예상 비용 초과를 확인하고 실행을 승인했는지 여부
+    # 실행 중인 MySQL 커넥션 ID (KILL QUERY 대상)
+    connection_id = models.BigIntegerField(blank=True, null=True)
+    connection_role = models.CharField(max_length=32, blank=True, null=True)  # 실행 중인 서버 (primary, replica0, ...)
+    result = models.TextField(blank=True, null=True)  # 실행 결과 (JSON)
+    error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)  # 결과 보관 만료 시각
+
+    class Meta:
+        db_table = "query_job"
+
+
+class SQLGenerationCache(models.Model):
+    database = models.ForeignKey("ddp.Database", on_delete=models.CASCADE)
+    catalog_version = models.IntegerField()  # 생성 당시 Database.metadata_version
+    question_key = models.CharField(max_length=64)  # 정규화된 질문의 SHA-256
+    normalized_question = models.TextField()
+    query = models.TextField()  # 실행에 성공한 SQL
+    source_log = models.ForeignKey(LLMLog, on_delete=models.SET_NULL, null=True)  # SQL을 생성한 LLM 로그
+    hit_count = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "sql_generation_cache"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["database", "catalog_version", "question_key"], name="uniq_sql_cache_question"
+            ),
+        ]
@@ -0,0 +1,85 @@
+import logging
+
+from llm.agents.query_generator import agenerate_sql_query, stream_sql_query
+from llm.services.meta_service import (
+    aget_filtered_metadata_by_llm,
+    get_filtered_metadata_by_llm,
+)
+from llm.services.sql_cache import aget_cached_sql, get_cached_sql
+from llm.utils.sse import format_sse
+
+
+def iter_sql_generation_events(database_id: int, question: str):
+    """
+    SQL 생성 과정을 Server-Sent Events로 순차 생성합니다.
+
+    이벤트 순서:
+        1. stage {"stage": "selecting_tables"}
+        2. stage {"stage": "tables_selected", "meta_tokens": int}
+        3. token {"content": str} (LLM 응답 조각마다)
+        4. result {"query", "result", "id", "cache_hit"} (SQLGenerationView 응답과 동일)
+    질문 캐시에 적중하면 stage {"stage": "cache_hit"} 후 바로 result를 보내며,
+    실패하면 error {"result": "ERROR", "message"}를 보내고 종료합니다.
+    클라이언트가 연결을 끊어 제너레이터가 닫히면 LLM 스트림 요청도 닫힙니다.
+
+    Args:
+        database_id (int): Database 모델의 ID
+        question (str): 사용자 질문
+
+    Yields:
+        str: SSE 메시지
+    """
+    try:
+        cached = get_cached_sql(database_id, question)
+        if cached:
+            yield format_sse("stage", {"stage": "cache_hit"})
+            yield format_sse("result", cached)
+            return
+
+        yield format_sse("stage", {"stage": "selecting_tables"})
+        meta_info, meta_tokens = get_filtered_metadata_by_llm(question=question, database_id=database_id)
+        if not meta_info:
+            yield format_sse("error", {"result": "ERROR", "message": "메타 정보가 없습니다."})
+            return
+        yield format_sse("stage", {"stage": "tables_selected", "meta_tokens": meta_tokens})
+
+        for kind, payload in stream_sql_query(question=question, meta_info=meta_info, meta_tokens=meta_tokens):
+            if kind == "token":
+                yield format_sse("token", {"content": payload})
+            else:
+                yield format_sse("result", {**payload, "cache_hit": False})
+    except GeneratorExit:
+        logging.info(f"SQL 생성 스트림 중단 (클라이언트 연결 종료): {question}")
+        raise
+    except Exception as e:
+        logging.error(f"Error streaming SQL generation: {str(e)}")
+        yield format_sse("error", {"result": "ERROR", "message": str(e)})
+
+
+async def agenerate_sql(database_id: int, question: str) -> dict:
+    """
+    SQLGenerationView와 같은 SQL 생성 파이프라인을 비동기로 실행합니다.
+
+    질문 캐시 조회와 LLMLog 저장은 async ORM으로, 테이블 선택기와 SQL 생성기 호출은 ainvoke로
+    기다리므로 LLM 응답을 기다리는 동안 워커 스레드를 점유하지 않습니다.
+
+    Args:
+        database_id (int): Database 모델의 ID
+        question (str): 사용자 질문
+
+    Returns:
+        dict: {"query", "result", "id", "cache_hit"}
+
+    Raises:
+        ValueError: 메타 정보가 없거나 관련 테이블을 찾지 못한 경우
+    """
+    cached = await aget_cached_sql(database_id, question)
+    if cached:
+        return cached
+
+    meta_info, meta_tokens = await aget_filtered_metadata_by_llm(database_id=database_id, question=question)
+    logging.info(f"Meta info ({meta_tokens} tokens): {meta_info}")
+    if not meta_info:
+        raise ValueError("메타 정보가 없습니다.")
+    result = await agenerate_sql_query(question=question, meta_info=meta_info, meta_tokens=meta_tokens)
+    return {**result, "cache_hit": False}
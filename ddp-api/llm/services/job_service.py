@@ -0,0 +1,225 @@
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import MySQLdb
+from ddp.utils.mysql_connector import MySQLConnector
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from llm.models import QueryJob
+from llm.services.query_service import execute_query
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_JOB_CONFIG = {
+    "MAX_WORKERS": 4,
+    "MAX_PENDING": 32,
+    "RESULT_TTL": 3600,
+}
+
+ACTIVE_STATUSES = (QueryJob.STATUS_PENDING, QueryJob.STATUS_RUNNING)
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+def get_job_config() -> dict:
+    """settings.DDP_QUERY_JOBS 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_JOB_CONFIG, **getattr(settings, "DDP_QUERY_JOBS", {})}
+
+
+def _get_executor() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            config = get_job_config()
+            _executor = ThreadPoolExecutor(max_workers=config["MAX_WORKERS"], thread_name_prefix="query-job")
+            _slots = threading.BoundedSemaphore(config["MAX_WORKERS"] + config["MAX_PENDING"])
+        return _executor, _slots
+
+
+def purge_expired_jobs() -> int:
+    """결과 보관 시간이 지난 작업을 삭제하고 삭제된 개수를 반환합니다."""
+    deleted, _ = QueryJob.objects.filter(expires_at__lt=timezone.now()).delete()
+    return deleted
+
+
+def submit_job(
+    database,
+    session_id,
+    summarize=False,
+    mode="buffered",
+    shape="rows",
+    use_cache=True,
+    preflight=None,
+    confirmed=False,
+) -> QueryJob:
+    """
+    쿼리 실행 작업을 등록하고 워커 풀에 제출합니다. 실행을 기다리지 않고 바로 반환합니다.
+
+    실행 중 + 대기 중인 작업 수는 MAX_WORKERS + MAX_PENDING으로 제한됩니다.
+
+    Args:
+        database: Database 객체
+        session_id (str): 쿼리를 생성한 LLM 로그 ID
+        summarize, mode, shape, use_cache, preflight, confirmed: execute_query 참고
+
+    Returns:
+        QueryJob: 등록된 작업 (status=pending)
+
+    Raises:
+        RuntimeError: 대기열이 가득 찬 경우
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        raise RuntimeError("Too many query jobs are queued. Please retry later.")
+
+    try:
+        purge_expired_jobs()
+        job = QueryJob.objects.create(
+            id=uuid.uuid4().hex,
+            database=database,
+            llm_log_id=session_id,
+            summarize=summarize,
+            mode=mode,
+            shape=shape,
+            use_cache=use_cache,
+            preflight=preflight,
+            confirmed=confirmed,
+        )
+        executor.submit(_run_job, job.id, slots)
+    except Exception:
+        slots.release()
+        raise
+    logging.info(f"쿼리 작업 등록: {job.id}")
+    return job
+
+
+def _finish(job_id: str, status: str, **fields) -> int:
+    """실행 중인 작업만 종료 상태로 변경합니다. (이미 취소된 작업은 덮어쓰지 않음)"""
+    now = timezone.now()
+    return QueryJob.objects.filter(id=job_id, status=QueryJob.STATUS_RUNNING).update(
+        status=status,
+        connection_id=None,
+        finished_at=now,
+        expires_at=now + timedelta(seconds=get_job_config()["RESULT_TTL"]),
+        **fields,
+    )
+
+
+def _run_job(job_id: str, slots: threading.BoundedSemaphore):
+    """워커 스레드에서 작업을 실행하고 결과를 저장합니다."""
+    close_old_connections()
+    try:
+        started = QueryJob.objects.filter(id=job_id, status=QueryJob.STATUS_PENDING).update(
+            status=QueryJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if not started:  # 대기 중에 취소됨
+            return
+        job = QueryJob.objects.select_related("database").get(id=job_id)
+
+        def check_cancelled(connector=None):
+            if QueryJob.objects.filter(id=job_id, status=QueryJob.STATUS_CANCELLED).exists():
+                raise RuntimeError("Query job was cancelled.")
+
+        def register_connection(connector):
+            QueryJob.objects.filter(id=job_id).update(
+                connection_id=connector.conn.thread_id(), connection_role=connector.role
+            )
+            # 커넥션 ID를 기록하기 전에 취소되었다면 KILL QUERY 대상이 없었으므로 여기서 중단
+            check_cancelled()
+
+        result = execute_query(
+            database=job.database,
+            summarize=job.summarize,
+            session_id=job.llm_log_id,
+            mode=job.mode,
+            shape=job.shape,
+            use_cache=job.use_cache,
+            preflight=job.preflight,
+            confirmed=job.confirmed,
+            on_connect=register_connection,
+            # KILL QUERY는 그 순간 실행 중인 문장(세션 설정, EXPLAIN 등)만 중단하므로 본 쿼리 직전에 다시 확인
+            before_query=check_cancelled,
+        )
+        if "error" in result:
+            _finish(job_id, QueryJob.STATUS_FAILED, error=result["error"])
+        else:
+            _finish(job_id, QueryJob.STATUS_SUCCEEDED, result=json.dumps(result, cls=JSONEncoder, ensure_ascii=False))
+        logging.info(f"쿼리 작업 종료: {job_id}")
+    except Exception as e:
+        logging.error(f"Error running query job {job_id}: {str(e)}")
+        _finish(job_id, QueryJob.STATUS_FAILED, error=str(e))
+    finally:
+        slots.release()
+        connection.close()
+
+
+def get_job(job_id: str) -> QueryJob:
+    """
+    작업을 조회합니다. 결과 보관 시간이 지난 작업은 없는 것으로 취급합니다.
+
+    Raises:
+        QueryJob.DoesNotExist: 작업이 없거나 만료된 경우
+    """
+    job = QueryJob.objects.get(id=job_id)
+    if job.expires_at and job.expires_at < timezone.now():
+        raise QueryJob.DoesNotExist(f"QueryJob(id={job_id}) has expired.")
+    return job
+
+
+def cancel_job(job_id: str) -> QueryJob:
+    """
+    작업을 취소합니다.
+
+    대기 중인 작업은 실행되지 않으며, 실행 중인 작업은 같은 서버의 별도 커넥션에서
+    실행 중인 커넥션 ID로 KILL QUERY를 실행해 MySQL 쿼리를 중단합니다.
+    KILL QUERY가 세션 설정이나 EXPLAIN 문을 중단한 경우에는 워커가 본 쿼리 실행 직전에
+    취소 상태를 확인하고 중단합니다.
+    이미 종료된 작업은 변경하지 않습니다.
+
+    Args:
+        job_id (str): 작업 ID
+
+    Returns:
+        QueryJob: 취소 후 작업 상태
+    """
+    job = get_job(job_id)
+    now = timezone.now()
+    cancelled = QueryJob.objects.filter(id=job_id, status__in=ACTIVE_STATUSES).update(
+        status=QueryJob.STATUS_CANCELLED,
+        finished_at=now,
+        expires_at=now + timedelta(seconds=get_job_config()["RESULT_TTL"]),
+    )
+    if cancelled:
+        # 조회 이후 PENDING → RUNNING으로 바뀌었을 수 있으므로 취소 후의 커넥션 ID로 판단
+        # (아직 기록 전이면 워커가 기록 직후 취소 상태를 확인하고 중단)
+        thread_id, role = QueryJob.objects.filter(id=job_id).values_list("connection_id", "connection_role").first()
+        if thread_id and job.database:
+            try:
+                # 쿼리가 실행 중인 서버(primary 또는 replica)에서 KILL QUERY 실행
+                with MySQLConnector(job.database, role=role) as connector:
+                    connector.cursor.execute(f"KILL QUERY {int(thread_id)}")
+                logging.info(f"쿼리 작업 취소: {job_id} (KILL QUERY {thread_id})")
+            except MySQLdb.Error as e:  # 그 사이에 쿼리가 끝난 경우 등
+                logging.warning(f"KILL QUERY 실패: {job_id}: {str(e)}")
+    return QueryJob.objects.get(id=job_id)
+
+
+def serialize_job(job: QueryJob) -> dict:
+    """작업 상태 응답을 생성합니다. (결과 본문 제외)"""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "database_id": job.database_id,
+        "session_id": job.llm_log_id,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "expires_at": job.expires_at,
+    }
@@ -1,7 +1,101 @@
-from ddp.models import Column, Database, Table
+import logging
+
+from asgiref.sync import sync_to_async
+from ddp.models import Database, Table
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from llm.agents.table_selector import select_relevant_tables
-from llm.tools.metadata_formatter import format_metadata_for_prompt
+from llm.agents.table_selector import aselect_relevant_tables, select_relevant_tables
+from llm.services.prompt_cache import get_catalog_prompt
+from llm.tools.metadata_formatter import format_join_hints, format_tables_within_budget
+from llm.tools.table_index import decisive_tables
+from llm.tools.token_counter import count_tokens
+
+DEFAULT_RETRIEVAL_CONFIG = {
+    "ENABLED": True,
+    "TOP_K": 30,
+    "DECISIVE_MAX_TABLES": 3,
+    "DECISIVE_RATIO": 3.0,
+}
+
+
+DEFAULT_SELECTOR_BYPASS_CONFIG = {
+    "ENABLED": True,
+    "MAX_CATALOG_TOKENS": 3000,
+}
+
+DEFAULT_JOIN_EXPANSION_CONFIG = {
+    "ENABLED": True,
+    "MAX_HOPS": 3,
+}
+
+DEFAULT_PROMPT_BUDGET_CONFIG = {
+    "META_TOKENS": 6000,
+    "MAX_DESCRIPTION_CHARS": 200,
+    "ENCODING": "o200k_base",
+}
+
+
+def get_retrieval_config() -> dict:
+    """settings.DDP_TABLE_RETRIEVAL 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_RETRIEVAL_CONFIG, **getattr(settings, "DDP_TABLE_RETRIEVAL", {})}
+
+
+def get_selector_bypass_config() -> dict:
+    """settings.DDP_SELECTOR_BYPASS 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_SELECTOR_BYPASS_CONFIG, **getattr(settings, "DDP_SELECTOR_BYPASS", {})}
+
+
+def get_join_expansion_config() -> dict:
+    """settings.DDP_JOIN_EXPANSION 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_JOIN_EXPANSION_CONFIG, **getattr(settings, "DDP_JOIN_EXPANSION", {})}
+
+
+def get_prompt_budget_config() -> dict:
+    """settings.DDP_PROMPT_BUDGET 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_PROMPT_BUDGET_CONFIG, **getattr(settings, "DDP_PROMPT_BUDGET", {})}
+
+
+def expand_join_paths(catalog, table_ids: list) -> list[int]:
+    """선택된 테이블 사이의 최단 FK 조인 경로에 있는 브리지 테이블을 추가합니다. (DDP_JOIN_EXPANSION)"""
+    config = get_join_expansion_config()
+    if not config["ENABLED"]:
+        return table_ids
+    expanded = catalog.join_graph.expand(table_ids, config["MAX_HOPS"])
+    bridges = sorted(set(expanded) - {int(table_id) for table_id in table_ids})
+    if bridges:
+        logging.info(f"[JoinExpansion] 브리지 테이블 추가: {bridges}")
+    return expanded
+
+
+def render_within_budget(catalog, table_ids: list, question: str) -> tuple[str, int]:
+    """
+    선택된 테이블의 meta_info와 FK 조인 힌트를 토큰 예산(DDP_PROMPT_BUDGET) 안에서 생성합니다.
+
+    캐시된 블록이 예산 안이면 그대로 사용하고, 넘으면 설명을 자르고 질문과 관련 없는 컬럼을 생략합니다.
+
+    Returns:
+        tuple: (meta_info 문자열, 토큰 수)
+    """
+    config = get_prompt_budget_config()
+    table_ids = catalog.selected_ids(table_ids)
+    join_hints = format_join_hints(catalog.join_graph.hints(table_ids))
+
+    meta_info = "\n\n".join(filter(None, [catalog.render(table_ids), join_hints]))
+    tokens = count_tokens(meta_info, config["ENCODING"])
+    if tokens > config["META_TOKENS"]:
+        hint_tokens = count_tokens(join_hints, config["ENCODING"]) + 2 if join_hints else 0
+        tables_info, _ = format_tables_within_budget(
+            [(catalog.tables[table_id], catalog.columns[table_id]) for table_id in table_ids],
+            question,
+            config["META_TOKENS"] - hint_tokens,
+            config["MAX_DESCRIPTION_CHARS"],
+            config["ENCODING"],
+        )
+        meta_info = "\n\n".join(filter(None, [tables_info, join_hints]))
+        pruned_tokens = count_tokens(meta_info, config["ENCODING"])
+        logging.info(f"[PromptBudget] meta_info {tokens} → {pruned_tokens} tokens")
+        tokens = pruned_tokens
+    return meta_info, tokens
 
 
 def get_formatted_metadata(database_id: int) -> str:
@@ -15,40 +109,12 @@ def get_formatted_metadata(database_id: int) -> str:
     Returns:
         str: LLM-friendly formatted meta_info string
     """
-    try:
-        database = Database.objects.get(pk=database_id)
-    except ObjectDoesNotExist:
-        raise ValueError(f"Database(id={database_id}) not found.")
-
-    # 연결된 테이블 ID 추출
-    tables = Table.objects.filter(database=database)
-    if not tables.exists():
+    catalog = get_catalog_prompt(database_id)
+    if not catalog.table_list:
         raise ValueError("No tables found for the given database.")
 
-    table_ids = list(tables.values_list("id", flat=True))
-
-    # 컬럼 추출
-    columns = Column.objects.filter(table_id__in=table_ids).select_related("table")
-
-    # LLM 포맷용 리스트 구성
-    column_metadata = []
-    for col in columns:
-        column_metadata.append(
-            {
-                "table": col.table,
-                "name": col.name,
-                "data_type": col.data_type,
-                "description": col.description,
-                "is_primary_key": col.is_primary_key,
-                "is_foreign_key": col.is_foreign_key,
-                "foreign_key_table": col.foreign_key_table,
-                "foreign_key_column": col.foreign_key_column,
-            }
-        )
-
-    # 포맷팅
-    meta_info = format_metadata_for_prompt(column_metadata)
-    return meta_info
+    # 테이블별로 미리 포맷된 블록을 이어 붙임
+    return catalog.render()
 
 
 def get_table_list(database_id: int) -> list[dict]:
@@ -79,52 +145,113 @@ def get_table_list(database_id: int) -> list[dict]:
     return list(tables)
 
 
-def get_filtered_metadata_by_llm(database_id: int, question: str) -> str:
+def small_catalog_prompt(catalog) -> tuple[str, int]:
+    """
+    전체 카탈로그의 meta_info가 DDP_SELECTOR_BYPASS 임계값(과 DDP_PROMPT_BUDGET 예산) 이하이면 반환합니다.
+
+    전체 meta_info와 토큰 수는 카탈로그 버전별로 캐시되므로 작은 데이터베이스의 질문은
+    테이블 선택기 호출과 토큰 계산 없이 SQL 생성기로 전달됩니다.
+
+    Args:
+        catalog (CatalogPrompt): 카탈로그 프롬프트 캐시 항목
+
+    Returns:
+        tuple: (전체 meta_info 문자열, 토큰 수). 임계값을 넘거나 비활성화되어 있으면 None
+    """
+    config = get_selector_bypass_config()
+    if not config["ENABLED"]:
+        return None
+    budget = get_prompt_budget_config()
+    meta_info, tokens = catalog.full_prompt(budget["ENCODING"])
+    if tokens > min(config["MAX_CATALOG_TOKENS"], budget["META_TOKENS"]):
+        return None
+    logging.info(f"[SelectorBypass] 전체 카탈로그 사용 ({tokens} tokens)")
+    return meta_info, tokens
+
+
+def shortlist_tables(catalog, question: str) -> tuple[list[int], list[str]]:
+    """
+    테이블 수가 TOP_K보다 많으면 로컬 BM25 색인으로 선택기에 전달할 후보를 줄입니다.
+
+    Args:
+        catalog (CatalogPrompt): 카탈로그 프롬프트 캐시 항목
+        question (str): 사용자 질문
+
+    Returns:
+        tuple: (점수 차이가 뚜렷해 선택기 없이 사용할 테이블 ID 목록 또는 빈 리스트, 선택기에 전달할 테이블 목록)
+    """
+    config = get_retrieval_config()
+    if not config["ENABLED"] or len(catalog.index) <= config["TOP_K"]:
+        return [], catalog.table_list
+
+    hits = catalog.index.search(question, config["TOP_K"])
+    decisive = decisive_tables(hits, config["DECISIVE_MAX_TABLES"], config["DECISIVE_RATIO"])
+    if decisive:
+        logging.info(f"[TableRetrieval] 선택기 생략: {decisive}")
+    return decisive, [catalog.table_lines[table_id] for table_id, _ in hits]
+
+
+def get_filtered_metadata_by_llm(database_id: int, question: str) -> tuple[str, int]:
     """
     질문에 기반하여 LLM이 추출한 테이블만 메타 정보로 포맷합니다.
 
+    전체 카탈로그의 meta_info가 DDP_SELECTOR_BYPASS 임계값 이하이면 선택기 없이 전체를 사용합니다.
+    테이블 수가 TOP_K보다 많으면 로컬 BM25 색인의 상위 TOP_K개만 선택기에 전달하므로
+    선택기 프롬프트 크기는 카탈로그 크기와 관계없이 일정합니다.
+    반환되는 meta_info는 DDP_PROMPT_BUDGET의 토큰 예산을 따릅니다.
+
     Args:
         database_id (int): 대상 Database ID
         question (str): 사용자 질문
 
     Returns:
-        str: LLM-friendly formatted meta_info string
+        tuple: (LLM-friendly formatted meta_info string, meta_info 토큰 수)
     """
-    try:
-        database = Database.objects.get(pk=database_id)
-    except ObjectDoesNotExist:
-        raise ValueError(f"Database(id={database_id}) not found.")
-
-    all_tables = Table.objects.filter(database=database)
-    if not all_tables.exists():
+    catalog = get_catalog_prompt(database_id)
+    if not catalog.table_list:
         raise ValueError("No tables found for the given database.")
 
-    table_list = []
-    for table in all_tables:
-        table_list.append(f"[{table.id}] {table.name}: ({table.description})")
+    # 전체 카탈로그가 작으면 선택기 없이 전체 메타 정보 사용
+    small = small_catalog_prompt(catalog)
+    if small:
+        return small
+
+    # 색인 검색으로 후보를 줄이고, 점수 차이가 뚜렷하면 선택기 호출 생략
+    decisive, table_list = shortlist_tables(catalog, question)
+    if decisive:
+        return render_within_budget(catalog, expand_join_paths(catalog, decisive), question)
 
     # 질의와 관련된 테이블 추출
     relevant_table_ids = select_relevant_tables(question, table_list)
     if not relevant_table_ids:
         raise ValueError("No relevant tables found by LLM.")
 
-    # 테이블 객체 + 컬럼 추출
-    relevant_tables = Table.objects.filter(database=database, id__in=relevant_table_ids)
-    columns = Column.objects.filter(table__in=relevant_tables).select_related("table")
+    # 선택되지 않은 브리지 테이블을 추가해 조인 경로를 보완
+    return render_within_budget(catalog, expand_join_paths(catalog, relevant_table_ids), question)
 
-    column_metadata = []
-    for col in columns:
-        column_metadata.append(
-            {
-                "table": col.table,
-                "name": col.name,
-                "data_type": col.data_type,
-                "description": col.description,
-                "is_primary_key": col.is_primary_key,
-                "is_foreign_key": col.is_foreign_key,
-                "foreign_key_table": col.foreign_key_table,
-                "foreign_key_column": col.foreign_key_column,
-            }
-        )
 
-    return format_metadata_for_prompt(column_metadata)
+async def aget_filtered_metadata_by_llm(database_id: int, question: str) -> tuple[str, int]:
+    """
+    get_filtered_metadata_by_llm의 비동기 버전입니다.
+
+    카탈로그 조회는 sync_to_async로, 테이블 선택기 호출은 ainvoke로 기다립니다.
+
+    Returns:
+        tuple: (LLM-friendly formatted meta_info string, meta_info 토큰 수)
+    """
+    catalog = await sync_to_async(get_catalog_prompt)(database_id)
+    if not catalog.table_list:
+        raise ValueError("No tables found for the given database.")
+
+    small = small_catalog_prompt(catalog)
+    if small:
+        return small
+
+    decisive, table_list = shortlist_tables(catalog, question)
+    if decisive:
+        return render_within_budget(catalog, expand_join_paths(catalog, decisive), question)
+
+    relevant_table_ids = await aselect_relevant_tables(question, table_list)
+    if not relevant_table_ids:
+        raise ValueError("No relevant tables found by LLM.")
+    return render_within_budget(catalog, expand_join_paths(catalog, relevant_table_ids), question)
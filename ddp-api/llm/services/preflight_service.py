@@ -0,0 +1,96 @@
+import logging
+
+from django.conf import settings
+from llm.tools.query_plan import summarize_plan
+
+DEFAULT_PREFLIGHT_CONFIG = {
+    "ENABLED": True,
+    "MAX_ROWS_EXAMINED": 10_000_000,
+    "FULL_SCAN_ROWS": 1_000_000,
+    "MAX_QUERY_COST": 0,
+    "ACTION": "confirm",
+}
+
+
+def get_preflight_config() -> dict:
+    """settings.DDP_QUERY_PREFLIGHT 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_PREFLIGHT_CONFIG, **getattr(settings, "DDP_QUERY_PREFLIGHT", {})}
+
+
+class PreflightRejected(RuntimeError):
+    """EXPLAIN 예상 비용이 임계값을 넘어 쿼리 실행을 막은 경우 발생합니다."""
+
+    def __init__(self, message: str, status: str, estimate: dict):
+        super().__init__(message)
+        self.status = status  # "REJECTED" 또는 "CONFIRMATION_REQUIRED"
+        self.estimate = estimate
+
+
+def explain_query(connector, query: str) -> dict:
+    """
+    EXPLAIN FORMAT=JSON으로 쿼리를 실행하지 않고 예상 비용을 조회합니다.
+
+    Args:
+        connector (MySQLConnector): 대상 DB 커넥터
+        query (str): 실행할 SQL
+
+    Returns:
+        dict: summarize_plan 결과
+    """
+    connector.cursor.execute(f"EXPLAIN FORMAT=JSON {query.strip().rstrip(';')}")
+    row = connector.cursor.fetchone()
+    plan = next(iter(row.values())) if isinstance(row, dict) else row[0]
+    return summarize_plan(plan, full_scan_rows=get_preflight_config()["FULL_SCAN_ROWS"])
+
+
+def evaluate_estimate(estimate: dict) -> list[str]:
+    """
+    예상 비용이 DDP_QUERY_PREFLIGHT 임계값을 넘는지 확인합니다.
+
+    Args:
+        estimate (dict): explain_query 결과
+
+    Returns:
+        list: 초과한 항목별 사유 (비어 있으면 통과)
+    """
+    config = get_preflight_config()
+    reasons = []
+    if config["MAX_ROWS_EXAMINED"] and estimate["rows_examined"] > config["MAX_ROWS_EXAMINED"]:
+        reasons.append(f"estimated rows examined {estimate['rows_examined']} > {config['MAX_ROWS_EXAMINED']}")
+    if config["MAX_QUERY_COST"] and (estimate["query_cost"] or 0) > config["MAX_QUERY_COST"]:
+        reasons.append(f"estimated query cost {estimate['query_cost']} > {config['MAX_QUERY_COST']}")
+    for scan in estimate["full_scans"]:
+        reasons.append(f"full scan on {scan['table']} ({scan['rows_per_scan']} rows)")
+    return reasons
+
+
+def run_preflight(connector, query: str, confirmed: bool = False) -> dict:
+    """
+    쿼리 실행 전에 예상 비용을 확인하고, 임계값을 넘으면 실행을 막습니다.
+
+    ACTION이 "confirm"이면 confirmed=True로 다시 요청한 경우 실행을 허용하고,
+    "reject"이면 항상 거부합니다.
+
+    Args:
+        connector (MySQLConnector): 대상 DB 커넥터
+        query (str): 실행할 SQL
+        confirmed (bool): 사용자가 비용을 확인하고 실행을 승인했는지 여부
+
+    Returns:
+        dict: explain_query 결과 (reasons 포함)
+
+    Raises:
+        PreflightRejected: 임계값을 넘어 실행할 수 없는 경우
+    """
+    estimate = explain_query(connector, query)
+    estimate["reasons"] = evaluate_estimate(estimate)
+    if not estimate["reasons"]:
+        return estimate
+
+    message = "Query exceeds the pre-flight cost limits: " + "; ".join(estimate["reasons"])
+    if get_preflight_config()["ACTION"] == "reject":
+        raise PreflightRejected(message, "REJECTED", estimate)
+    if not confirmed:
+        raise PreflightRejected(message, "CONFIRMATION_REQUIRED", estimate)
+    logging.info(f"예상 비용 초과 쿼리 실행 승인: {message}")
+    return estimate
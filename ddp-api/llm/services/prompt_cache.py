@@ -0,0 +1,202 @@
+import threading
+from collections import OrderedDict
+
+from ddp.models import Column, Database, Table
+from django.conf import settings
+from django.db import transaction
+from llm.tools.join_graph import JoinGraph
+from llm.tools.metadata_formatter import format_join_hints, format_table_for_prompt
+from llm.tools.table_index import TableIndex, table_document
+from llm.tools.token_counter import count_tokens
+
+DEFAULT_PROMPT_CACHE_CONFIG = {
+    "ENABLED": True,
+    "MAX_DATABASES": 32,
+}
+
+# format_metadata_for_prompt에 전달하던 컬럼 필드
+PROMPT_COLUMN_FIELDS = [
+    "name",
+    "data_type",
+    "description",
+    "is_primary_key",
+    "is_foreign_key",
+    "foreign_key_table",
+    "foreign_key_column",
+]
+
+
+def get_prompt_cache_config() -> dict:
+    """settings.DDP_PROMPT_CACHE 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_PROMPT_CACHE_CONFIG, **getattr(settings, "DDP_PROMPT_CACHE", {})}
+
+
+class CatalogPrompt:
+    """한 카탈로그 버전의 테이블별 프롬프트 블록, 테이블 선택용 목록, 검색 색인, FK 조인 그래프입니다."""
+
+    def __init__(self, version: int, tables: dict, columns: dict, fragments: dict, table_lines: dict, documents: dict):
+        self.version = version
+        self.tables = tables  # {table_id: Table}
+        self.columns = columns  # {table_id: [column dict, ...]}
+        self.fragments = fragments  # {table_id: "Table: ...\nDescription: ...\n- col ..."}
+        self.table_lines = table_lines  # {table_id: "[1] users: (회원)"}
+        self.documents = documents  # {table_id: (문서 원본 key, Counter)} - 다음 버전 색인 생성 시 재사용
+        self.index = TableIndex({table_id: document for table_id, (_, document) in documents.items()})
+        self.join_graph = JoinGraph(tables, columns)
+        self._full_prompts = {}  # {encoding: (전체 meta_info, 토큰 수)}
+
+    @property
+    def table_list(self) -> list[str]:
+        return list(self.table_lines.values())
+
+    def render(self, table_ids: list = None) -> str:
+        """
+        선택된 테이블의 블록을 테이블 ID 순서로 이어 붙여 meta_info를 생성합니다.
+
+        Args:
+            table_ids (list, optional): 포함할 테이블 ID. 없으면 전체
+
+        Returns:
+            str: format_metadata_for_prompt와 같은 형식의 메타 정보 문자열
+        """
+        return "\n\n".join(self.fragments[table_id] for table_id in self.selected_ids(table_ids))
+
+    def full_prompt(self, encoding: str) -> tuple[str, int]:
+        """
+        전체 테이블의 meta_info(FK 조인 힌트 포함)와 토큰 수를 반환합니다.
+
+        카탈로그 버전별 항목에 인코딩마다 한 번만 계산합니다.
+
+        Args:
+            encoding (str): tiktoken 인코딩 이름
+
+        Returns:
+            tuple: (meta_info 문자열, 토큰 수)
+        """
+        cached = self._full_prompts.get(encoding)
+        if cached is None:
+            table_ids = self.selected_ids()
+            join_hints = format_join_hints(self.join_graph.hints(table_ids))
+            meta_info = "\n\n".join(filter(None, [self.render(table_ids), join_hints]))
+            cached = self._full_prompts[encoding] = (meta_info, count_tokens(meta_info, encoding))
+        return cached
+
+    def selected_ids(self, table_ids: list = None) -> list[int]:
+        """블록이 있는 테이블 중 선택된 테이블 ID를 ID 순서로 반환합니다. table_ids가 없으면 전체"""
+        if table_ids is None:
+            return list(self.fragments.keys())
+        return sorted({int(table_id) for table_id in table_ids} & self.fragments.keys())
+
+
+def build_catalog_prompt(database_id: int, previous: CatalogPrompt = None):
+    """
+    Database의 모든 테이블 블록, 검색 색인, FK 조인 그래프를 테이블/컬럼 쿼리 2번으로 생성합니다.
+
+    이전 버전 항목이 있으면 내용이 바뀌지 않은 테이블의 검색 문서(토큰 빈도)를 재사용합니다.
+
+    Args:
+        database_id (int): Database 모델의 ID
+        previous (CatalogPrompt, optional): 같은 Database의 이전 버전 항목
+
+    Returns:
+        CatalogPrompt: 생성된 프롬프트 캐시 항목. 데이터베이스가 없으면 None
+    """
+    with transaction.atomic():
+        version = Database.objects.filter(pk=database_id).values_list("metadata_version", flat=True).first()
+        if version is None:
+            return None
+        tables = list(Table.objects.filter(database_id=database_id).order_by("id"))
+        columns = {}
+        for column in (
+            Column.objects.filter(table__database_id=database_id)
+            .order_by("table_id", "id")
+            .values("table_id", *PROMPT_COLUMN_FIELDS)
+        ):
+            columns.setdefault(column["table_id"], []).append(column)
+
+    fragments, table_lines, documents = {}, {}, {}
+    for table in tables:
+        table_columns = columns.get(table.id, [])
+        table_lines[table.id] = f"[{table.id}] {table.name}: ({table.description})"
+        # 컬럼이 없는 테이블은 기존 format_metadata_for_prompt와 같이 블록을 만들지 않음
+        if table_columns:
+            fragments[table.id] = format_table_for_prompt(table, table_columns)
+
+        key = (table_lines[table.id], fragments.get(table.id))
+        reused = previous.documents.get(table.id) if previous else None
+        documents[table.id] = reused if reused and reused[0] == key else (key, table_document(table, table_columns))
+    return CatalogPrompt(version, {table.id: table for table in tables}, columns, fragments, table_lines, documents)
+
+
+class PromptFragmentCache:
+    """
+    Database별 CatalogPrompt의 프로세스 단위 LRU 캐시입니다.
+
+    항목은 Database.metadata_version과 함께 저장되며, Table/Column 변경으로 버전이 올라가면
+    다음 조회 시 다시 생성됩니다.
+    """
+
+    def __init__(self, max_databases=32):
+        self.max_databases = max_databases
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, database_id: int) -> CatalogPrompt:
+        """
+        현재 카탈로그 버전의 CatalogPrompt를 반환합니다. 캐시 적중 시 버전 조회 쿼리 1번만 실행합니다.
+
+        Args:
+            database_id (int): Database 모델의 ID
+
+        Returns:
+            CatalogPrompt: 프롬프트 캐시 항목
+
+        Raises:
+            ValueError: Database가 없는 경우
+        """
+        version = Database.objects.filter(pk=database_id).values_list("metadata_version", flat=True).first()
+        if version is None:
+            raise ValueError(f"Database(id={database_id}) not found.")
+
+        with self._lock:
+            entry = self._entries.get(database_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(database_id)
+                self._stats["hits"] += 1
+                return entry
+            self._stats["misses"] += 1
+
+        entry = build_catalog_prompt(database_id, previous=entry)
+        if entry is None:
+            raise ValueError(f"Database(id={database_id}) not found.")
+        with self._lock:
+            current = self._entries.get(database_id)
+            # 동시에 생성된 항목 중 더 새로운 버전만 유지
+            if current is None or current.version <= entry.version:
+                self._entries[database_id] = entry
+                self._entries.move_to_end(database_id)
+            while len(self._entries) > self.max_databases:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"databases": len(self._entries), **self._stats}
+
+
+prompt_cache = PromptFragmentCache(max_databases=get_prompt_cache_config()["MAX_DATABASES"])
+
+
+def get_catalog_prompt(database_id: int) -> CatalogPrompt:
+    """설정에 따라 캐시된 CatalogPrompt 또는 새로 생성한 CatalogPrompt를 반환합니다."""
+    if get_prompt_cache_config()["ENABLED"]:
+        return prompt_cache.get(database_id)
+    entry = build_catalog_prompt(database_id)
+    if entry is None:
+        raise ValueError(f"Database(id={database_id}) not found.")
+    return entry
@@ -2,83 +2,469 @@
 
 import json
 import logging
+import time
 
-from ddp.utils.mysql_connector import MySQLConnector
-from llm.agents.result_summarizer import summarize_query_result
+import MySQLdb
+from asgiref.sync import sync_to_async
+from ddp.utils.mysql_connector import (
+    MySQLConnector,
+    QueryTimeoutError,
+    is_timeout_error,
+)
+from django.conf import settings
+from llm.agents.result_summarizer import asummarize_query_result, summarize_query_result
 from llm.models import LLMLog, QueryExecutionLog
+from llm.services.preflight_service import (
+    PreflightRejected,
+    evaluate_estimate,
+    explain_query,
+    get_preflight_config,
+    run_preflight,
+)
+from llm.services.result_cache import (
+    CacheEntry,
+    get_fresh_entry,
+    is_cacheable,
+    make_cache_key,
+    result_cache,
+    snapshot_tables,
+)
+from llm.services.sql_cache import remember_sql
+from llm.tools.result_formatter import RESULT_FORMATTERS, to_compact_result
+from MySQLdb.cursors import Cursor, SSCursor, SSDictCursor
 
+DEFAULT_EXECUTION_CONFIG = {
+    "FETCH_SIZE": 1000,
+    "MAX_ROWS": 10000,
+    "MAX_BYTES": 16 * 1024 * 1024,
+}
 
-def execute_query(database, summarize: bool = False, session_id=None) -> dict:
+
+def get_execution_config() -> dict:
+    """settings.DDP_QUERY_EXECUTION 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_EXECUTION_CONFIG, **getattr(settings, "DDP_QUERY_EXECUTION", {})}
+
+
+DEFAULT_EXECUTION_PROFILE = {
+    "MAX_EXECUTION_TIME": 30000,
+    "LOCK_WAIT_TIMEOUT": None,
+    "ISOLATION_LEVEL": "REPEATABLE READ",
+    "READ_ONLY": True,
+    "CONSISTENT_SNAPSHOT": True,
+}
+
+
+def get_execution_profile(database) -> dict:
     """
-    SQL 쿼리를 실행하고, 요약까지 포함한 결과 반환
+    Database.execution_profile에 해당하는 settings.DDP_EXECUTION_PROFILES 값을 기본값과 병합하여 반환합니다.
+
+    등록되지 않은 프로파일이면 "default" 프로파일을 사용합니다.
+    """
+    profiles = getattr(settings, "DDP_EXECUTION_PROFILES", {})
+    name = getattr(database, "execution_profile", None) or "default"
+    if name not in profiles:
+        logging.warning(f"등록되지 않은 실행 프로파일입니다. default를 사용합니다: {name}")
+        name = "default"
+    return {**DEFAULT_EXECUTION_PROFILE, **profiles.get(name, {})}
+
+
+def estimate_row_bytes(row) -> int:
+    """행 하나의 대략적인 직렬화 크기(byte)를 추정합니다."""
+    values = row.values() if isinstance(row, dict) else row
+    size = sum(len(str(value)) for value in values)
+    if isinstance(row, dict):
+        size += sum(len(key) for key in row)
+    return size
+
+
+def fetch_bounded(cursor, max_rows: int, max_bytes: int, fetch_size: int) -> tuple[list, int, bool]:
+    """
+    서버 사이드 커서에서 fetchmany로 chunk 단위로 읽되, 행 수와 byte 상한을 넘지 않도록 읽습니다.
+
+    상한에 도달했는지 판단하기 위해 상한보다 한 행을 더 읽어 봅니다.
+
+    Args:
+        cursor: 실행된 (unbuffered) 커서
+        max_rows (int): 반환할 최대 행 수
+        max_bytes (int): 반환할 결과의 최대 추정 크기(byte)
+        fetch_size (int): fetchmany 한 번에 읽을 행 수
+
+    Returns:
+        tuple: (rows, scanned_rows, truncated)
+    """
+    rows = []
+    scanned_rows = 0
+    total_bytes = 0
+    while True:
+        chunk = cursor.fetchmany(min(fetch_size, max_rows - len(rows) + 1))
+        if not chunk:
+            return rows, scanned_rows, False
+        scanned_rows += len(chunk)
+        for row in chunk:
+            total_bytes += estimate_row_bytes(row)
+            if len(rows) >= max_rows or total_bytes > max_bytes:
+                return rows, scanned_rows, True
+            rows.append(row)
+
+
+def get_session_query(session_id) -> tuple[str, str]:
+    """
+    LLM 실행 세션(LLMLog)에 저장된 SQL과 질문을 반환합니다.
+
+    Args:
+        session_id (str): LLM 로그 ID
+
+    Returns:
+        tuple: (query, question)
+
+    Raises:
+        ValueError: 세션이 없거나 SQL/질문이 비어 있는 경우
+    """
+    try:
+        session = LLMLog.objects.get(id=session_id)
+    except LLMLog.DoesNotExist:
+        raise ValueError(f"LLMLog(id={session_id}) not found.")
+
+    query = json.loads(session.response_content).get("query", "")
+    if not query:
+        raise ValueError("No query provided")
+    if not session.question:
+        raise ValueError("No question provided")
+    return query, session.question
+
+
+def iter_query_export(
+    database, query: str, session_id=None, fmt: str = "ndjson", preflight: bool = None, confirmed: bool = False
+):
+    """
+    서버 사이드 커서로 쿼리를 실행하며 결과를 NDJSON/CSV/Arrow/Parquet 조각으로 순차 생성합니다.
+
+    헤더(컬럼 메타 정보)를 가장 먼저, 이후 FETCH_SIZE 단위로 행을, 마지막으로
+    row_count/elapsed_ms를 담은 trailer를 생성합니다. 메모리에는 한 chunk만 유지됩니다.
+    클라이언트가 연결을 끊어 제너레이터가 중간에 닫히면 커넥션은 폐기됩니다.
+
+    Args:
+        database: Database 객체
+        query (str): 실행할 SQL
+        session_id (str, optional): LLM 로그 ID
+        fmt (str): RESULT_FORMATTERS의 키 ("ndjson", "csv", "arrow", "parquet")
+        preflight (bool, optional): EXPLAIN 비용 사전 확인 여부 (기본값: DDP_QUERY_PREFLIGHT.ENABLED)
+        confirmed (bool): 예상 비용 초과를 확인하고 실행을 승인했는지 여부
+
+    Yields:
+        str | bytes: 직렬화된 응답 조각
+
+    Raises:
+        PreflightRejected: 예상 비용 임계값을 넘은 경우 (첫 조각을 생성하기 전에 발생)
+    """
+    formatter = RESULT_FORMATTERS[fmt]()
+    fetch_size = get_execution_config()["FETCH_SIZE"]
+    row_count = 0
+    started, completed = False, False
+    log_status, error = "SUCCESS", None
+    start = time.perf_counter()
+
+    with MySQLConnector(database, read_only=True) as connector:
+        try:
+            connector.apply_profile(get_execution_profile(database))
+            if get_preflight_config()["ENABLED"] if preflight is None else preflight:
+                run_preflight(connector, query, confirmed=confirmed)
+            started = True
+            cursor = connector.execute_stream(query, cursorclass=SSCursor)
+            yield formatter.header(MySQLConnector.describe_columns(cursor.description))
+
+            while chunk := cursor.fetchmany(fetch_size):
+                row_count += len(chunk)
+                yield formatter.rows(chunk)
+
+            completed = True
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 4)
+            yield formatter.trailer(row_count=row_count, elapsed_ms=elapsed_ms)
+        except MySQLdb.Error as e:
+            logging.error(f"Error streaming query: {str(e)}")
+            log_status, error = ("TIMEOUT" if is_timeout_error(e) else "ERROR"), str(e)
+            yield formatter.error(str(e))
+        except PreflightRejected as e:
+            logging.error(f"Error streaming query ({e.status}): {str(e)}")
+            log_status, error = e.status, str(e)
+            raise
+        except Exception as e:  # 직렬화 실패 (pyarrow 타입 변환 오류 등)
+            logging.error(f"Error serializing query result: {str(e)}")
+            log_status, error = "ERROR", str(e)
+            yield formatter.error(str(e))
+        finally:
+            truncated = started and not completed  # 사전 확인 거부 등 실행 전 실패는 잘린 결과가 아님
+            connector.discard = truncated  # 읽다 만 서버 사이드 커서가 남은 커넥션은 폐기
+            QueryExecutionLog.objects.create(
+                database=database,
+                query=query,
+                row_count=row_count,
+                scanned_rows=row_count,
+                truncated=truncated,
+                elapsed_ms=round((time.perf_counter() - start) * 1000, 4),
+                status=log_status,
+                error=error,
+                llm_log_id=session_id,
+            )
+
+
+def estimate_session_query(database, session_id) -> dict:
+    """
+    세션에 저장된 SQL을 실행하지 않고 EXPLAIN 예상 비용만 조회합니다. (dry-run)
 
     Args:
         database: Database 객체
+        session_id (str): 쿼리를 생성한 LLM 로그 ID
+
+    Returns:
+        dict: {"query", "query_cost", "rows_examined", "full_scans", "tables", "reasons", "action"}
+            action은 실제 실행 시 처리 방식입니다. ("execute", "confirm", "reject")
+    """
+    query, _ = get_session_query(session_id)
+    with MySQLConnector(database, read_only=True) as connector:
+        connector.apply_profile(get_execution_profile(database))
+        estimate = explain_query(connector, query)
+    estimate["reasons"] = evaluate_estimate(estimate)
+    action = get_preflight_config()["ACTION"] if estimate["reasons"] else "execute"
+    return {"query": query, **estimate, "action": action}
+
+
+def run_query(connector, query: str, mode: str = "buffered", shape: str = "rows") -> dict:
+    """
+    대여한 커넥터에서 SQL을 실행하고 결과를 읽습니다.
+
+    Args:
+        connector (MySQLConnector): 대상 DB 커넥터
         query (str): 실행할 SQL
-        question (str): 질문 (요약할 때 사용)
+        mode (str): "buffered" 또는 "stream" (execute_query 참고)
+        shape (str): "rows", "columnar", "tuples" (execute_query 참고)
+
+    Returns:
+        dict: {"columns": [컬럼명], "rows": [...], "payload": 응답용 결과, "scanned_rows": int, "truncated": bool}
+
+    Raises:
+        QueryTimeoutError: 실행 프로파일의 시간 제한을 넘은 경우
+    """
+    compact = shape != "rows"
+    try:
+        if mode == "stream":
+            config = get_execution_config()
+            cursor = connector.execute_stream(query, cursorclass=SSCursor if compact else SSDictCursor)
+            rows, scanned_rows, truncated = fetch_bounded(
+                cursor, config["MAX_ROWS"], config["MAX_BYTES"], config["FETCH_SIZE"]
+            )
+            # 남은 결과를 읽지 않도록 커넥션을 폐기
+            connector.discard = truncated
+        else:
+            cursor = connector.conn.cursor(Cursor) if compact else connector.cursor
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            scanned_rows, truncated = len(rows), False
+    except MySQLdb.Error as e:
+        if is_timeout_error(e):
+            connector.discard = True
+            raise QueryTimeoutError(f"Query exceeded the execution time limit: {e}") from e
+        raise
+
+    logging.info(f"쿼리 결과: {len(rows)} rows (scanned={scanned_rows}, truncated={truncated})")
+    columns = [desc[0] for desc in cursor.description]
+    if compact:
+        payload = to_compact_result(MySQLConnector.describe_columns(cursor.description), rows, shape)
+    else:
+        payload = {"columns": columns, "rows": rows}
+    return {"columns": columns, "rows": rows, "payload": payload, "scanned_rows": scanned_rows, "truncated": truncated}
+
+
+def parse_summary(content: str) -> tuple[str, dict]:
+    """결과 요약 LLM 응답(JSON)을 (summary, chart)로 변환합니다."""
+    result = json.loads(content)
+    if isinstance(result, dict):
+        return result.get("summary", ""), result.get("chart", {})
+    return result, {}
+
+
+def summary_rows(result: dict) -> tuple[list[str], list]:
+    """execute_query 결과(rows/columnar/tuples 형태)에서 요약에 사용할 (컬럼명, 행)을 추출합니다."""
+    columns = [column["name"] if isinstance(column, dict) else column for column in result["columns"]]
+    if "values" in result:
+        return columns, [list(row) for row in zip(*result["values"])]
+    return columns, result["rows"]
+
+
+def execute_query(
+    database,
+    summarize: bool = False,
+    session_id=None,
+    mode: str = "buffered",
+    shape: str = "rows",
+    use_cache: bool = True,
+    on_connect=None,
+    preflight: bool = None,
+    confirmed: bool = False,
+    before_query=None,
+) -> dict:
+    """
+    SQL 쿼리를 실행하고, 요약까지 포함한 결과 반환
+
+    쿼리는 Database.execution_profile의 시간 제한/격리 수준으로 읽기 전용 트랜잭션에서 실행됩니다.
+    시간 제한을 넘으면 status가 "TIMEOUT"인 오류를 반환하고 QueryExecutionLog에 기록합니다.
+    실행 전에 EXPLAIN 예상 비용이 DDP_QUERY_PREFLIGHT 임계값을 넘으면 실행하지 않고
+    status가 "REJECTED" 또는 "CONFIRMATION_REQUIRED"인 오류를 반환합니다.
+
+    단일 SELECT 쿼리의 결과는 (database id, 정규화된 SQL, mode, shape) 키로 캐싱되며,
+    참조 테이블의 UPDATE_TIME이 바뀌거나 TTL이 지나면 다시 실행됩니다.
+    뷰나 information_schema에서 찾을 수 없는 테이블을 참조하면 변경을 감지할 수 없으므로 캐싱하지 않습니다.
+    실행에 성공한 SQL은 질문 캐시(DDP_SQL_CACHE)에 저장되어 같은 질문의 SQL 생성에 재사용됩니다.
+
+    Args:
+        database: Database 객체
         summarize (bool): 요약 수행 여부
-        llm_log_id (int): LLM 로그 ID (선택 사항)
+        session_id (str): 쿼리를 생성한 LLM 로그 ID
+        mode (str): 실행 방식
+            - "buffered": 전체 결과를 한 번에 가져옵니다.
+            - "stream": 서버 사이드 커서로 chunk 단위로 읽으며 DDP_QUERY_EXECUTION의
+              MAX_ROWS/MAX_BYTES 상한을 넘으면 중단합니다.
+        shape (str): 결과 형태
+            - "rows": 행마다 {컬럼명: 값} dict (기본값)
+            - "columnar": 튜플 커서로 읽어 columns(타입 태그 포함) + 컬럼별 값 배열(values)
+            - "tuples": 튜플 커서로 읽어 columns(타입 태그 포함) + 행별 값 배열(rows)
+        use_cache (bool): 결과 캐시 사용 여부
+        on_connect (callable, optional): 커넥션을 대여한 직후 커넥터를 인자로 호출할 함수
+            (비동기 작업이 KILL QUERY 대상 커넥션 ID를 기록하는 데 사용)
+        preflight (bool, optional): EXPLAIN 비용 사전 확인 여부 (기본값: DDP_QUERY_PREFLIGHT.ENABLED)
+        confirmed (bool): 예상 비용 초과를 확인하고 실행을 승인했는지 여부
+        before_query (callable, optional): 세션 설정/EXPLAIN 이후 본 쿼리 실행 직전에 커넥터를 인자로 호출할 함수
+            (비동기 작업이 그 사이에 취소되었는지 확인하는 데 사용)
 
     Returns:
         dict: {
             "columns": [...],
-            "rows": [...],
+            "rows": [...],  # shape=columnar일 때는 "values"
             "row_count": int,
+            "scanned_rows": int,
+            "truncated": bool,
+            "cache_hit": bool,
             "elapsed_ms": float,
             "summary": str,  # summarize=True일 때만
         }
     """
-    connector = MySQLConnector(database)
+    query = None
+    start = time.perf_counter()
     try:
-        import time
+        query, question = get_session_query(session_id)
 
-        session = LLMLog.objects.get(id=session_id)
-        query = json.loads(session.response_content).get("query", "")
-        if not query:
-            return {"error": "No query provided", "status": "ERROR"}
-        question = session.question
-        if not question:
-            return {"error": "No question provided", "status": "ERROR"}
-
-        logging.info(f"쿼리 실행: {query}")
         start = time.perf_counter()
-        connector.cursor.execute(query)
-        rows = connector.cursor.fetchall()
+        cache_key = make_cache_key(database.id, query, mode, shape) if use_cache and is_cacheable(query) else None
+        entry = get_fresh_entry(cache_key, database) if cache_key else None
+        if cache_key:
+            result_cache.record(hit=entry is not None)
 
-        logging.info(f"쿼리 결과: {len(rows)} rows")
-        columns = [desc[0] for desc in connector.cursor.description]
+        if entry:
+            logging.info(f"결과 캐시 적중: {query}")
+            executed = entry.result
+        else:
+            logging.info(f"쿼리 실행: {query}")
+            with MySQLConnector(database, read_only=True) as connector:
+                if on_connect:
+                    on_connect(connector)
+                connector.apply_profile(get_execution_profile(database))
+                if get_preflight_config()["ENABLED"] if preflight is None else preflight:
+                    run_preflight(connector, query, confirmed=confirmed)
+                if cache_key:
+                    tables, fingerprint = snapshot_tables(connector, query)
+                    start = time.perf_counter()
+                if before_query:
+                    before_query(connector)
+                executed = run_query(connector, query, mode=mode, shape=shape)
+            if cache_key and fingerprint is not None:
+                size = sum(estimate_row_bytes(row) for row in executed["rows"])
+                result_cache.put(cache_key, CacheEntry(executed, tables, fingerprint, size))
         elapsed_ms = round((time.perf_counter() - start) * 1000, 4)
 
+        columns, rows = executed["columns"], executed["rows"]
         result = "데이터가 없습니다."
+        summary = result if not rows else ""
+        chart = {}
         if summarize and rows:
-            result = json.loads(summarize_query_result(question, columns, rows))
-            if isinstance(result, dict):
-                summary = result.get("summary", "")
-                chart = result.get("chart", {})
-            else:
-                summary = result
-                chart = {}
+            summary, chart = parse_summary(summarize_query_result(question, columns, rows))
 
         # 로그 저장
         QueryExecutionLog.objects.create(
             database=database,
             query=query,
             row_count=len(rows),
+            scanned_rows=executed["scanned_rows"],
+            truncated=executed["truncated"],
+            cache_hit=entry is not None,
             elapsed_ms=elapsed_ms,
             llm_log_id=session_id,
         )
+        # 실행에 성공한 SQL을 질문 캐시에 저장 (실패해도 실행 결과는 반환)
+        try:
+            remember_sql(database, session_id, question, query)
+        except Exception as e:
+            logging.warning(f"SQL 생성 캐시 저장 실패: {str(e)}")
 
-        connector.close()
         # 결과 반환
         return {
-            "columns": columns,
-            "rows": rows,
+            **executed["payload"],
             "row_count": len(rows),
+            "scanned_rows": executed["scanned_rows"],
+            "truncated": executed["truncated"],
+            "cache_hit": entry is not None,
             "elapsed_ms": elapsed_ms,
             "summary": summary,
             "chart": chart,
         }
 
+    except (QueryTimeoutError, PreflightRejected, MySQLdb.Error) as e:
+        log_status = getattr(e, "status", "TIMEOUT" if isinstance(e, QueryTimeoutError) else "ERROR")
+        logging.error(f"Error executing query ({log_status}): {str(e)}")
+        QueryExecutionLog.objects.create(
+            database=database,
+            query=query or "",
+            row_count=0,
+            elapsed_ms=round((time.perf_counter() - start) * 1000, 4),
+            status=log_status,
+            error=str(e),
+            llm_log_id=session_id,
+        )
+        if isinstance(e, PreflightRejected):
+            return {"error": str(e), "status": log_status, "estimate": e.estimate}
+        return {"error": str(e), "status": log_status}
+
     except Exception as e:
         logging.error(f"Error executing query: {str(e)}")
         return {"error": str(e), "status": "ERROR"}
+
+
+async def aexecute_query(database, summarize: bool = False, session_id=None, **options) -> dict:
+    """
+    execute_query의 비동기 버전입니다.
+
+    MySQLdb 호출은 블로킹이므로 쿼리 실행은 sync_to_async(thread_sensitive=False)로 스레드 풀에서,
+    결과 요약 LLM 호출은 ainvoke로 이벤트 루프에서 기다립니다.
+
+    Args:
+        database: Database 객체
+        summarize (bool): 요약 수행 여부
+        session_id (str): 쿼리를 생성한 LLM 로그 ID
+        **options: execute_query의 mode, shape, use_cache, preflight, confirmed
+
+    Returns:
+        dict: execute_query와 같은 결과
+    """
+    result = await sync_to_async(execute_query, thread_sensitive=False)(
+        database, summarize=False, session_id=session_id, **options
+    )
+    if not summarize or "error" in result or not result["row_count"]:
+        return result
+
+    try:
+        question = await LLMLog.objects.filter(id=session_id).values_list("question", flat=True).afirst()
+        columns, rows = summary_rows(result)
+        summary, chart = parse_summary(await asummarize_query_result(question, columns, rows))
+    except Exception as e:
+        logging.error(f"Error summarizing query result: {str(e)}")
+        return {"error": str(e), "status": "ERROR"}
+    return {**result, "summary": summary, "chart": chart}
@@ -0,0 +1,238 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import MySQLdb
+from ddp.utils.mysql_connector import MySQLConnector
+from django.conf import settings
+from llm.tools.sql_parser import (
+    extract_tables,
+    is_deterministic,
+    is_read_only,
+    normalize_sql,
+)
+
+DEFAULT_RESULT_CACHE_CONFIG = {
+    "ENABLED": True,
+    "TTL": 300,
+    "MAX_ENTRIES": 256,
+    "MAX_BYTES": 64 * 1024 * 1024,
+    "REVALIDATE_AFTER": 5,
+}
+
+
+def get_result_cache_config() -> dict:
+    """settings.DDP_RESULT_CACHE 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_RESULT_CACHE_CONFIG, **getattr(settings, "DDP_RESULT_CACHE", {})}
+
+
+class CacheEntry:
+    """캐시된 실행 결과와 무효화 판단에 필요한 참조 테이블/지문 정보입니다."""
+
+    def __init__(self, result: dict, tables: list, fingerprint: tuple, size: int):
+        self.result = result
+        self.tables = tables
+        self.fingerprint = fingerprint
+        self.size = size
+        self.created_at = time.monotonic()
+        self.validated_at = self.created_at
+
+
+class QueryResultCache:
+    """
+    쿼리 실행 결과의 프로세스 단위 LRU 캐시입니다.
+
+    항목 수(max_entries)와 추정 크기 합(max_bytes)을 넘으면 가장 오래 사용되지 않은 항목부터
+    제거하며, ttl이 지난 항목은 조회 시 제거됩니다.
+    """
+
+    def __init__(self, ttl=300, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def get(self, key: str):
+        """
+        캐시 항목을 반환합니다. 없거나 ttl이 지났으면 None을 반환합니다.
+
+        반환된 항목이 원본과 같은지는 호출자가 fingerprint로 확인해야 합니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created_at > self.ttl:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self._stats["invalidations"] += 1
+
+    def record(self, hit: bool):
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, **self._stats}
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+def _build_cache() -> QueryResultCache:
+    config = get_result_cache_config()
+    return QueryResultCache(ttl=config["TTL"], max_entries=config["MAX_ENTRIES"], max_bytes=config["MAX_BYTES"])
+
+
+result_cache = _build_cache()
+
+
+def make_cache_key(database_id: int, query: str, *variants) -> str:
+    """
+    (database id, 정규화된 SQL, 결과 형태) 기반의 캐시 키를 생성합니다.
+
+    Args:
+        database_id (int): Database ID
+        query (str): 실행할 SQL
+        *variants: 결과 형태를 구분하는 값 (mode, shape 등)
+
+    Returns:
+        str: 캐시 키
+    """
+    normalized = normalize_sql(query)
+    digest = hashlib.sha256("\x00".join([normalized, *map(str, variants)]).encode("utf-8")).hexdigest()
+    return f"{database_id}:{digest}"
+
+
+def is_cacheable(query: str) -> bool:
+    """캐시 가능한(단일 SELECT, 결정적인) 쿼리인지 확인합니다."""
+    config = get_result_cache_config()
+    return config["ENABLED"] and is_read_only(query) and is_deterministic(query)
+
+
+def table_fingerprint(connector, tables: list) -> tuple | None:
+    """
+    쿼리가 참조하는 테이블들의 information_schema.tables.UPDATE_TIME을 조회해 지문을 만듭니다.
+
+    스키마가 명시되지 않은 테이블은 모든 사용자 스키마에서 같은 이름의 테이블을 대상으로 합니다.
+    참조한 테이블 중 조회되지 않는 테이블(이름을 찾지 못한 테이블, 다른 스키마를 잘못 가리킨 참조 등)이나
+    뷰가 있으면 쓰기를 감지할 수 없으므로 지문을 만들지 않습니다. (None)
+    MySQL 8은 UPDATE_TIME을 information_schema_stats_expiry(기본 1일) 동안 캐싱하므로
+    세션 값을 0으로 설정한 뒤 조회합니다. (커넥션 반납 전 DEFAULT로 복원)
+
+    Args:
+        connector (MySQLConnector): 대상 DB 커넥터
+        tables (list): extract_tables 결과
+
+    Returns:
+        tuple | None: ((schema, table, update_time, create_time), ...), 변경을 감지할 수 없으면 None
+    """
+    if not tables:
+        return ()
+
+    names = sorted({name for _, name in tables})
+    qualified = {(schema, name) for schema, name in tables if schema}
+    unqualified = {name for schema, name in tables if not schema}
+
+    try:
+        connector.cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+        connector.session_vars.append("information_schema_stats_expiry")
+    except MySQLdb.Error:
+        pass  # MySQL 5.7 이하에는 해당 변수가 없음
+
+    placeholders = ", ".join(["%s"] * len(names))
+    connector.cursor.execute(
+        f"""
+        SELECT table_schema, table_name, table_type, update_time, create_time
+        FROM information_schema.tables
+        WHERE table_name IN ({placeholders})
+            AND table_schema NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+        """,
+        names,
+    )
+    rows = connector.cursor.fetchall()
+    fingerprint = []
+    for row in rows:
+        row = {k.lower(): v for k, v in row.items()}
+        schema, name = row["table_schema"], row["table_name"]
+        if (schema, name) in qualified or name in unqualified:
+            if row.get("table_type") == "VIEW":
+                return None  # 뷰는 UPDATE_TIME이 없어 기반 테이블 변경을 감지할 수 없음
+            fingerprint.append((schema, name, str(row["update_time"]), str(row["create_time"])))
+
+    found = {(schema, name) for schema, name, _, _ in fingerprint}
+    if not qualified <= found or not unqualified <= {name for _, name in found}:
+        return None
+    return tuple(sorted(fingerprint))
+
+
+def snapshot_tables(connector, query: str) -> tuple[list, tuple]:
+    """
+    쿼리가 참조하는 테이블과 현재 지문을 반환합니다.
+
+    실행 중에 변경된 데이터를 최신 결과로 오인하지 않도록 쿼리 실행 전에 호출합니다.
+
+    Returns:
+        tuple: (tables, fingerprint), fingerprint가 None이면 결과를 캐싱하지 않습니다.
+    """
+    tables = extract_tables(query)
+    return tables, table_fingerprint(connector, tables)
+
+
+def get_fresh_entry(key: str, database) -> CacheEntry:
+    """
+    캐시 항목을 조회하고, 참조 테이블이 변경되었으면 무효화합니다.
+
+    마지막 검증 후 REVALIDATE_AFTER초가 지나지 않은 항목은 원본 DB에 접속하지 않고 반환하며,
+    그 이후에는 UPDATE_TIME 지문을 다시 비교합니다.
+
+    Args:
+        key (str): make_cache_key로 만든 키
+        database: Database 객체 (재검증이 필요할 때만 접속)
+
+    Returns:
+        CacheEntry | None: 유효한 캐시 항목
+    """
+    entry = result_cache.get(key)
+    if entry is None:
+        return None
+
+    if time.monotonic() - entry.validated_at > get_result_cache_config()["REVALIDATE_AFTER"]:
+        with MySQLConnector(database, read_only=True) as connector:
+            fingerprint = table_fingerprint(connector, entry.tables)
+        if fingerprint is None or fingerprint != entry.fingerprint:
+            logging.info(f"원본 테이블 변경으로 결과 캐시 무효화: {key}")
+            result_cache.invalidate(key)
+            return None
+        entry.validated_at = time.monotonic()
+    return entry
@@ -0,0 +1,143 @@
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from llm.models import LLMLog, SQLGenerationCache
+from llm.tools.question_normalizer import normalize_question, question_key
+
+DEFAULT_SQL_CACHE_CONFIG = {
+    "ENABLED": True,
+    "TTL": 7 * 24 * 3600,
+    "SYNONYMS": {},
+}
+
+# 캐시 적중으로 생성한 LLMLog의 agent 값과 ID 접두어
+CACHE_AGENT = "sql_cache"
+CACHE_LOG_PREFIX = "cache-"
+
+
+def get_sql_cache_config() -> dict:
+    """settings.DDP_SQL_CACHE 값을 기본값과 병합하여 반환합니다."""
+    return {**DEFAULT_SQL_CACHE_CONFIG, **getattr(settings, "DDP_SQL_CACHE", {})}
+
+
+def make_question_key(question: str) -> tuple[str, str]:
+    """설정된 동의어 사전으로 질문을 정규화하고 (정규화된 질문, 해시 키)를 반환합니다."""
+    normalized = normalize_question(question, get_sql_cache_config()["SYNONYMS"])
+    return normalized, question_key(normalized)
+
+
+def _cache_entries(database_id: int, key: str, ttl: float):
+    """현재 카탈로그 버전에서 TTL 안에 저장된 캐시 항목 QuerySet"""
+    return SQLGenerationCache.objects.filter(
+        database_id=database_id,
+        catalog_version=F("database__metadata_version"),
+        question_key=key,
+        created_at__gte=timezone.now() - timedelta(seconds=ttl),
+    ).values("id", "query", "source_log__model_name")
+
+
+def _cache_hit_log(question: str, entry: dict) -> LLMLog:
+    """캐시 적중 응답에 사용할 (저장 전) LLMLog"""
+    return LLMLog(
+        id=f"{CACHE_LOG_PREFIX}{uuid.uuid4().hex}",
+        question=question,
+        response_content=json.dumps({"query": entry["query"], "result": "SUCCESS"}, ensure_ascii=False),
+        model_name=entry["source_log__model_name"] or "",
+        prompt_tokens=0,
+        completion_tokens=0,
+        total_tokens=0,
+        agent=CACHE_AGENT,
+    )
+
+
+def get_cached_sql(database_id: int, question: str) -> dict:
+    """
+    (database id, 현재 카탈로그 버전, 정규화된 질문)으로 이전에 실행에 성공한 SQL을 찾습니다.
+
+    적중하면 같은 SQL을 응답으로 가진 LLMLog를 새 세션 ID로 저장하므로
+    execute-sql API를 LLM으로 생성한 세션과 동일하게 사용할 수 있습니다.
+
+    Args:
+        database_id (int): Database 모델의 ID
+        question (str): 사용자 질문
+
+    Returns:
+        dict: {"query", "result": "SUCCESS", "id", "cache_hit": True}. 적중하지 않으면 None
+    """
+    config = get_sql_cache_config()
+    if not config["ENABLED"]:
+        return None
+
+    normalized, key = make_question_key(question)
+    entry = _cache_entries(database_id, key, config["TTL"]).first()
+    if entry is None:
+        return None
+
+    log = _cache_hit_log(question, entry)
+    log.save(force_insert=True)
+    SQLGenerationCache.objects.filter(pk=entry["id"]).update(hit_count=F("hit_count") + 1, last_hit_at=timezone.now())
+    logging.info(f"SQL 생성 캐시 적중: {normalized}")
+    return {"query": entry["query"], "result": "SUCCESS", "id": log.id, "cache_hit": True}
+
+
+async def aget_cached_sql(database_id: int, question: str) -> dict:
+    """get_cached_sql의 비동기 버전입니다. (async ORM 사용)"""
+    config = get_sql_cache_config()
+    if not config["ENABLED"]:
+        return None
+
+    normalized, key = make_question_key(question)
+    entry = await _cache_entries(database_id, key, config["TTL"]).afirst()
+    if entry is None:
+        return None
+
+    log = _cache_hit_log(question, entry)
+    await log.asave(force_insert=True)
+    await SQLGenerationCache.objects.filter(pk=entry["id"]).aupdate(
+        hit_count=F("hit_count") + 1, last_hit_at=timezone.now()
+    )
+    logging.info(f"SQL 생성 캐시 적중: {normalized}")
+    return {"query": entry["query"], "result": "SUCCESS", "id": log.id, "cache_hit": True}
+
+
+def remember_sql(database, session_id: str, question: str, query: str):
+    """
+    실행에 성공한 세션의 SQL을 현재 카탈로그 버전의 캐시 항목으로 저장합니다.
+
+    같은 키의 항목이 TTL 안에 있으면 기존 항목을 유지하고, 만료된 항목은 새 SQL로 교체합니다.
+
+    Args:
+        database: Database 객체
+        session_id (str): 쿼리를 생성한 LLM 로그 ID
+        question (str): 사용자 질문
+        query (str): 실행에 성공한 SQL
+    """
+    config = get_sql_cache_config()
+    if not config["ENABLED"] or not question or not query:
+        return
+    normalized, key = make_question_key(question)
+    source_log_id = None if str(session_id).startswith(CACHE_LOG_PREFIX) else session_id
+    SQLGenerationCache.objects.filter(
+        database=database,
+        catalog_version=database.metadata_version,
+        question_key=key,
+        created_at__lt=timezone.now() - timedelta(seconds=config["TTL"]),
+    ).delete()
+    SQLGenerationCache.objects.bulk_create(
+        [
+            SQLGenerationCache(
+                database=database,
+                catalog_version=database.metadata_version,
+                question_key=key,
+                normalized_question=normalized,
+                query=query,
+                source_log_id=source_log_id,
+            )
+        ],
+        ignore_conflicts=True,
+    )
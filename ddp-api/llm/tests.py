@@ -1,3 +1,1050 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import httpx
+import MySQLdb
+from app.streaming import ThreadedIterator, streaming_response
+from ddp.models import Column, Database, Table
+from ddp.utils.mysql_connector import MySQLConnector
+from django.db.models import F
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from langchain.prompts import PromptTemplate
+from langchain_core.messages import AIMessageChunk
+from llm.agents.registry import LLMClientRegistry, llm_registry
+from llm.agents.result_summarizer import _summary_inputs
+from llm.models import LLMLog, QueryExecutionLog, QueryJob
+from llm.services.generation_service import iter_sql_generation_events
+from llm.services.job_service import cancel_job, get_job, purge_expired_jobs, submit_job
+from llm.services.meta_service import get_filtered_metadata_by_llm
+from llm.services.preflight_service import PreflightRejected
+from llm.services.prompt_cache import PromptFragmentCache, prompt_cache
+from llm.services.query_service import execute_query, fetch_bounded, iter_query_export
+from llm.services.result_cache import (
+    CacheEntry,
+    QueryResultCache,
+    get_fresh_entry,
+    result_cache,
+    table_fingerprint,
+)
+from llm.services.sql_cache import get_cached_sql, remember_sql
+from llm.tools.arrow_exporter import ArrowFormatter, arrow_type
+from llm.tools.join_graph import JoinGraph
+from llm.tools.metadata_formatter import (
+    format_metadata_for_prompt,
+    format_tables_within_budget,
+)
+from llm.tools.query_plan import summarize_plan
+from llm.tools.question_normalizer import normalize_question
+from llm.tools.result_formatter import to_compact_result
+from llm.tools.result_profiler import profile_result
+from llm.tools.sql_parser import (
+    extract_tables,
+    is_deterministic,
+    is_read_only,
+    normalize_sql,
+)
+from llm.tools.table_index import TableIndex, decisive_tables, table_document, tokenize
+from MySQLdb.constants import FIELD_TYPE
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return tuple(chunk)
+
+
+class FetchBoundedTest(SimpleTestCase):
+    def test_under_limit(self):
+        rows, scanned, truncated = fetch_bounded(FakeCursor({"id": i} for i in range(5)), 10, 1024, 2)
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(scanned, 5)
+        self.assertFalse(truncated)
+
+    def test_row_limit(self):
+        rows, scanned, truncated = fetch_bounded(FakeCursor({"id": i} for i in range(100)), 10, 1024, 4)
+
+        self.assertEqual(len(rows), 10)
+        self.assertTrue(truncated)
+        self.assertGreater(scanned, 10)
+
+    def test_exact_row_limit_is_not_truncated(self):
+        rows, _, truncated = fetch_bounded(FakeCursor({"id": i} for i in range(10)), 10, 1024, 4)
+
+        self.assertEqual(len(rows), 10)
+        self.assertFalse(truncated)
+
+    def test_byte_limit(self):
+        rows, _, truncated = fetch_bounded(FakeCursor({"name": "x" * 100} for _ in range(10)), 100, 350, 4)
+
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(truncated)
+
+
+class CompactResultTest(SimpleTestCase):
+    columns = [
+        {"name": "id", "type": "long"},
+        {"name": "price", "type": "newdecimal"},
+        {"name": "ordered_at", "type": "datetime"},
+        {"name": "due", "type": "date"},
+    ]
+    rows = [
+        (1, Decimal("10.50"), datetime(2025, 1, 1, 9, 30), date(2025, 1, 2)),
+        (2, None, datetime(2025, 1, 3, 0, 0), date(2025, 1, 4)),
+    ]
+
+    def test_columnar(self):
+        result = to_compact_result(self.columns, self.rows, "columnar")
+
+        self.assertEqual([c["type"] for c in result["columns"]], ["int", "decimal", "datetime", "date"])
+        self.assertEqual(result["values"][0], [1, 2])
+        self.assertEqual(result["values"][1], ["10.50", None])
+        self.assertEqual(result["values"][2][0], "2025-01-01T09:30:00")
+
+    def test_tuples(self):
+        result = to_compact_result(self.columns, self.rows, "tuples")
+
+        self.assertEqual(result["rows"][1], [2, None, "2025-01-03T00:00:00", "2025-01-04"])
+
+    def test_empty_columnar(self):
+        result = to_compact_result(self.columns, [], "columnar")
+
+        self.assertEqual(result["values"], [[], [], [], []])
+
+
+class SQLParserTest(SimpleTestCase):
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("select a ,  b\n from  x -- 주석\n where s = 'A  b' ;"),
+            "SELECT a, b FROM x WHERE s = 'A  b'",
+        )
+
+    def test_extract_tables(self):
+        sql = """
+            WITH recent AS (SELECT * FROM orders)
+            SELECT * FROM recent r
+            JOIN shop.users u ON u.user_id = r.user_id
+            WHERE r.product_id IN (SELECT product_id FROM products)
+        """
+        self.assertEqual(extract_tables(sql), [(None, "orders"), (None, "products"), ("shop", "users")])
+
+    def test_is_read_only(self):
+        self.assertTrue(is_read_only("SELECT 1"))
+        self.assertFalse(is_read_only("DELETE FROM users"))
+        self.assertFalse(is_read_only("SELECT 1; SELECT 2"))
+
+    def test_is_deterministic(self):
+        for sql in (
+            "SELECT * FROM orders WHERE ordered_at >= NOW() - INTERVAL 1 DAY",
+            "SELECT * FROM orders WHERE order_date = curdate ()",
+            "SELECT * FROM orders WHERE order_date = CURRENT_DATE",
+            "SELECT current_timestamp(), utc_date FROM dual",
+            "SELECT UNIX_TIMESTAMP(), SYSDATE(), CURTIME(), LOCALTIME, LOCALTIMESTAMP, UTC_TIME, UTC_TIMESTAMP",
+            "SELECT USER(), CURRENT_USER, RAND()",
+        ):
+            self.assertFalse(is_deterministic(sql), sql)
+        self.assertTrue(is_deterministic("SELECT o.user, `now`, 'NOW()' FROM orders o WHERE d >= '2025-01-01'"))
+
+
+class QueryResultCacheTest(SimpleTestCase):
+    def fake_connector(self, update_time):
+        connector = mock.Mock(session_vars=[])
+        connector.cursor.fetchall.return_value = [
+            {"TABLE_SCHEMA": "shop", "TABLE_NAME": "orders", "UPDATE_TIME": update_time, "CREATE_TIME": None},
+            {"TABLE_SCHEMA": "other", "TABLE_NAME": "users", "UPDATE_TIME": None, "CREATE_TIME": None},
+        ]
+        return connector
+
+    def test_table_fingerprint_restores_stats_expiry(self):
+        connector = self.fake_connector(datetime(2025, 1, 1))
+
+        fingerprint = table_fingerprint(connector, [("shop", "orders")])
+
+        self.assertEqual(fingerprint, (("shop", "orders", "2025-01-01 00:00:00", "None"),))
+        self.assertEqual(connector.session_vars, ["information_schema_stats_expiry"])
+
+    def test_table_fingerprint_requires_every_table(self):
+        connector = self.fake_connector(datetime(2025, 1, 1))
+
+        self.assertIsNotNone(table_fingerprint(connector, [("shop", "orders"), (None, "users")]))
+        self.assertIsNone(table_fingerprint(connector, [("shop", "orders"), ("shop", "users")]))  # 다른 스키마
+        self.assertIsNone(table_fingerprint(connector, [(None, "order_summary")]))  # 조회되지 않는 이름
+
+    def test_table_fingerprint_skips_views(self):
+        connector = self.fake_connector(None)
+        connector.cursor.fetchall.return_value[0]["TABLE_TYPE"] = "VIEW"
+
+        self.assertIsNone(table_fingerprint(connector, [("shop", "orders")]))
+
+    @override_settings(DDP_RESULT_CACHE={"REVALIDATE_AFTER": 0})
+    @mock.patch("llm.services.result_cache.MySQLConnector")
+    def test_fresh_entry_invalidated_after_update(self, connector_class):
+        self.addCleanup(result_cache.invalidate, "1:test")
+        connector = self.fake_connector(datetime(2025, 1, 1))
+        connector_class.return_value.__enter__.return_value = connector
+        tables = [("shop", "orders")]
+        result_cache.put("1:test", CacheEntry({"rows": []}, tables, table_fingerprint(connector, tables), 1))
+
+        self.assertIsNotNone(get_fresh_entry("1:test", database=None))
+
+        connector.cursor.fetchall.return_value[0]["UPDATE_TIME"] = datetime(2025, 1, 2)
+        self.assertIsNone(get_fresh_entry("1:test", database=None))
+        self.assertIsNone(result_cache.get("1:test"))  # 다음 실행은 원본 DB에서 다시 조회
+
+    def test_lru_eviction_by_entries(self):
+        cache = QueryResultCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(key, CacheEntry({}, [], (), 1))
+        cache.get("a")
+        cache.put("c", CacheEntry({}, [], (), 1))
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_eviction_by_bytes(self):
+        cache = QueryResultCache(max_bytes=10)
+        cache.put("a", CacheEntry({}, [], (), 6))
+        cache.put("b", CacheEntry({}, [], (), 6))
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+    def test_ttl(self):
+        cache = QueryResultCache(ttl=0)
+        cache.put("a", CacheEntry({}, [], (), 1))
+
+        self.assertIsNone(cache.get("a"))
+
+
+class QueryPlanTest(SimpleTestCase):
+    PLAN = {
+        "query_block": {
+            "select_id": 1,
+            "cost_info": {"query_cost": "25000.50"},
+            "nested_loop": [
+                {
+                    "table": {
+                        "table_name": "users",
+                        "access_type": "ALL",
+                        "rows_examined_per_scan": 2000,
+                        "rows_produced_per_join": 200,
+                    }
+                },
+                {
+                    "table": {
+                        "table_name": "orders",
+                        "access_type": "ref",
+                        "key": "idx_user_id",
+                        "rows_examined_per_scan": 5,
+                        "rows_produced_per_join": 1000,
+                    }
+                },
+            ],
+        }
+    }
+
+    def test_nested_loop_rows_examined(self):
+        estimate = summarize_plan(self.PLAN)
+
+        self.assertEqual(estimate["query_cost"], 25000.5)
+        self.assertEqual([t["rows_examined"] for t in estimate["tables"]], [2000, 1000])
+        self.assertEqual(estimate["rows_examined"], 3000)
+
+    def test_full_scan_threshold(self):
+        self.assertEqual([t["table"] for t in summarize_plan(self.PLAN, full_scan_rows=1000)["full_scans"]], ["users"])
+        self.assertEqual(summarize_plan(self.PLAN, full_scan_rows=5000)["full_scans"], [])
+        self.assertEqual(summarize_plan(self.PLAN, full_scan_rows=0)["full_scans"], [])  # 0이면 확인 안 함
+
+
+class PreflightExportTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        LLMLog.objects.create(
+            id="session-1",
+            question="전체 주문",
+            response_content='{"query": "SELECT * FROM orders;"}',
+            model_name="gpt-4o",
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+        )
+        self.url = reverse("execute-sql", args=[self.database.id, "session-1"])
+
+    @mock.patch("llm.services.query_service.run_preflight")
+    @mock.patch("llm.services.query_service.MySQLConnector")
+    def test_streaming_formats_check_preflight(self, connector_class, run_preflight):
+        run_preflight.side_effect = PreflightRejected("Query exceeds the pre-flight cost limits", "REJECTED", {})
+
+        response = self.client.post(f"{self.url}?format=ndjson")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(json.loads(response.content)["status"], "REJECTED")
+        connector_class.return_value.__enter__.return_value.execute_stream.assert_not_called()
+        log = QueryExecutionLog.objects.get()
+        self.assertEqual(log.status, "REJECTED")
+        self.assertFalse(log.truncated)  # 실행하지 않은 쿼리는 잘린 내보내기로 기록하지 않음
+
+    @mock.patch("llm.services.query_service.run_preflight")
+    @mock.patch("llm.services.query_service.MySQLConnector")
+    def test_confirmed_stream_runs_query(self, connector_class, run_preflight):
+        connector = connector_class.return_value.__enter__.return_value
+        connector.execute_stream.return_value.description = ()
+        connector.execute_stream.return_value.fetchmany.return_value = ()
+        connector_class.describe_columns.return_value = [{"name": "id", "type": "int"}]
+
+        response = self.client.post(f"{self.url}?format=ndjson&confirm=true")
+
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["header", "trailer"])
+        self.assertTrue(run_preflight.call_args.kwargs["confirmed"])
+
+    @mock.patch("llm.views.query_execution_view.iter_query_export")
+    async def test_asgi_export_sends_chunks_as_they_are_fetched(self, iter_export):
+        release, state = threading.Event(), {"finished": False}
+
+        def chunks(*args, **kwargs):
+            yield '{"type": "header", "columns": []}\n'
+            yield '{"type": "row", "values": [1]}\n'
+            release.wait(5)
+            yield '{"type": "trailer", "row_count": 1}\n'
+            state["finished"] = True
+
+        iter_export.side_effect = chunks
+        response = await self.async_client.post(f"{self.url}?format=ndjson")
+        content = aiter(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await anext(content), b'{"type": "header", "columns": []}\n')
+        self.assertEqual(await anext(content), b'{"type": "row", "values": [1]}\n')
+        self.assertFalse(state["finished"])
+        release.set()
+        self.assertEqual([chunk async for chunk in content], [b'{"type": "trailer", "row_count": 1}\n'])
+        self.assertTrue(state["finished"])
+
+
+class ResultExportTest(TestCase):
+    # (name, type_code, display_size, internal_size, precision, scale, null_ok)
+    DESCRIPTION = (
+        ("id", FIELD_TYPE.LONG, None, 11, 11, 0, False),
+        ("amount", FIELD_TYPE.NEWDECIMAL, None, 67, 67, 2, True),  # DECIMAL(65,2)
+        ("name", FIELD_TYPE.VAR_STRING, None, 80, 80, 0, True),
+        ("created_at", FIELD_TYPE.DATETIME, None, 19, 19, 0, True),
+    )
+    ROWS = (
+        (1, Decimal("12345678901234567890123456789012345678901234567890.12"), "철수", datetime(2025, 1, 2, 3, 4, 5)),
+        (2, None, None, None),
+    )
+
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+
+    def export(self, fmt, rows=ROWS, chunks=None):
+        with mock.patch("llm.services.query_service.MySQLConnector") as connector_class:
+            connector_class.describe_columns = MySQLConnector.describe_columns
+            cursor = connector_class.return_value.__enter__.return_value.execute_stream.return_value
+            cursor.description = self.DESCRIPTION
+            cursor.fetchmany.side_effect = chunks or [rows, ()]
+            chunks = list(iter_query_export(self.database, "SELECT * FROM orders", fmt=fmt, preflight=False))
+        return b"".join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in chunks)
+
+    def test_ndjson_export(self):
+        rows = [(1, Decimal("12.30"), b"\xffab", datetime(2025, 1, 2, 3, 4, 5)), (2, None, None, None)]
+
+        lines = [json.loads(line) for line in self.export("ndjson", rows).decode().splitlines()]
+
+        self.assertEqual(lines[0]["type"], "header")
+        self.assertEqual(
+            [(column["name"], column["type"]) for column in lines[0]["columns"]],
+            [("id", "long"), ("amount", "newdecimal"), ("name", "var_string"), ("created_at", "datetime")],
+        )
+        self.assertEqual(
+            [line["values"] for line in lines[1:3]],
+            [[1, 12.3, "\ufffdab", "2025-01-02T03:04:05"], [2, None, None, None]],
+        )
+        self.assertEqual((lines[3]["type"], lines[3]["row_count"]), ("trailer", 2))
+        self.assertIn("elapsed_ms", lines[3])
+
+    def test_csv_export(self):
+        rows = [(1, Decimal("12.30"), b"ab", datetime(2025, 1, 2, 3, 4, 5)), (2, None, None, None)]
+
+        lines = self.export("csv", rows).decode().splitlines()
+
+        self.assertEqual(lines[:3], ["id,amount,name,created_at", "1,12.30,ab,2025-01-02 03:04:05", "2,,,"])
+        self.assertRegex(lines[3], r"^# row_count=2, elapsed_ms=[\d.]+$")
+
+    def test_mid_stream_failure_ends_with_error_trailer(self):
+        chunks = [[(1, Decimal("1.00"), "a", None)], MySQLdb.OperationalError("Lost connection\nto server")]
+
+        ndjson = [json.loads(line) for line in self.export("ndjson", chunks=chunks).decode().splitlines()]
+        csv_lines = self.export("csv", chunks=chunks).decode().splitlines()
+
+        self.assertEqual([line["type"] for line in ndjson], ["header", "row", "error"])
+        self.assertIn("Lost connection", ndjson[-1]["message"])
+        self.assertEqual(csv_lines[:2], ["id,amount,name,created_at", "1,1.00,a,"])
+        self.assertEqual(csv_lines[2], "# error=Lost connection to server")
+        self.assertEqual(list(QueryExecutionLog.objects.values_list("status", "row_count")), [("ERROR", 1)] * 2)
+
+    @skipUnless(ArrowFormatter.available, "pyarrow is not installed")
+    def test_wide_decimal_uses_decimal256(self):
+        import pyarrow as pa
+
+        columns = MySQLConnector.describe_columns(self.DESCRIPTION)
+        self.assertEqual(arrow_type(columns[1]), pa.decimal256(66, 2))
+        self.assertEqual(
+            arrow_type({"name": "price", "type": "newdecimal", "precision": 10, "scale": 2}).bit_width, 128
+        )
+
+    @skipUnless(ArrowFormatter.available, "pyarrow is not installed")
+    def test_arrow_round_trip(self):
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(self.export("arrow")).read_all()
+
+        self.assertEqual(table.column_names, ["id", "amount", "name", "created_at"])
+        self.assertEqual([tuple(row.values()) for row in table.to_pylist()], list(self.ROWS))
+
+    @skipUnless(ArrowFormatter.available, "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(io.BytesIO(self.export("parquet")))
+
+        self.assertEqual([tuple(row.values()) for row in parquet_file.read().to_pylist()], list(self.ROWS))
+        self.assertEqual(parquet_file.metadata.metadata[b"row_count"], b"2")
+
+    @skipUnless(ArrowFormatter.available, "pyarrow is not installed")
+    @mock.patch("llm.services.query_service.QueryExecutionLog")  # 스트림 스레드의 ORM 쓰기는 테스트 트랜잭션과 충돌
+    @mock.patch("llm.services.query_service.MySQLConnector")
+    async def test_asgi_arrow_export_sends_record_batches_as_they_are_fetched(self, connector_class, _):
+        import pyarrow as pa
+
+        await LLMLog.objects.acreate(
+            id="session-1",
+            question="전체 주문",
+            response_content='{"query": "SELECT * FROM orders;"}',
+            model_name="gpt-4o",
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+        )
+        release, resumed = threading.Event(), threading.Event()
+
+        def fetch_chunks():
+            yield [self.ROWS[0]]
+            release.wait(5)
+            resumed.set()
+            yield [self.ROWS[1]]
+            yield ()
+
+        chunks = fetch_chunks()
+        connector_class.describe_columns = MySQLConnector.describe_columns
+        cursor = connector_class.return_value.__enter__.return_value.execute_stream.return_value
+        cursor.description = self.DESCRIPTION
+        cursor.fetchmany.side_effect = lambda size: next(chunks)
+
+        url = reverse("execute-sql", args=[self.database.id, "session-1"])
+        response = await self.async_client.post(f"{url}?format=arrow&preflight=false")
+        content = aiter(response.streaming_content)
+        received = b""
+        while not received:
+            received = await anext(content)
+
+        # 두 번째 fetchmany가 끝나기 전에 첫 RecordBatch가 도착
+        self.assertFalse(resumed.is_set())
+        first_batch = pa.ipc.open_stream(received).read_next_batch()
+        self.assertEqual([tuple(row.values()) for row in first_batch.to_pylist()], [self.ROWS[0]])
+        release.set()
+        received += b"".join([chunk async for chunk in content])
+        table = pa.ipc.open_stream(received).read_all()
+        self.assertEqual([tuple(row.values()) for row in table.to_pylist()], list(self.ROWS))
+
+    def test_serialization_error_ends_with_error_trailer(self):
+        with mock.patch("llm.tools.result_formatter.NDJSONFormatter.rows", side_effect=ValueError("cannot serialize")):
+            lines = [json.loads(line) for line in self.export("ndjson").splitlines()]
+
+        self.assertEqual([line["type"] for line in lines], ["header", "error"])
+        self.assertEqual(lines[-1]["message"], "cannot serialize")
+        log = QueryExecutionLog.objects.get()
+        self.assertEqual((log.status, log.truncated), ("ERROR", True))
+
+
+class QueuedExecutor:
+    """submit된 작업을 바로 실행하지 않고 run()을 호출할 때 실행하는 테스트용 executor"""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn, args))
+
+    def run(self):
+        for fn, args in self.calls:
+            fn(*args)
+
+
+@mock.patch("llm.services.job_service.connection")
+@mock.patch("llm.services.job_service.close_old_connections")
+class QueryJobTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        LLMLog.objects.create(
+            id="session-1",
+            question="회원 수",
+            response_content='{"query": "SELECT COUNT(*) FROM users;"}',
+            model_name="gpt-4o",
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+        )
+        self.executor = QueuedExecutor()
+        self.slots = threading.BoundedSemaphore(2)
+        mock.patch("llm.services.job_service._get_executor", return_value=(self.executor, self.slots)).start()
+        self.execute_query = mock.patch("llm.services.job_service.execute_query").start()
+        self.execute_query.return_value = {"columns": ["count"], "rows": [{"count": 3}], "row_count": 1}
+        self.addCleanup(mock.patch.stopall)
+
+    def test_submit_and_poll(self, *_):
+        job = submit_job(self.database, "session-1", shape="columnar")
+        self.assertEqual(get_job(job.id).status, QueryJob.STATUS_PENDING)
+
+        self.executor.run()
+
+        job = get_job(job.id)
+        self.assertEqual(job.status, QueryJob.STATUS_SUCCEEDED)
+        self.assertEqual(json.loads(job.result)["rows"], [{"count": 3}])
+        self.assertEqual(self.execute_query.call_args.kwargs["shape"], "columnar")
+        self.assertIsNotNone(job.expires_at)
+
+    def test_failed_query_and_full_queue(self, *_):
+        self.execute_query.return_value = {"error": "Table 'shop.users' doesn't exist"}
+        job = submit_job(self.database, "session-1")
+        submit_job(self.database, "session-1")
+        with self.assertRaises(RuntimeError):
+            submit_job(self.database, "session-1")
+
+        self.executor.run()
+
+        self.assertEqual(get_job(job.id).status, QueryJob.STATUS_FAILED)
+        self.assertIn("doesn't exist", get_job(job.id).error)
+
+    def test_cancel_pending_job_is_never_executed(self, *_):
+        job = submit_job(self.database, "session-1")
+
+        self.assertEqual(cancel_job(job.id).status, QueryJob.STATUS_CANCELLED)
+        self.executor.run()
+
+        self.execute_query.assert_not_called()
+        self.assertEqual(get_job(job.id).status, QueryJob.STATUS_CANCELLED)
+
+    @mock.patch("llm.services.job_service.MySQLConnector")
+    def test_cancel_kills_query_started_after_read(self, connector_class, *_):
+        job = submit_job(self.database, "session-1")
+        stale = get_job(job.id)  # PENDING 상태로 읽은 뒤 워커가 실행을 시작함
+        QueryJob.objects.filter(id=job.id).update(
+            status=QueryJob.STATUS_RUNNING, connection_id=42, connection_role="replica0"
+        )
+
+        with mock.patch("llm.services.job_service.get_job", return_value=stale):
+            self.assertEqual(cancel_job(job.id).status, QueryJob.STATUS_CANCELLED)
+
+        connector_class.assert_called_once_with(self.database, role="replica0")
+        connector = connector_class.return_value.__enter__.return_value
+        connector.cursor.execute.assert_called_once_with("KILL QUERY 42")
+
+    @mock.patch("llm.services.query_service.run_query")
+    @mock.patch("llm.services.query_service.MySQLConnector")
+    @mock.patch("llm.services.job_service.MySQLConnector")
+    def test_cancel_during_session_setup_skips_main_query(self, kill_connector_class, connector_class, run_query, *_):
+        self.execute_query.side_effect = execute_query
+        job = submit_job(self.database, "session-1", use_cache=False, preflight=False)
+        connector = connector_class.return_value.__enter__.return_value
+        connector.conn.thread_id.return_value = 42
+        connector.role = "primary"
+        # 세션 변수 설정 중에 취소되어 KILL QUERY는 SET 문만 중단
+        connector.apply_profile.side_effect = lambda profile: cancel_job(job.id)
+
+        self.executor.run()
+
+        kill_connector_class.return_value.__enter__.return_value.cursor.execute.assert_called_once_with("KILL QUERY 42")
+        run_query.assert_not_called()
+        self.assertEqual(get_job(job.id).status, QueryJob.STATUS_CANCELLED)
+
+    def test_view_forwards_execution_options(self, *_):
+        url = reverse("query-job", args=[self.database.id, "session-1"])
+
+        response = self.client.post(f"{url}?confirm=true&preflight=true&shape=tuples")
+        self.assertEqual(response.status_code, 202)
+        self.executor.run()
+
+        options = self.execute_query.call_args.kwargs
+        self.assertEqual((options["confirmed"], options["preflight"], options["shape"]), (True, True, "tuples"))
+        self.assertEqual(self.client.post(f"{url}?shape=xml").status_code, 400)
+
+    def test_expired_jobs_are_hidden_and_purged(self, *_):
+        job = submit_job(self.database, "session-1")
+        self.executor.run()
+        QueryJob.objects.filter(id=job.id).update(expires_at=datetime.now() - timedelta(seconds=1))
+
+        with self.assertRaises(QueryJob.DoesNotExist):
+            get_job(job.id)
+        self.assertEqual(purge_expired_jobs(), 1)
+
+
+class PromptFragmentCacheTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        self.users = Table.objects.create(database=self.database, schema_name="shop", name="users", description="회원")
+        self.orders = Table.objects.create(
+            database=self.database, schema_name="shop", name="orders", description="주문"
+        )
+        Column.objects.create(table=self.users, name="id", data_type="int", is_primary_key=True)
+        Column.objects.create(
+            table=self.orders,
+            name="user_id",
+            data_type="int",
+            is_foreign_key=True,
+            foreign_key_table="users",
+            foreign_key_column="id",
+        )
+        self.cache = PromptFragmentCache()
+
+    def test_render_matches_formatter_and_tracks_catalog_version(self):
+        columns = [{**column.__dict__, "table": column.table} for column in Column.objects.order_by("table_id", "id")]
+        catalog = self.cache.get(self.database.id)
+        self.assertEqual(catalog.render(), format_metadata_for_prompt(columns))
+        self.assertEqual(catalog.render([str(self.orders.id)]).splitlines()[0], "Table: shop.orders")
+
+        with self.assertNumQueries(1):
+            self.assertIs(self.cache.get(self.database.id), catalog)
+
+        Column.objects.create(table=self.orders, name="amount", data_type="decimal")
+        self.assertIn("- amount (decimal)", self.cache.get(self.database.id).render([self.orders.id]))
+
+
+class TableIndexTest(SimpleTestCase):
+    def test_tokenize_splits_identifiers_and_hangul(self):
+        self.assertEqual(tokenize("userOrders 회원의"), ["user", "order", "회원의", "회원", "원의"])
+
+    def test_search_ranks_matching_table_first(self):
+        documents = {
+            1: table_document(SimpleNamespace(name="users", description="회원"), [{"name": "email"}]),
+            2: table_document(SimpleNamespace(name="orders", description="주문"), [{"name": "user_id"}]),
+            3: table_document(SimpleNamespace(name="coupons", description="쿠폰"), [{"name": "code"}]),
+        }
+        hits = TableIndex(documents).search("회원별 주문 건수", top_k=2)
+
+        self.assertEqual([table_id for table_id, _ in hits], [2, 1])
+        self.assertEqual(decisive_tables([(2, 9.0), (1, 2.0), (3, 1.0)], max_tables=2, ratio=3.0), [2])
+        self.assertEqual(decisive_tables([(2, 9.0), (1, 8.0), (3, 1.0)], max_tables=1, ratio=3.0), [])
+
+
+@mock.patch("llm.tools.token_counter.get_encoding", return_value=None)
+class MetadataBudgetTest(SimpleTestCase):
+    def test_keeps_keys_and_relevant_columns_within_budget(self, _):
+        table = SimpleNamespace(schema_name="shop", name="orders", description="주문 " * 200)
+        columns = [
+            {"name": "id", "data_type": "int", "is_primary_key": True},
+            {"name": "user_id", "data_type": "int", "is_foreign_key": True, "foreign_key_table": "users"},
+            *({"name": f"attr_{i}", "data_type": "varchar(64)", "description": "부가 속성"} for i in range(50)),
+            {"name": "amount", "data_type": "decimal(12,2)", "description": "결제 금액"},
+        ]
+
+        meta_info, tokens = format_tables_within_budget(
+            [(table, columns)], "주문 amount 합계", budget=120, max_description_chars=40
+        )
+
+        self.assertLessEqual(tokens, 120)
+        self.assertIn("- id (int) [PK]", meta_info)
+        self.assertIn("- user_id (int)", meta_info)
+        self.assertIn("- amount (decimal(12,2))", meta_info)
+        self.assertIn("more columns omitted)", meta_info)
+        self.assertIn("…", meta_info.splitlines()[1])
+
+
+class JoinGraphTest(SimpleTestCase):
+    def test_expand_adds_bridge_table_and_join_hints(self):
+        tables = {
+            1: SimpleNamespace(schema_name="shop", name="orders"),
+            2: SimpleNamespace(schema_name="shop", name="products"),
+            3: SimpleNamespace(schema_name="shop", name="order_items"),
+            4: SimpleNamespace(schema_name="shop", name="users"),
+        }
+
+        def fk(name, table):
+            return {"name": name, "is_foreign_key": True, "foreign_key_table": table, "foreign_key_column": "id"}
+
+        columns = {1: [fk("user_id", "users")], 3: [fk("order_id", "orders"), fk("product_id", "products")]}
+        graph = JoinGraph(tables, columns)
+
+        self.assertEqual(graph.expand([1, 2]), [1, 2, 3])
+        self.assertEqual(graph.expand([2, 4], max_hops=2), [2, 4])
+        self.assertEqual(
+            graph.hints([1, 2, 3]),
+            ["shop.order_items.order_id = shop.orders.id", "shop.order_items.product_id = shop.products.id"],
+        )
+
+
+@mock.patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+class LLMClientRegistryTest(SimpleTestCase):
+    def test_chains_share_models_and_http_client(self):
+        registry = LLMClientRegistry()
+        prompt = PromptTemplate(input_variables=["question"], template="{question}")
+        self.addCleanup(registry.close)
+
+        chain = registry.get_chain("table_selector", prompt, "gpt-4o-mini", 0)
+
+        self.assertIs(registry.get_chain("table_selector", prompt, "gpt-4o-mini", 0.0), chain)
+        self.assertIsNot(registry.get_chain("query_generator", prompt, "gpt-4o-mini", 0), chain)
+        self.assertIs(registry.get_model("gpt-4o-mini", 0), chain.last)
+        self.assertIs(registry.get_model("gpt-4o", 0).http_client, chain.last.http_client)
+
+    def test_async_client_per_event_loop(self):
+        registry = LLMClientRegistry(async_transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        self.addCleanup(registry.close)
+        client = registry.get_model("gpt-4o", 0).http_async_client
+
+        async def send_twice():
+            await client.get("https://llm.test/")
+            await client.get("https://llm.test/")
+            return client.client_for_loop()
+
+        first, second = asyncio.run(send_twice()), asyncio.run(send_twice())
+
+        self.assertIsNot(first, second)
+        self.assertLessEqual(len(client._loop_clients), 1)  # 닫힌 루프의 클라이언트는 남기지 않음
+
+
+class SQLGenerationCacheTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        LLMLog.objects.create(
+            id="chatcmpl-1",
+            question="이번 달 매출 상위 5개 상품",
+            response_content="{}",
+            model_name="gpt-4o",
+            prompt_tokens=10,
+            completion_tokens=5,
+            total_tokens=15,
+            agent="query_generator",
+        )
+
+    def test_normalize_question(self):
+        synonyms = {"top": "상위", "매출액": "매출"}
+        self.assertEqual(
+            normalize_question("  이번 달  매출액 TOP 5개 상품?! ", synonyms),
+            normalize_question("이번 달, 매출 상위 5개 상품", synonyms),
+        )
+        self.assertEqual(normalize_question("\u1100\u1161 1.5배"), "가 1.5배")
+
+    @mock.patch.dict("django.conf.settings.DDP_SQL_CACHE", {"SYNONYMS": {"top": "상위"}})
+    def test_hit_returns_new_session_until_catalog_changes(self):
+        self.assertIsNone(get_cached_sql(self.database.id, "이번 달 매출 상위 5개 상품"))
+        remember_sql(self.database, "chatcmpl-1", "이번 달 매출 상위 5개 상품", "SELECT 1;")
+
+        cached = get_cached_sql(self.database.id, "이번 달 매출 TOP 5개 상품?")
+        self.assertEqual((cached["query"], cached["cache_hit"]), ("SELECT 1;", True))
+        log = LLMLog.objects.get(id=cached["id"])
+        self.assertEqual((log.agent, log.model_name, log.total_tokens), ("sql_cache", "gpt-4o", 0))
+        self.assertEqual(json.loads(log.response_content)["query"], "SELECT 1;")
+
+        Database.objects.filter(pk=self.database.id).update(metadata_version=F("metadata_version") + 1)
+        self.assertIsNone(get_cached_sql(self.database.id, "이번 달 매출 상위 5개 상품"))
+
+
+class StreamingResponseTest(SimpleTestCase):
+    def blocking_chunks(self, release, state):
+        try:
+            state["threads"].add(threading.get_ident())
+            yield "first"
+            release.wait(5)
+            state["threads"].add(threading.get_ident())
+            yield "second"
+            state["finished"] = True
+        except GeneratorExit:
+            state["threads"].add(threading.get_ident())
+            state["closed"].set()
+            raise
+
+    def state(self):
+        return {"threads": set(), "finished": False, "closed": threading.Event()}
+
+    async def test_first_chunk_arrives_before_generator_finishes(self):
+        release, state = threading.Event(), self.state()
+        chunks = ThreadedIterator(self.blocking_chunks(release, state))
+
+        self.assertEqual(await anext(chunks), "first")
+        self.assertFalse(state["finished"])
+        release.set()
+        self.assertEqual([chunk async for chunk in chunks], ["second"])
+        self.assertTrue(state["finished"])
+        self.assertEqual(len(state["threads"]), 1)
+        self.assertNotIn(threading.get_ident(), state["threads"])
+
+    async def test_close_closes_generator_in_its_thread(self):
+        state = self.state()
+        chunks = ThreadedIterator(self.blocking_chunks(threading.Event(), state))
+
+        self.assertEqual(await anext(chunks), "first")
+        chunks.close()
+
+        self.assertTrue(state["closed"].wait(5))
+        self.assertFalse(state["finished"])
+        self.assertEqual(len(state["threads"]), 1)
+
+    def test_iterator_is_wrapped_only_for_asgi_requests(self):
+        wsgi = streaming_response(RequestFactory().get("/"), iter(["a"]))
+        asgi = streaming_response(AsyncRequestFactory().get("/"), iter(["a"]))
+
+        self.assertFalse(wsgi.is_async)
+        self.assertTrue(asgi.is_async)
+
+    async def test_closing_asgi_response_closes_generator(self):
+        state = self.state()
+        response = streaming_response(AsyncRequestFactory().get("/"), self.blocking_chunks(threading.Event(), state))
+
+        self.assertEqual(await anext(aiter(response.streaming_content)), b"first")
+        response.close()
+
+        self.assertTrue(await asyncio.to_thread(state["closed"].wait, 5))
+        self.assertFalse(state["finished"])
+
+
+class SQLGenerationStreamTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+
+    def parse(self, message):
+        event, data = message.strip().split("\n")
+        return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    @mock.patch("llm.services.generation_service.get_filtered_metadata_by_llm", return_value=("Table: shop.users", 12))
+    @mock.patch("llm.agents.query_generator.build_query_generator_agent")
+    def test_emits_stage_tokens_and_result(self, build_agent, _):
+        usage = {"input_tokens": 100, "output_tokens": 7, "total_tokens": 107}
+        build_agent.return_value.stream.return_value = iter(
+            [
+                AIMessageChunk(content='{"query": "SELECT 1;", ', id="run-1"),
+                AIMessageChunk(content='"result": "SUCCESS"}', id="run-1", usage_metadata=usage),
+            ]
+        )
+        events = [self.parse(message) for message in iter_sql_generation_events(self.database.id, "회원 수")]
+
+        self.assertEqual([event for event, _ in events], ["stage", "stage", "token", "token", "result"])
+        self.assertEqual(events[1][1], {"stage": "tables_selected", "meta_tokens": 12})
+        result = events[-1][1]
+        self.assertEqual((result["query"], result["id"], result["cache_hit"]), ("SELECT 1;", "run-1", False))
+        log = LLMLog.objects.get(id="run-1")
+        self.assertEqual((log.prompt_tokens, log.total_tokens, log.meta_tokens), (100, 107, 12))
+
+    @mock.patch("llm.views.sql_generation_view.iter_sql_generation_events")
+    def test_view_accepts_event_stream(self, iter_events):
+        iter_events.return_value = iter(['event: result\ndata: {"result": "SUCCESS"}\n\n'])
+        url = reverse("generate-sql-stream", args=[self.database.id])
+
+        response = self.client.post(
+            url, {"question": "회원 수"}, content_type="application/json", HTTP_ACCEPT="text/event-stream"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/event-stream"))
+        self.assertEqual(b"".join(response.streaming_content), b'event: result\ndata: {"result": "SUCCESS"}\n\n')
+
+        response = self.client.post(url, {}, content_type="application/json", HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.content.startswith(b"event: error\n"))
+
+    @mock.patch("llm.views.sql_generation_view.iter_sql_generation_events")
+    async def test_asgi_stream_sends_events_as_they_are_generated(self, iter_events):
+        release, state = threading.Event(), {"finished": False}
+
+        def events(database_id, question):
+            yield 'event: token\ndata: {"content": "SELECT"}\n\n'
+            release.wait(5)
+            yield 'event: result\ndata: {"result": "SUCCESS"}\n\n'
+            state["finished"] = True
+
+        iter_events.side_effect = events
+        response = await self.async_client.post(
+            reverse("generate-sql-stream", args=[self.database.id]),
+            {"question": "회원 수"},
+            content_type="application/json",
+            headers={"accept": "text/event-stream"},
+        )
+        chunks = aiter(response.streaming_content)
+
+        self.assertEqual(await anext(chunks), b'event: token\ndata: {"content": "SELECT"}\n\n')
+        self.assertFalse(state["finished"])
+        release.set()
+        self.assertEqual([chunk async for chunk in chunks], [b'event: result\ndata: {"result": "SUCCESS"}\n\n'])
+        self.assertTrue(state["finished"])
+
+    @mock.patch("llm.views.sql_generation_view.iter_sql_generation_events")
+    async def test_asgi_disconnect_closes_event_generator(self, iter_events):
+        release, closed, received = threading.Event(), threading.Event(), asyncio.Event()
+
+        def events(database_id, question):
+            try:
+                yield 'event: token\ndata: {"content": "SELECT"}\n\n'
+                release.wait(5)
+                yield 'event: token\ndata: {"content": " 1"}\n\n'
+            except GeneratorExit:
+                closed.set()  # iter_sql_generation_events는 여기서 LLM 스트림을 중단
+                raise
+
+        iter_events.side_effect = events
+        response = await self.async_client.post(
+            reverse("generate-sql-stream", args=[self.database.id]),
+            {"question": "회원 수"},
+            content_type="application/json",
+            headers={"accept": "text/event-stream"},
+        )
+
+        async def send():
+            async for _ in response.streaming_content:
+                received.set()
+
+        # 클라이언트가 연결을 끊으면 Django ASGIHandler는 응답 전송 task를 취소함
+        task = asyncio.create_task(send())
+        await asyncio.wait_for(received.wait(), 5)
+        task.cancel()
+        release.set()
+
+        self.assertTrue(await asyncio.to_thread(closed.wait, 5))
+
+
+@mock.patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"})
+@override_settings(DDP_SELECTOR_BYPASS={"ENABLED": False})
+class AsyncSQLGenerationViewTest(TestCase):
+    def setUp(self):
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        self.orders = Table.objects.create(
+            database=self.database, schema_name="shop", name="orders", description="주문"
+        )
+        Column.objects.create(table=self.orders, name="amount", data_type="decimal")
+
+        async def completions(request):
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            if "relevant_tables" in prompt:
+                content = json.dumps({"relevant_tables": [self.orders.id]})
+            else:
+                content = json.dumps({"query": "SELECT SUM(amount) FROM shop.orders;", "result": "SUCCESS"})
+            message = {"role": "assistant", "content": content}
+            return httpx.Response(
+                200,
+                json={
+                    "id": "chatcmpl-test",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "gpt-4o",
+                    "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                },
+            )
+
+        llm_registry.use_transports(async_transport=httpx.MockTransport(completions))
+        self.addCleanup(llm_registry.use_transports)
+
+    async def test_generates_sql_with_async_llm_calls(self):
+        response = await self.async_client.post(
+            reverse("async-generate-sql", args=[self.database.id]),
+            data={"question": "주문 총액"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual((data["query"], data["cache_hit"]), ("SELECT SUM(amount) FROM shop.orders;", False))
+        agents = [agent async for agent in LLMLog.objects.order_by("created_at").values_list("agent", flat=True)]
+        self.assertEqual(agents, ["table_selector", "query_generator"])
+
+
+@mock.patch("llm.tools.token_counter.get_encoding", return_value=None)
+class SelectorBypassTest(TestCase):
+    def setUp(self):
+        prompt_cache.clear()
+        self.database = Database.objects.create(name="테스트DB", description="", connection_info="{}")
+        for name in ("users", "orders"):
+            table = Table.objects.create(database=self.database, schema_name="shop", name=name, description="")
+            Column.objects.create(table=table, name="id", data_type="int")
+
+    @mock.patch("llm.services.meta_service.select_relevant_tables")
+    def test_small_catalog_skips_selector(self, select_relevant_tables, _):
+        meta_info, tokens = get_filtered_metadata_by_llm(self.database.id, "회원 수")
+
+        select_relevant_tables.assert_not_called()
+        self.assertIn("Table: shop.users", meta_info)
+        self.assertIn("Table: shop.orders", meta_info)
+        self.assertGreater(tokens, 0)
+
+    @override_settings(DDP_SELECTOR_BYPASS={"MAX_CATALOG_TOKENS": 5})
+    @mock.patch("llm.services.meta_service.select_relevant_tables")
+    def test_large_catalog_uses_selector(self, select_relevant_tables, _):
+        users = Table.objects.get(name="users")
+        select_relevant_tables.return_value = [users.id]
+
+        meta_info, _ = get_filtered_metadata_by_llm(self.database.id, "회원 수")
+
+        select_relevant_tables.assert_called_once()
+        self.assertNotIn("Table: shop.orders", meta_info)
+
+
+class ResultProfileTest(SimpleTestCase):
+    COLUMNS = ["order_date", "category", "amount"]
+
+    def rows(self, count):
+        return [
+            {
+                "order_date": date(2024, 1, 1) + timedelta(days=i % 366),
+                "category": "ABC"[i % 3],
+                "amount": Decimal("1.50"),
+            }
+            for i in range(count)
+        ]
+
+    def test_statistics_cover_all_rows(self):
+        profile = profile_result(self.COLUMNS, self.rows(3000))
+
+        self.assertEqual(profile["row_count"], 3000)
+        self.assertEqual(
+            profile["columns"]["amount"],
+            {"type": "numeric", "nulls": 0, "min": 1.5, "max": 1.5, "mean": 1.5, "sum": 4500},
+        )
+        self.assertEqual(profile["columns"]["category"]["distinct"], 3)
+        self.assertEqual(profile["columns"]["category"]["top"][0], ["A", 1000])
+        self.assertEqual(profile["trend"]["bucket"], "month")
+        self.assertEqual(len(profile["trend"]["series"]), 12)
+        self.assertEqual(sum(point["count"] for point in profile["trend"]["series"]), 3000)
+        self.assertEqual(len(profile["sample"]), 10)
+        self.assertEqual(profile["sample"][0], self.rows(1)[0])
+
+    def test_tuple_rows_with_string_values(self):
+        profile = profile_result(["day", "total"], [("2024-01-01", "10.5"), ("2024-01-02", "4.5"), (None, None)])
+
+        self.assertEqual(profile["columns"]["total"]["sum"], 15)
+        self.assertEqual(profile["columns"]["total"]["nulls"], 1)
+        self.assertEqual(profile["trend"]["bucket"], "day")
+        self.assertEqual(profile["sample"][0], {"day": "2024-01-01", "total": "10.5"})
+
+    def test_prompt_size_is_independent_of_row_count(self):
+        small = _summary_inputs("월별 매출", self.COLUMNS, self.rows(500))
+        large = _summary_inputs("월별 매출", self.COLUMNS, self.rows(50000))
+
+        self.assertTrue(large["is_timeseries"])
+        self.assertEqual(large["row_count"], 50000)
+        self.assertLess(abs(len(json.dumps(large)) - len(json.dumps(small))), 100)
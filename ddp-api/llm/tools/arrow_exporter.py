@@ -0,0 +1,173 @@
+import io
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 미설치 시 arrow/parquet 형식만 비활성화
+    pa = None
+    pq = None
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    writer가 기록한 byte를 모아 두었다가 drain 시 꺼내는 쓰기 전용 파일 객체입니다.
+
+    Parquet footer의 오프셋이 올바르도록 tell()은 지금까지 기록된 전체 길이를 반환합니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def arrow_type(column: dict, sample=None):
+    """
+    MySQLConnector.describe_columns의 컬럼 정보를 Arrow 타입으로 변환합니다.
+
+    Args:
+        column (dict): {"name": str, "type": str, "precision": int, "scale": int(decimal만)}
+        sample: 문자열/BLOB 계열 컬럼의 str/bytes 여부 판단용 첫 번째 값
+
+    Returns:
+        pyarrow.DataType: 대응하는 Arrow 타입
+    """
+    mysql_type = column["type"]
+    if mysql_type in ("tiny", "short", "int24", "long", "longlong"):
+        return pa.int64()
+    if mysql_type == "year":
+        return pa.int16()
+    if mysql_type == "float":
+        return pa.float32()
+    if mysql_type == "double":
+        return pa.float64()
+    if mysql_type in ("decimal", "newdecimal"):
+        # MySQL DECIMAL은 최대 65자리 - decimal128의 최대 자릿수(38)를 넘으면 decimal256 사용
+        precision = column.get("precision") or 38
+        if precision > 38:
+            return pa.decimal256(min(precision, 76), column.get("scale") or 0)
+        return pa.decimal128(38, column.get("scale") or 0)
+    if mysql_type in ("date", "newdate"):
+        return pa.date32()
+    if mysql_type in ("datetime", "timestamp"):
+        return pa.timestamp("us")
+    if mysql_type == "time":
+        return pa.duration("us")  # MySQLdb는 TIME을 timedelta로 반환
+    if mysql_type == "bit":
+        return pa.binary()
+    if mysql_type == "null":
+        return pa.null()
+    # VARCHAR/TEXT/BLOB/ENUM/JSON 등: TEXT도 BLOB 타입 코드로 오므로 실제 값으로 구분
+    return pa.binary() if isinstance(sample, (bytes, bytearray)) else pa.string()
+
+
+class ArrowFormatter:
+    """
+    쿼리 결과를 Apache Arrow IPC stream으로 직렬화합니다.
+
+    NDJSONFormatter/CSVFormatter와 같은 header → rows → trailer 순서로 호출되며,
+    스키마는 첫 chunk의 값을 보고 확정한 뒤 chunk마다 RecordBatch를 기록합니다.
+    """
+
+    media_type = "application/vnd.apache.arrow.stream"
+    extension = "arrows"
+    available = pa is not None
+
+    def __init__(self):
+        self.sink = _ChunkSink()
+        self.columns = []
+        self.schema = None
+        self.writer = None
+
+    def _open_writer(self):
+        self.writer = pa.ipc.new_stream(self.sink, self.schema)
+
+    def _write(self, batch):
+        self.writer.write_batch(batch)
+
+    def _ensure_schema(self, rows):
+        if self.schema is not None:
+            return
+        samples = [next((value for value in values if value is not None), None) for values in zip(*rows)]
+        samples = samples or [None] * len(self.columns)
+        self.schema = pa.schema(
+            [pa.field(column["name"], arrow_type(column, sample)) for column, sample in zip(self.columns, samples)]
+        )
+        self._open_writer()
+
+    def header(self, columns: list[dict]) -> bytes:
+        self.columns = columns
+        return b""
+
+    def rows(self, rows) -> bytes:
+        self._ensure_schema(rows)
+        arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), self.schema)]
+        self._write(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self.sink.drain()
+
+    def trailer(self, **summary) -> bytes:
+        self._ensure_schema([])
+        self.writer.close()
+        return self.sink.drain()
+
+    def error(self, message: str) -> bytes:
+        # 바이너리 포맷은 오류 레코드를 담을 수 없으므로 스트림을 닫지 않고 끝내
+        # 클라이언트가 불완전한 응답으로 인식하도록 합니다.
+        return b""
+
+
+class ParquetFormatter(ArrowFormatter):
+    """
+    쿼리 결과를 Parquet으로 직렬화합니다.
+
+    fetch chunk를 row_group_size만큼 모아 row group 단위로 기록하며,
+    footer는 trailer 시점에 기록됩니다.
+    """
+
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+    row_group_size = 65536
+
+    def __init__(self):
+        super().__init__()
+        self.pending = []
+        self.pending_rows = 0
+
+    def _open_writer(self):
+        self.writer = pq.ParquetWriter(self.sink, self.schema)
+
+    def _flush(self):
+        if self.pending:
+            self.writer.write_table(pa.Table.from_batches(self.pending, schema=self.schema))
+            self.pending = []
+            self.pending_rows = 0
+
+    def _write(self, batch):
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        if self.pending_rows >= self.row_group_size:
+            self._flush()
+
+    def trailer(self, **summary) -> bytes:
+        self._ensure_schema([])
+        self._flush()
+        if hasattr(self.writer, "add_key_value_metadata"):  # pyarrow 13+
+            self.writer.add_key_value_metadata({key: str(value) for key, value in summary.items()})
+        self.writer.close()
+        return self.sink.drain()
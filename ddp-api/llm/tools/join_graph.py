@@ -0,0 +1,100 @@
+from collections import deque
+
+
+class JoinGraph:
+    """
+    Column.is_foreign_key / foreign_key_table / foreign_key_column으로 만든 테이블 간 무방향 조인 그래프입니다.
+
+    foreign_key_table에는 스키마가 없으므로 같은 스키마의 테이블을 우선 연결하고,
+    없으면 테이블명이 같은 다른 스키마 테이블 중 ID가 가장 작은 테이블에 연결합니다.
+    """
+
+    def __init__(self, tables: dict, columns: dict):
+        """
+        Args:
+            tables (dict): {table_id: Table}
+            columns (dict): {table_id: [{"name", "is_foreign_key", "foreign_key_table", "foreign_key_column"}, ...]}
+        """
+        by_name = {}
+        for table_id in sorted(tables):
+            table = tables[table_id]
+            by_name.setdefault(table.name, []).append(table_id)
+
+        self._names = {table_id: f"{table.schema_name or 'default'}.{table.name}" for table_id, table in tables.items()}
+        self._edges = {}  # {table_id: {neighbor_id: [join condition, ...]}}
+        for table_id, table_columns in columns.items():
+            table = tables[table_id]
+            for column in table_columns:
+                if not column.get("is_foreign_key") or not column.get("foreign_key_table"):
+                    continue
+                candidates = by_name.get(column["foreign_key_table"], [])
+                same_schema = [
+                    candidate for candidate in candidates if tables[candidate].schema_name == table.schema_name
+                ]
+                target = (same_schema or candidates or [None])[0]
+                if target is None or target == table_id:
+                    continue
+                condition = (
+                    f"{self._names[table_id]}.{column['name']} = "
+                    f"{self._names[target]}.{column.get('foreign_key_column') or 'id'}"
+                )
+                self._edges.setdefault(table_id, {}).setdefault(target, []).append(condition)
+                self._edges.setdefault(target, {}).setdefault(table_id, []).append(condition)
+
+    def _shortest_path(self, sources: set, target: int, max_hops: int) -> list[int]:
+        """sources 중 하나에서 target까지 max_hops 이내의 최단 경로(target 포함, source 제외)를 찾습니다."""
+        previous = {source: None for source in sources}
+        queue = deque((source, 0) for source in sources)
+        while queue:
+            node, hops = queue.popleft()
+            if node == target:
+                path = []
+                while previous[node] is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path
+            if hops == max_hops:
+                continue
+            for neighbor in self._edges.get(node, {}):
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    queue.append((neighbor, hops + 1))
+        return []
+
+    def expand(self, table_ids: list, max_hops: int = 3) -> list[int]:
+        """
+        선택된 테이블들을 잇는 최단 조인 경로 위의 중간(브리지) 테이블을 추가합니다.
+
+        선택된 순서대로, 이미 연결된 테이블 집합에서 다음 테이블까지의 최단 경로를 더하는
+        근사 Steiner tree 방식입니다. max_hops 안에 경로가 없으면 해당 테이블만 추가합니다.
+
+        Args:
+            table_ids (list): 선택된 테이블 ID
+            max_hops (int): 두 테이블 사이에 허용할 최대 조인 수
+
+        Returns:
+            list[int]: 브리지 테이블이 추가된 테이블 ID 목록 (ID 순서)
+        """
+        selected = list(dict.fromkeys(int(table_id) for table_id in table_ids))
+        if not selected:
+            return []
+        connected = {selected[0]}
+        for target in selected[1:]:
+            if target not in connected:
+                connected.update(self._shortest_path(connected, target, max_hops) or [target])
+        return sorted(connected)
+
+    def hints(self, table_ids: list) -> list[str]:
+        """
+        주어진 테이블 사이에 존재하는 FK 조인 조건을 반환합니다.
+
+        Returns:
+            list[str]: ["shop.order_items.order_id = shop.orders.id", ...]
+        """
+        selected = set(table_ids)
+        conditions = []
+        for table_id in sorted(selected):
+            for neighbor, edge_conditions in sorted(self._edges.get(table_id, {}).items()):
+                if neighbor in selected and table_id < neighbor:
+                    conditions.extend(edge_conditions)
+        return list(dict.fromkeys(conditions))
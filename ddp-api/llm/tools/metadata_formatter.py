@@ -1,5 +1,59 @@
 from collections import defaultdict
 
+from llm.tools.table_index import tokenize
+from llm.tools.token_counter import count_tokens
+
+
+def format_column_for_prompt(col: dict) -> str:
+    """
+    컬럼 메타데이터 하나를 "- name (type): description [PK | FK → table.column]" 형식으로 변환합니다.
+
+    Args:
+        col (dict): format_metadata_for_prompt의 컬럼 항목
+
+    Returns:
+        str: 컬럼 한 줄
+    """
+    col_name = col["name"]
+    dtype = col["data_type"]
+    description = col.get("description", "")
+
+    # 기본 라인
+    line = f"- {col_name} ({dtype})"
+    if description:
+        line += f": {description}"
+
+    # 태그 추가
+    tags = []
+    if col.get("is_primary_key"):
+        tags.append("PK")
+    if col.get("is_foreign_key"):
+        fk_table = col.get("foreign_key_table")
+        fk_column = col.get("foreign_key_column")
+        if fk_table and fk_column:
+            tags.append(f"FK → {fk_table}.{fk_column}")
+
+    if tags:
+        line += f" [{' | '.join(tags)}]"
+    return line
+
+
+def format_table_for_prompt(table, columns: list[dict]) -> str:
+    """
+    테이블 하나의 프롬프트 블록(테이블명, 설명, 컬럼 목록)을 생성합니다.
+
+    Args:
+        table (Table): schema_name, name, description 속성을 가진 테이블 객체
+        columns (list): 해당 테이블의 컬럼 메타데이터 리스트
+
+    Returns:
+        str: "Table: schema.table\\nDescription: ...\\n- col (type) ..." 형식의 블록
+    """
+    schema = table.schema_name or "default"
+    lines = [f"Table: {schema}.{table.name}", f"Description: {table.description}"]
+    lines.extend(format_column_for_prompt(col) for col in columns)
+    return "\n".join(lines)
+
 
 def format_metadata_for_prompt(columns: list[dict]) -> str:
     """
@@ -25,43 +79,105 @@ def format_metadata_for_prompt(columns: list[dict]) -> str:
         str: Prompt에서 사용할 메타 정보 문자열
     """
     table_map = defaultdict(list)
-    table_description = defaultdict(str)
+    tables = {}
 
     for col in columns:
         table = col.get("table")
+        full_table_name = f"{table.schema_name or 'default'}.{table.name}"
+        table_map[full_table_name].append(col)
+        tables[full_table_name] = table
+
+    # 최종 출력 구성
+    blocks = [format_table_for_prompt(tables[name], cols) for name, cols in table_map.items()]
+    return "\n\n".join(blocks).strip()
+
+
+def truncate_description(description: str, max_chars: int) -> str:
+    """설명이 max_chars보다 길면 잘라내고 "…"을 붙입니다."""
+    if not description or len(description) <= max_chars:
+        return description
+    return description[:max_chars].rstrip() + "…"
+
+
+def column_relevance(col: dict, question_tokens: set) -> int:
+    """질문과 겹치는 토큰 수로 컬럼 관련도를 계산합니다. (컬럼명 일치는 2배)"""
+    name_hits = len(question_tokens.intersection(tokenize(col["name"])))
+    description_hits = len(question_tokens.intersection(tokenize(col.get("description"))))
+    return name_hits * 2 + description_hits
+
+
+def format_tables_within_budget(
+    tables: list, question: str, budget: int, max_description_chars: int = 200, encoding: str = "o200k_base"
+) -> tuple[str, int]:
+    """
+    토큰 예산 안에서 테이블 블록을 생성합니다.
+
+    테이블/컬럼 설명은 max_description_chars로 자르고, PK/FK 컬럼은 항상 포함합니다.
+    나머지 컬럼은 질문과의 관련도가 높은 순서(동점이면 원래 순서)로 예산이 허용하는 만큼 포함하며,
+    생략된 컬럼 수는 테이블마다 한 줄로 표시합니다. 출력 시 컬럼 순서는 원래 순서를 유지합니다.
+
+    Args:
+        tables (list): [(table, [column dict, ...]), ...]
+        question (str): 사용자 질문
+        budget (int): meta_info 최대 토큰 수
+        max_description_chars (int): 설명 최대 길이
+        encoding (str): tiktoken 인코딩 이름
+
+    Returns:
+        tuple: (meta_info 문자열, 토큰 수)
+    """
+    question_tokens = set(tokenize(question))
+    blocks = []
+    used = 0
+    candidates = []  # (관련도, 테이블 순서, 컬럼 순서, 토큰 수)
+    for table_index, (table, columns) in enumerate(tables):
         schema = table.schema_name or "default"
+        header = f"Table: {schema}.{table.name}\nDescription: {truncate_description(table.description, max_description_chars)}"
+        lines = []
+        keep = []
+        for column_index, col in enumerate(columns):
+            line = format_column_for_prompt(
+                {**col, "description": truncate_description(col.get("description"), max_description_chars)}
+            )
+            tokens = count_tokens(line, encoding) + 1  # 줄바꿈 포함
+            required = col.get("is_primary_key") or col.get("is_foreign_key")
+            lines.append(line)
+            keep.append(bool(required))
+            if required:
+                used += tokens
+            else:
+                candidates.append((-column_relevance(col, question_tokens), table_index, column_index, tokens))
+        used += count_tokens(header, encoding) + 2  # 블록 구분 빈 줄 포함
+        blocks.append((header, lines, keep))
 
-        full_table_name = f"{schema}.{table.name}"
-        col_name = col["name"]
-        dtype = col["data_type"]
-        description = col.get("description", "")
+    for _, table_index, column_index, tokens in sorted(candidates):
+        if used + tokens > budget:
+            continue
+        used += tokens
+        blocks[table_index][2][column_index] = True
 
-        # 기본 라인
-        line = f"- {col_name} ({dtype})"
-        if description:
-            line += f": {description}"
+    output = []
+    for header, lines, keep in blocks:
+        block = [header, *(line for line, kept in zip(lines, keep) if kept)]
+        omitted = keep.count(False)
+        if omitted:
+            block.append(f"- ... ({omitted} more columns omitted)")
+        output.append("\n".join(block))
 
-        # 태그 추가
-        tags = []
-        if col.get("is_primary_key"):
-            tags.append("PK")
-        if col.get("is_foreign_key"):
-            fk_table = col.get("foreign_key_table")
-            fk_column = col.get("foreign_key_column")
-            if fk_table and fk_column:
-                tags.append(f"FK → {fk_table}.{fk_column}")
+    meta_info = "\n\n".join(output)
+    return meta_info, count_tokens(meta_info, encoding)
 
-        if tags:
-            line += f" [{' | '.join(tags)}]"
 
-        table_map[full_table_name].append(line)
-        table_description[full_table_name] = f"Table: {full_table_name}\nDescription: {table.description}"
+def format_join_hints(conditions: list[str]) -> str:
+    """
+    FK 조인 조건을 meta_info 끝에 붙일 "Join Hints" 블록으로 변환합니다.
 
-    # 최종 출력 구성
-    output_lines = []
-    for full_table_name, cols in table_map.items():
-        output_lines.append(table_description[full_table_name])
-        output_lines.extend(cols)
-        output_lines.append("")
+    Args:
+        conditions (list): ["shop.order_items.order_id = shop.orders.id", ...]
 
-    return "\n".join(output_lines).strip()
+    Returns:
+        str: 조인 조건이 없으면 빈 문자열
+    """
+    if not conditions:
+        return ""
+    return "\n".join(["Join Hints:", *(f"- {condition}" for condition in conditions)])
@@ -0,0 +1,92 @@
+import json
+
+# 인덱스 없이 테이블(ALL) 또는 인덱스 전체(index)를 읽는 접근 방식
+FULL_SCAN_ACCESS_TYPES = ("ALL", "index")
+
+
+def _to_number(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _add_table(table: dict, tables: list, loops: float):
+    name = table.get("table_name")
+    if not name:
+        return
+    # MySQL: rows_examined_per_scan, MariaDB: rows
+    per_scan = _to_number(table.get("rows_examined_per_scan", table.get("rows")))
+    tables.append(
+        {
+            "table": name,
+            "access_type": table.get("access_type"),
+            "key": table.get("key"),
+            "rows_per_scan": int(per_scan),
+            "rows_examined": int(per_scan * loops),
+        }
+    )
+
+
+def _collect(node, tables: list, loops: float = 1.0):
+    if isinstance(node, list):
+        for item in node:
+            _collect(item, tables, loops)
+        return
+    if not isinstance(node, dict):
+        return
+
+    for key, value in node.items():
+        if key == "nested_loop" and isinstance(value, list):
+            # 조인 순서상 앞 테이블들의 결과 행 수만큼 다음 테이블을 반복해서 읽음
+            prefix = loops
+            for item in value:
+                _collect(item, tables, prefix)
+                produced = item.get("table", {}).get("rows_produced_per_join") if isinstance(item, dict) else None
+                if produced is not None:
+                    prefix = loops * _to_number(produced)
+        elif key == "table" and isinstance(value, dict):
+            _add_table(value, tables, loops)
+            _collect(value, tables, loops)  # 파생 테이블, 서브쿼리
+        else:
+            _collect(value, tables, loops)
+
+
+def summarize_plan(plan, full_scan_rows: int = None) -> dict:
+    """
+    EXPLAIN FORMAT=JSON 결과에서 예상 비용을 요약합니다.
+
+    Nested loop 조인은 앞 테이블의 rows_produced_per_join만큼 다음 테이블을 반복해서
+    읽는 것으로 계산하며, 서브쿼리는 한 번 실행되는 것으로 근사합니다.
+
+    Args:
+        plan (dict | str): EXPLAIN FORMAT=JSON 결과
+        full_scan_rows (int, optional): 이 행 수 이상을 전체 스캔하는 테이블만 full_scans에 포함 (0 또는 None이면 확인 안 함)
+
+    Returns:
+        dict: {
+            "query_cost": float | None,
+            "rows_examined": int,  # 전체 테이블의 예상 읽기 행 수 합계
+            "full_scans": [{"table", "access_type", "rows_per_scan", ...}],
+            "tables": [{"table", "access_type", "key", "rows_per_scan", "rows_examined"}],
+        }
+    """
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+
+    tables = []
+    _collect(plan, tables)
+
+    cost = plan.get("query_block", {}).get("cost_info", {}).get("query_cost")
+    return {
+        "query_cost": _to_number(cost) if cost is not None else None,
+        "rows_examined": sum(table["rows_examined"] for table in tables),
+        "full_scans": [
+            table
+            for table in tables
+            if full_scan_rows
+            and table["access_type"] in FULL_SCAN_ACCESS_TYPES
+            and table["rows_per_scan"] >= full_scan_rows
+        ],
+        "tables": tables,
+    }
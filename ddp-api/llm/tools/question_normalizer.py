@@ -0,0 +1,55 @@
+import hashlib
+import re
+import unicodedata
+
+# 소수점(숫자 사이의 ".")을 제외한 문장 부호/기호
+PUNCTUATION_PATTERN = re.compile(r"(?!(?<=\d)\.(?=\d))[^\w\s]")
+
+
+def _clean(text: str) -> list[str]:
+    """NFC 정규화, 소문자 변환, 문장 부호 제거 후 공백 기준 단어 목록을 반환합니다."""
+    text = unicodedata.normalize("NFC", str(text or "")).casefold()
+    return PUNCTUATION_PATTERN.sub(" ", text).split()
+
+
+def normalize_question(question: str, synonyms: dict = None) -> str:
+    """
+    같은 의미의 질문이 같은 문자열이 되도록 질문을 정규화합니다.
+
+    Unicode NFC, 소문자 변환, 문장 부호 제거, 공백 정리 후 동의어 사전을 적용합니다.
+    동의어는 단어(공백 기준) 단위로 가장 긴 표현부터 치환하며, 한글 조사는 제거하지 않습니다.
+
+    Args:
+        question (str): 사용자 질문
+        synonyms (dict, optional): {표현: 대표 표현} (예: {"top": "상위", "매출액": "매출"})
+
+    Returns:
+        str: 정규화된 질문
+    """
+    words = _clean(question)
+    phrases = {}
+    for source, target in (synonyms or {}).items():
+        source_words = tuple(_clean(source))
+        if source_words:
+            phrases[source_words] = _clean(target)
+    if not phrases:
+        return " ".join(words)
+
+    longest = max(len(source_words) for source_words in phrases)
+    normalized, position = [], 0
+    while position < len(words):
+        for size in range(min(longest, len(words) - position), 0, -1):
+            replacement = phrases.get(tuple(words[position : position + size]))
+            if replacement is not None:
+                normalized.extend(replacement)
+                position += size
+                break
+        else:
+            normalized.append(words[position])
+            position += 1
+    return " ".join(normalized)
+
+
+def question_key(normalized: str) -> str:
+    """정규화된 질문의 SHA-256 해시 (캐시 키 컬럼 값)"""
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
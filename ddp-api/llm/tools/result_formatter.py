@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from llm.tools.arrow_exporter import ArrowFormatter, ParquetFormatter
+from rest_framework.utils.encoders import JSONEncoder
+
+# MySQL 타입명(MySQLConnector.describe_columns) → 응답 타입 태그
+TYPE_TAGS = {
+    "decimal": "decimal",
+    "newdecimal": "decimal",
+    "tiny": "int",
+    "short": "int",
+    "long": "int",
+    "longlong": "int",
+    "int24": "int",
+    "year": "int",
+    "float": "float",
+    "double": "float",
+    "date": "date",
+    "newdate": "date",
+    "datetime": "datetime",
+    "timestamp": "datetime",
+    "time": "time",
+    "json": "json",
+    "bit": "bytes",
+}
+
+
+def to_json_line(record: dict) -> str:
+    """
+    레코드 하나를 NDJSON 한 줄로 직렬화합니다.
+
+    Decimal, date, datetime 등은 DRF JSONEncoder 규칙으로 변환됩니다.
+    """
+    return json.dumps(record, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+def decode_bytes(row) -> list:
+    """BINARY/BLOB/BIT 값(bytes)을 문자열로 변환합니다. UTF-8이 아닌 byte는 대체 문자로 바꿉니다."""
+    return [
+        value.decode("utf-8", errors="replace") if isinstance(value, (bytes, bytearray)) else value for value in row
+    ]
+
+
+class NDJSONFormatter:
+    """
+    쿼리 결과를 NDJSON으로 직렬화합니다.
+
+    모든 줄은 "type" 필드를 가집니다.
+        {"type": "header", "columns": [{"name": "id", "type": "long"}, ...]}
+        {"type": "row", "values": [1, "a"]}
+        {"type": "trailer", "row_count": 2, "elapsed_ms": 12.3}
+    """
+
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+    available = True
+
+    def header(self, columns: list[dict]) -> str:
+        return to_json_line({"type": "header", "columns": columns})
+
+    def rows(self, rows) -> str:
+        return "".join(to_json_line({"type": "row", "values": decode_bytes(row)}) for row in rows)
+
+    def trailer(self, **summary) -> str:
+        return to_json_line({"type": "trailer", **summary})
+
+    def error(self, message: str) -> str:
+        return to_json_line({"type": "error", "message": message})
+
+
+class CSVFormatter:
+    """
+    쿼리 결과를 CSV로 직렬화합니다.
+
+    첫 줄은 컬럼명 헤더이며, trailer와 오류는 '#'으로 시작하는 주석 줄로 기록됩니다.
+    (예: pandas.read_csv(..., comment="#"))
+    """
+
+    media_type = "text/csv"
+    extension = "csv"
+    available = True
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _flush(self) -> str:
+        value = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate(0)
+        return value
+
+    def header(self, columns: list[dict]) -> str:
+        self.writer.writerow([column["name"] for column in columns])
+        return self._flush()
+
+    def rows(self, rows) -> str:
+        self.writer.writerows(decode_bytes(row) for row in rows)
+        return self._flush()
+
+    def trailer(self, **summary) -> str:
+        return "# " + ", ".join(f"{key}={value}" for key, value in summary.items()) + "\n"
+
+    def error(self, message: str) -> str:
+        return "# error=" + message.replace("\n", " ") + "\n"
+
+
+def to_json_value(value):
+    """
+    컬럼 값을 JSON 기본 타입으로 변환합니다.
+
+    Decimal은 정밀도 손실이 없도록 문자열로, 날짜/시간은 ISO 8601 문자열로 변환합니다.
+    클라이언트는 컬럼의 타입 태그(decimal/date/datetime/time)를 보고 값을 복원합니다.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):  # MySQL TIME
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def tag_columns(columns: list[dict]) -> list[dict]:
+    """describe_columns 결과에 응답용 타입 태그를 붙입니다."""
+    return [{"name": column["name"], "type": TYPE_TAGS.get(column["type"], "string")} for column in columns]
+
+
+def to_compact_result(columns: list[dict], rows, shape: str = "columnar") -> dict:
+    """
+    튜플 커서 결과를 컬럼명이 반복되지 않는 압축 형태로 변환합니다.
+
+    Args:
+        columns (list): MySQLConnector.describe_columns 결과
+        rows (list): 튜플 행 목록
+        shape (str):
+            - "columnar": {"columns": [...], "values": [[컬럼1 값...], [컬럼2 값...]]}
+            - "tuples": {"columns": [...], "rows": [[행1 값...], [행2 값...]]}
+
+    Returns:
+        dict: 타입 태그가 포함된 columns와 값 배열
+    """
+    tagged = tag_columns(columns)
+    if shape == "columnar":
+        values = [[to_json_value(value) for value in column] for column in zip(*rows)] or [[] for _ in tagged]
+        return {"columns": tagged, "values": values}
+    return {"columns": tagged, "rows": [[to_json_value(value) for value in row] for row in rows]}
+
+
+RESULT_SHAPES = ("rows", "columnar", "tuples")
+
+RESULT_FORMATTERS = {
+    "ndjson": NDJSONFormatter,
+    "csv": CSVFormatter,
+    "arrow": ArrowFormatter,
+    "parquet": ParquetFormatter,
+}
@@ -0,0 +1,146 @@
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+ISO_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# (버킷 이름, pandas Period 빈도, 버킷 하나의 대략적인 일 수) - 기간이 MAX_BUCKETS개 이하가 되는 가장 작은 단위 사용
+TREND_BUCKETS = [("day", "D", 1), ("week", "W", 7), ("month", "M", 31), ("year", "Y", 366)]
+
+
+def _to_frame(columns: list[str], rows: list) -> pd.DataFrame:
+    """dict 행 또는 튜플/리스트 행을 컬럼 위치(0..n-1)를 라벨로 하는 DataFrame으로 변환합니다."""
+    if rows and isinstance(rows[0], dict):
+        rows = [[row.get(column) for column in columns] for row in rows]
+    return pd.DataFrame.from_records(rows, columns=range(len(columns)))
+
+
+def _column_kind(series: pd.Series) -> tuple[str, pd.Series]:
+    """
+    컬럼 값의 종류(numeric, datetime, categorical)와 해당 종류로 변환한 Series를 반환합니다.
+
+    DECIMAL은 Decimal 객체, columnar/tuples 형태에서는 문자열이므로 값 내용으로 판단합니다.
+    """
+    values = series.dropna()
+    if values.empty:
+        return "categorical", series
+    if pd.api.types.is_bool_dtype(series):
+        return "categorical", series
+    if pd.api.types.is_numeric_dtype(series):
+        return "numeric", series
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime", series
+
+    if all(isinstance(value, (date, datetime)) for value in values):
+        return "datetime", pd.to_datetime(series, errors="coerce")
+    if all(isinstance(value, (int, float, Decimal)) and not isinstance(value, bool) for value in values):
+        return "numeric", pd.to_numeric(series, errors="coerce")
+    if all(isinstance(value, str) for value in values):
+        numeric = pd.to_numeric(values, errors="coerce")
+        if not numeric.isna().any():
+            return "numeric", pd.to_numeric(series, errors="coerce")
+        if all(ISO_DATE_PATTERN.match(value) for value in values):
+            converted = pd.to_datetime(series, errors="coerce", format="ISO8601")
+            if not converted.dropna().empty:
+                return "datetime", converted
+    return "categorical", series
+
+
+def _number(value):
+    """NumPy/Decimal 값을 JSON 직렬화 가능한 int/float으로 변환합니다."""
+    if value is None or pd.isna(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 4)
+
+
+def _trend(time_series: pd.Series, numeric: dict, max_buckets: int) -> dict:
+    """시간 컬럼 기준 버킷별 행 수와 숫자 컬럼 합계를 계산합니다. 최근 max_buckets개 버킷만 반환합니다."""
+    span_days = (time_series.max() - time_series.min()).days + 1
+    name, freq = next(
+        ((name, freq) for name, freq, days in TREND_BUCKETS if span_days / days <= max_buckets),
+        TREND_BUCKETS[-1][:2],
+    )
+    frame = pd.DataFrame({"__bucket__": time_series.dt.to_period(freq), **numeric}).dropna(subset=["__bucket__"])
+    grouped = frame.groupby("__bucket__", sort=True)
+    counts = grouped.size()
+    sums = grouped[list(numeric)].sum() if numeric else None
+
+    series = []
+    for bucket in counts.index[-max_buckets:]:
+        point = {"bucket": str(bucket), "count": int(counts[bucket])}
+        for column in numeric:
+            point[f"{column}_sum"] = _number(sums.at[bucket, column])
+        series.append(point)
+    return {"bucket": name, "series": series}
+
+
+def profile_result(
+    columns: list[str],
+    rows: list,
+    top_k: int = 5,
+    sample_rows: int = 10,
+    max_buckets: int = 24,
+    max_trend_columns: int = 3,
+) -> dict:
+    """
+    쿼리 결과를 행 수와 관계없이 크기가 일정한 통계 요약으로 변환합니다.
+
+    - 숫자 컬럼: min/max/mean/sum, null 수
+    - 문자열/범주 컬럼: 고유값 수, 빈도 상위 top_k개 값
+    - 날짜/시간 컬럼: 최소/최대 시각. 첫 날짜 컬럼 기준으로 버킷(day/week/month/year)별 행 수와
+      숫자 컬럼(최대 max_trend_columns개) 합계 추이
+    - 표본 행: 처음과 끝을 포함해 균등한 간격으로 고른 최대 sample_rows개 행 (행 수가 적으면 전체)
+
+    Args:
+        columns (list): 컬럼명 목록
+        rows (list): dict 행 또는 튜플/리스트 행
+        top_k (int): 범주 컬럼별 빈도 상위 값 개수
+        sample_rows (int): 표본 행 수
+        max_buckets (int): 추이 버킷 최대 개수
+        max_trend_columns (int): 추이에 합계를 포함할 숫자 컬럼 수
+
+    Returns:
+        dict: {"row_count", "columns": {컬럼명: 통계}, "trend": {...} 또는 None, "sample": [...]}
+    """
+    frame = _to_frame(columns, rows)
+    profile = {"row_count": len(frame), "columns": {}, "trend": None, "sample": []}
+    numeric, time_column = {}, None
+
+    for position, name in enumerate(columns):
+        kind, series = _column_kind(frame[position])
+        stats = {"type": kind, "nulls": int(series.isna().sum())}
+        values = series.dropna()
+        if kind == "numeric" and not values.empty:
+            stats.update(
+                min=_number(values.min()),
+                max=_number(values.max()),
+                mean=_number(values.mean()),
+                sum=_number(values.sum()),
+            )
+            if len(numeric) < max_trend_columns:
+                numeric[name] = series
+        elif kind == "datetime" and not values.empty:
+            stats.update(min=values.min().isoformat(), max=values.max().isoformat())
+            if time_column is None:
+                time_column = (name, series)
+        elif kind == "categorical":
+            counts = values.astype(str).value_counts()
+            stats.update(
+                distinct=int(len(counts)), top=[[value, int(count)] for value, count in counts.head(top_k).items()]
+            )
+        profile["columns"][name] = stats
+
+    if time_column is not None:
+        name, series = time_column
+        profile["trend"] = {"time_column": name, **_trend(series, numeric, max_buckets)}
+
+    if len(frame):
+        positions = np.unique(np.linspace(0, len(frame) - 1, min(sample_rows, len(frame))).round().astype(int))
+        profile["sample"] = [
+            rows[index] if isinstance(rows[index], dict) else dict(zip(columns, rows[index])) for index in positions
+        ]
+    return profile
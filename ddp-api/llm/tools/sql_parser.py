@@ -0,0 +1,146 @@
+import sqlparse
+from sqlparse.sql import Identifier, IdentifierList, Parenthesis
+from sqlparse.tokens import DML, Keyword, Name, Punctuation
+
+# 결과가 매 실행마다 달라지는 함수 (결과 캐시 대상에서 제외) - 괄호와 함께 호출할 때만 함수
+NON_DETERMINISTIC_FUNCTIONS = {
+    "RAND",
+    "UUID",
+    "UUID_SHORT",
+    "SLEEP",
+    "CONNECTION_ID",
+    "NOW",
+    "CURDATE",
+    "CURTIME",
+    "SYSDATE",
+    "UNIX_TIMESTAMP",
+    "USER",
+}
+# 괄호 없이도 현재 시각/사용자를 반환하는 함수
+NON_DETERMINISTIC_KEYWORDS = {
+    "CURRENT_DATE",
+    "CURRENT_TIME",
+    "CURRENT_TIMESTAMP",
+    "LOCALTIME",
+    "LOCALTIMESTAMP",
+    "UTC_DATE",
+    "UTC_TIME",
+    "UTC_TIMESTAMP",
+    "CURRENT_USER",
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    SQL을 캐시 키 비교용으로 정규화합니다.
+
+    주석 제거, 키워드 대문자화, 문자열 리터럴 밖의 공백 축약, 마지막 세미콜론 제거를 수행합니다.
+    문자열 리터럴과 식별자의 대소문자는 그대로 유지합니다.
+
+    Args:
+        sql (str): 원본 SQL
+
+    Returns:
+        str: 정규화된 SQL
+    """
+    formatted = sqlparse.format(sql, keyword_case="upper", strip_comments=True, strip_whitespace=True)
+    parts = []
+    for statement in sqlparse.parse(formatted):
+        for token in statement.flatten():
+            if token.is_whitespace:
+                if parts and parts[-1] != " ":
+                    parts.append(" ")
+            else:
+                parts.append(token.value)
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def is_read_only(sql: str) -> bool:
+    """단일 SELECT(WITH ... SELECT 포함) 문인지 확인합니다."""
+    statements = [statement for statement in sqlparse.parse(sql) if statement.token_first(skip_cm=True)]
+    return len(statements) == 1 and statements[0].get_type() == "SELECT"
+
+
+def is_deterministic(sql: str) -> bool:
+    """
+    RAND(), NOW(), CURRENT_DATE 처럼 실행할 때마다 결과가 달라지는 함수가 없는지 확인합니다.
+
+    sqlparse 토큰 단위로 비교하므로 문자열 리터럴, 백틱 식별자, 테이블.컬럼 형태의 같은 이름은 무시합니다.
+    """
+    for statement in sqlparse.parse(sql):
+        tokens = [token for token in statement.flatten() if not token.is_whitespace]
+        for index, token in enumerate(tokens):
+            if not (token.ttype in Name or token.ttype in Keyword) or token.value.startswith("`"):
+                continue
+            if index and tokens[index - 1].match(Punctuation, "."):
+                continue
+            name = token.value.upper()
+            is_call = index + 1 < len(tokens) and tokens[index + 1].match(Punctuation, "(")
+            if name in NON_DETERMINISTIC_KEYWORDS or (is_call and name in NON_DETERMINISTIC_FUNCTIONS):
+                return False
+    return True
+
+
+def extract_tables(sql: str) -> list[tuple]:
+    """
+    SQL이 참조하는 테이블 목록을 추출합니다. (FROM/JOIN 절, 서브쿼리 포함)
+
+    Args:
+        sql (str): SQL 문
+
+    Returns:
+        list: [(schema_name 또는 None, table_name), ...] (정렬, 중복 제거)
+    """
+    tables = set()
+    ctes = set()
+    for statement in sqlparse.parse(sql):
+        _collect_tables(statement.tokens, tables, ctes)
+    return sorted(
+        ((schema, name) for schema, name in tables if schema or name not in ctes), key=lambda t: (t[0] or "", t[1])
+    )
+
+
+def _collect_tables(tokens, tables: set, ctes: set):
+    expect_table = False
+    for token in tokens:
+        if token.is_whitespace or token.ttype in (sqlparse.tokens.Comment, sqlparse.tokens.Punctuation):
+            continue
+
+        if expect_table:
+            identifiers = token.get_identifiers() if isinstance(token, IdentifierList) else [token]
+            for identifier in identifiers:
+                _add_table(identifier, tables, ctes)
+            expect_table = False
+            continue
+
+        if token.ttype is Keyword.CTE:
+            continue
+        if token.ttype is Keyword and (token.normalized == "FROM" or token.normalized.endswith("JOIN")):
+            expect_table = True
+        elif token.ttype is DML:
+            expect_table = False
+        elif token.is_group:
+            # WITH 절의 CTE 이름은 실제 테이블이 아니므로 기록해 둠
+            if isinstance(token, (Identifier, IdentifierList)):
+                for identifier in token.get_identifiers() if isinstance(token, IdentifierList) else [token]:
+                    if isinstance(identifier, Identifier) and any(
+                        isinstance(t, Parenthesis) for t in identifier.tokens
+                    ):
+                        ctes.add(identifier.get_real_name())
+            _collect_tables(token.tokens, tables, ctes)
+
+
+def _add_table(token, tables: set, ctes: set):
+    if isinstance(token, Parenthesis):
+        _collect_tables(token.tokens, tables, ctes)
+        return
+    if not isinstance(token, Identifier):
+        return
+    subqueries = [t for t in token.tokens if isinstance(t, Parenthesis)]
+    if subqueries:
+        for subquery in subqueries:
+            _collect_tables(subquery.tokens, tables, ctes)
+        return
+    name = token.get_real_name()
+    if name:
+        tables.add((token.get_parent_name(), name))
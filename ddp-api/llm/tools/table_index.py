@@ -0,0 +1,167 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# 테이블 문서에서 필드별 가중치 (토큰 반복 횟수)
+FIELD_WEIGHTS = {
+    "table_name": 3,
+    "table_description": 2,
+    "column_name": 1,
+    "column_description": 1,
+}
+
+WORD_PATTERN = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+CAMEL_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    검색용 토큰 목록을 생성합니다.
+
+    영문/숫자는 snake_case, camelCase를 단어로 나누고 소문자 + 단순 복수형 제거를 적용합니다.
+    한글은 형태소 분석 없이 조사가 붙어도 매칭되도록 단어 전체와 글자 bigram을 함께 사용합니다.
+
+    Args:
+        text (str): 테이블/컬럼 이름, 설명 또는 사용자 질문
+
+    Returns:
+        list[str]: 토큰 목록 (중복 포함)
+    """
+    if not text:
+        return []
+    tokens = []
+    for word in WORD_PATTERN.findall(CAMEL_PATTERN.sub(r"\1 \2", str(text))):
+        if HANGUL_PATTERN.fullmatch(word):
+            tokens.append(word)
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+            continue
+        word = word.lower()
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def table_document(table, columns: list[dict]) -> Counter:
+    """
+    테이블 하나의 검색 문서(토큰별 가중 빈도)를 생성합니다.
+
+    Args:
+        table (Table): schema_name, name, description 속성을 가진 테이블 객체
+        columns (list): [{"name", "description", ...}, ...]
+
+    Returns:
+        Counter: {token: weighted term frequency}
+    """
+    document = Counter()
+    for token in tokenize(table.name):
+        document[token] += FIELD_WEIGHTS["table_name"]
+    for token in tokenize(table.description):
+        document[token] += FIELD_WEIGHTS["table_description"]
+    for column in columns:
+        for token in tokenize(column["name"]):
+            document[token] += FIELD_WEIGHTS["column_name"]
+        for token in tokenize(column.get("description")):
+            document[token] += FIELD_WEIGHTS["column_description"]
+    return document
+
+
+class TableIndex:
+    """
+    테이블 문서에 대한 BM25 역색인입니다.
+
+    토큰별 posting(문서 위치, 빈도)을 NumPy 배열로 보관하므로 질의 비용은 질문에 포함된
+    토큰의 posting 길이에만 비례합니다.
+    """
+
+    def __init__(self, documents: dict, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            documents (dict): {table_id: Counter} (table_document 결과)
+            k1 (float): BM25 빈도 포화 계수
+            b (float): BM25 문서 길이 정규화 계수
+        """
+        self.table_ids = np.array(list(documents.keys()), dtype=np.int64)
+        lengths = np.array([sum(document.values()) for document in documents.values()], dtype=np.float32)
+        average = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        # 문서 길이 정규화 항 k1 * (1 - b + b * |d| / avgdl)
+        self._norm = k1 * (1 - b + b * lengths / average)
+        self._k1 = k1
+
+        postings = {}
+        for position, document in enumerate(documents.values()):
+            for token, frequency in document.items():
+                postings.setdefault(token, ([], []))
+                postings[token][0].append(position)
+                postings[token][1].append(frequency)
+
+        count = len(documents)
+        self._postings = {}
+        for token, (positions, frequencies) in postings.items():
+            idf = math.log(1 + (count - len(positions) + 0.5) / (len(positions) + 0.5))
+            self._postings[token] = (
+                np.array(positions, dtype=np.int32),
+                np.array(frequencies, dtype=np.float32),
+                idf,
+            )
+
+    def __len__(self):
+        return len(self.table_ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """질문에 대한 테이블별 BM25 점수를 table_ids 순서로 반환합니다."""
+        scores = np.zeros(len(self.table_ids), dtype=np.float32)
+        for token, weight in Counter(tokenize(query)).items():
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            positions, frequencies, idf = posting
+            norm = self._norm[positions]
+            np.add.at(scores, positions, weight * idf * frequencies * (self._k1 + 1) / (frequencies + norm))
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[tuple[int, float]]:
+        """
+        점수가 높은 순서로 상위 top_k개 테이블을 반환합니다. 동점이면 테이블 ID 순서입니다.
+
+        Args:
+            query (str): 사용자 질문
+            top_k (int): 반환할 최대 테이블 수
+
+        Returns:
+            list[tuple[int, float]]: [(table_id, score), ...]
+        """
+        scores = self.scores(query)
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        # 점수 내림차순, 동점은 table_id 오름차순
+        order = np.lexsort((self.table_ids, -scores))[:top_k]
+        return [(int(self.table_ids[i]), float(scores[i])) for i in order]
+
+
+def decisive_tables(hits: list[tuple[int, float]], max_tables: int, ratio: float) -> list[int]:
+    """
+    상위 점수와 나머지 점수의 차이가 충분히 크면 해당 테이블만 반환합니다.
+
+    상위 m개(m <= max_tables)의 최저 점수가 m+1번째 점수의 ratio배 이상인 가장 작은 m을 찾습니다.
+    m+1번째 점수가 0이면 질문과 겹치는 단어가 너무 적은 것으로 보고 판단하지 않습니다.
+
+    Args:
+        hits (list): TableIndex.search 결과
+        max_tables (int): 선택기 없이 바로 사용할 최대 테이블 수
+        ratio (float): 점수 차이 배수
+
+    Returns:
+        list[int]: 결정적인 테이블 ID 목록. 없으면 빈 리스트
+    """
+    for m in range(1, min(max_tables, len(hits) - 1) + 1):
+        next_score = hits[m][1]
+        if next_score <= 0:
+            break
+        if hits[m - 1][1] >= ratio * next_score:
+            return [table_id for table_id, _ in hits[:m]]
+    return []
@@ -0,0 +1,48 @@
+import logging
+import math
+from functools import lru_cache
+
+import tiktoken
+
+
+@lru_cache(maxsize=8)
+def get_encoding(name: str):
+    """
+    tiktoken 인코딩을 로드합니다. BPE 파일을 받을 수 없는 환경에서는 None을 반환합니다.
+
+    Args:
+        name (str): 인코딩 이름 (예: "o200k_base")
+
+    Returns:
+        tiktoken.Encoding: 인코딩 객체 또는 None
+    """
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logging.warning(f"tiktoken 인코딩({name}) 로드 실패, 근사치로 토큰 수를 계산합니다: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """ASCII 4글자당 1토큰, 그 외(한글 등) 1글자당 1토큰으로 토큰 수를 보수적으로 근사합니다."""
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def count_tokens(text: str, encoding: str = "o200k_base") -> int:
+    """
+    문자열의 토큰 수를 로컬에서 계산합니다.
+
+    Args:
+        text (str): 토큰 수를 계산할 문자열
+        encoding (str): tiktoken 인코딩 이름
+
+    Returns:
+        int: 토큰 수
+    """
+    if not text:
+        return 0
+    encoder = get_encoding(encoding)
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode(text, disallowed_special=()))
@@ -1,8 +1,37 @@
 from django.urls import path
-from llm.views.query_execution_view import QueryExecutionView
-from llm.views.sql_generation_view import SQLGenerationView
+from llm.views.query_execution_view import (
+    AsyncQueryExecutionView,
+    QueryExecutionView,
+    QueryExplainView,
+)
+from llm.views.query_job_view import (
+    QueryJobDetailView,
+    QueryJobResultView,
+    QueryJobView,
+)
+from llm.views.sql_generation_view import (
+    AsyncSQLGenerationView,
+    SQLGenerationStreamView,
+    SQLGenerationView,
+)
 
 urlpatterns = [
     path("generate-sql/db/<int:database_id>/", SQLGenerationView.as_view(), name="generate-sql"),
+    path(
+        "generate-sql/db/<int:database_id>/stream/",
+        SQLGenerationStreamView.as_view(),
+        name="generate-sql-stream",
+    ),
     path("execute-sql/db/<int:database_id>/<str:session_id>", QueryExecutionView.as_view(), name="execute-sql"),
+    path("execute-sql/db/<int:database_id>/<str:session_id>/explain/", QueryExplainView.as_view(), name="explain-sql"),
+    path("execute-sql/db/<int:database_id>/<str:session_id>/job/", QueryJobView.as_view(), name="query-job"),
+    # 비동기 뷰 (ASGI 서버에서 스레드를 점유하지 않고 LLM 응답 대기)
+    path("async/generate-sql/db/<int:database_id>/", AsyncSQLGenerationView.as_view(), name="async-generate-sql"),
+    path(
+        "async/execute-sql/db/<int:database_id>/<str:session_id>",
+        AsyncQueryExecutionView.as_view(),
+        name="async-execute-sql",
+    ),
+    path("job/<str:job_id>/", QueryJobDetailView.as_view(), name="query-job-detail"),
+    path("job/<str:job_id>/result/", QueryJobResultView.as_view(), name="query-job-result"),
 ]
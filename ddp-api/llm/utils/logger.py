@@ -2,7 +2,35 @@ from langchain_core.messages.ai import AIMessage
 from llm.models import LLMLog
 
 
-def save_llm_log(question: str, ai_response: AIMessage, agent="default") -> None:
+def _llm_log_fields(question: str, ai_response: AIMessage, agent: str, meta_tokens: int = None) -> dict:
+    """LLM 응답 객체(AIMessage)에서 LLMLog 필드 값을 추출합니다."""
+    content = ai_response.content
+    if "```json" in content:
+        content = content.split("```json")[1].strip()
+        content = content.split("```")[0].strip()
+    metadata = ai_response.response_metadata or {}
+
+    token_usage = metadata.get("token_usage", {})
+    # 스트리밍 응답은 response_metadata 대신 usage_metadata에 사용량이 담김
+    usage = getattr(ai_response, "usage_metadata", None) or {}
+    prompt_tokens = token_usage.get("prompt_tokens", usage.get("input_tokens", 0))
+    completion_tokens = token_usage.get("completion_tokens", usage.get("output_tokens", 0))
+    total_tokens = token_usage.get("total_tokens", usage.get("total_tokens", 0))
+
+    return {
+        "id": ai_response.id,
+        "question": question,
+        "response_content": content,
+        "model_name": metadata.get("model_name", ""),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": total_tokens,
+        "agent": agent,
+        "meta_tokens": meta_tokens,
+    }
+
+
+def save_llm_log(question: str, ai_response: AIMessage, agent="default", meta_tokens: int = None) -> None:
     """
     LLM 응답 객체(AIMessage)를 LLMLog 모델로 저장합니다.
 
@@ -10,27 +38,11 @@ def save_llm_log(question: str, ai_response: AIMessage, agent="default") -> None
         question (str): 사용자 질문
         ai_response (AIMessage): LangChain의 LLM 응답 객체
         agent (str): LLM 호출 에이전트 이름
+        meta_tokens (int, optional): 프롬프트에 포함된 meta_info 토큰 수
     """
-    content = ai_response.content
-    if "```json" in content:
-        content = content.split("```json")[1].strip()
-        content = content.split("```")[0].strip()
-    metadata = ai_response.response_metadata or {}
+    return LLMLog.objects.create(**_llm_log_fields(question, ai_response, agent, meta_tokens))
 
-    token_usage = metadata.get("token_usage", {})
-    prompt_tokens = token_usage.get("prompt_tokens", 0)
-    completion_tokens = token_usage.get("completion_tokens", 0)
-    total_tokens = token_usage.get("total_tokens", 0)
-
-    log = LLMLog.objects.create(
-        id=ai_response.id,
-        question=question,
-        response_content=content,
-        model_name=metadata.get("model_name", ""),
-        prompt_tokens=prompt_tokens,
-        completion_tokens=completion_tokens,
-        total_tokens=total_tokens,
-        agent=agent,
-    )
-
-    return log
+
+async def asave_llm_log(question: str, ai_response: AIMessage, agent="default", meta_tokens: int = None) -> LLMLog:
+    """save_llm_log의 비동기 버전입니다. (async ORM 사용)"""
+    return await LLMLog.objects.acreate(**_llm_log_fields(question, ai_response, agent, meta_tokens))
@@ -0,0 +1,15 @@
+import json
+
+
+def format_sse(event: str, data) -> str:
+    """
+    Server-Sent Events 메시지 하나를 생성합니다.
+
+    Args:
+        event (str): 이벤트 이름 (stage, token, result, error)
+        data: JSON으로 직렬화할 데이터
+
+    Returns:
+        str: event/data 줄과 빈 줄로 끝나는 SSE 메시지
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -1,19 +1,97 @@
+import MySQLdb
+from app.renderers import (
+    ArrowStreamRenderer,
+    CSVRenderer,
+    CustomJSONRenderer,
+    NDJSONRenderer,
+    ParquetRenderer,
+    envelope_response,
+)
+from app.streaming import streaming_response
 from ddp.models import Database
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from llm.services.query_service import execute_query
+from llm.services.preflight_service import PreflightRejected
+from llm.services.query_service import (
+    aexecute_query,
+    estimate_session_query,
+    execute_query,
+    get_session_query,
+    iter_query_export,
+)
+from llm.tools.result_formatter import RESULT_FORMATTERS, RESULT_SHAPES
 from rest_framework import status
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+def parse_execution_options(params) -> dict:
+    """
+    execute-sql 쿼리 파라미터를 execute_query 인자로 변환합니다.
+
+    Args:
+        params (QueryDict): 요청 쿼리 파라미터
+
+    Returns:
+        dict: {"summarize", "mode", "shape", "use_cache", "preflight", "confirmed"}
+
+    Raises:
+        ValueError: 지원하지 않는 mode/shape인 경우
+    """
+    mode = params.get("mode", "buffered").lower()
+    if mode not in ("buffered", "stream"):
+        raise ValueError(f"Unsupported mode: {mode}")
+    shape = params.get("shape", "rows").lower()
+    if shape not in RESULT_SHAPES:
+        raise ValueError(f"Unsupported shape: {shape}")
+    preflight = params.get("preflight")
+    return {
+        "summarize": params.get("summarize", "false").lower() == "true",
+        "mode": mode,
+        "shape": shape,
+        "use_cache": params.get("cache", "true").lower() != "false",
+        "preflight": preflight.lower() == "true" if preflight else None,
+        "confirmed": params.get("confirm", "false").lower() == "true",
+    }
+
+
+def prepend_chunk(first, chunks):
+    """미리 생성한 첫 조각을 앞에 붙여 나머지 조각을 이어서 생성합니다. (닫히면 원본 제너레이터도 닫음)"""
+    try:
+        if first is not None:
+            yield first
+        yield from chunks
+    finally:
+        chunks.close()
+
+
+def execution_status(result: dict) -> int:
+    """execute_query 결과에 해당하는 HTTP 응답 코드를 반환합니다."""
+    if result.get("status") == "CONFIRMATION_REQUIRED":
+        return status.HTTP_409_CONFLICT
+    if result.get("status") == "REJECTED":
+        return status.HTTP_422_UNPROCESSABLE_ENTITY
+    if result.get("status") == "TIMEOUT":
+        return status.HTTP_504_GATEWAY_TIMEOUT
+    if "error" in result:
+        return status.HTTP_500_INTERNAL_SERVER_ERROR
+    return status.HTTP_200_OK
+
+
 class QueryExecutionView(APIView):
     """
     Query Execution API
 
     이 API는 주어진 데이터베이스에서 SQL 쿼리를 실행하고 결과를 반환합니다.
+    format=ndjson|csv|arrow|parquet를 지정하면 결과를 커서에서 읽는 즉시 스트리밍합니다.
     """
 
+    renderer_classes = [CustomJSONRenderer, NDJSONRenderer, CSVRenderer, ArrowStreamRenderer, ParquetRenderer]
+
     @swagger_auto_schema(
         operation_description="SQL 쿼리 실행 API",
         manual_parameters=[
@@ -24,6 +102,57 @@ class QueryExecutionView(APIView):
                 type=openapi.TYPE_STRING,
                 default="false",
             ),
+            openapi.Parameter(
+                "mode",
+                openapi.IN_QUERY,
+                description="실행 방식 (buffered: 전체 조회, stream: 서버 사이드 커서로 행/용량 상한까지만 조회)",
+                type=openapi.TYPE_STRING,
+                enum=["buffered", "stream"],
+                default="buffered",
+            ),
+            openapi.Parameter(
+                "cache",
+                openapi.IN_QUERY,
+                description="결과 캐시 사용 여부 (true/false). 참조 테이블이 변경되면 캐시는 자동으로 무효화됩니다.",
+                type=openapi.TYPE_STRING,
+                default="true",
+            ),
+            openapi.Parameter(
+                "preflight",
+                openapi.IN_QUERY,
+                description="실행 전 EXPLAIN 예상 비용 확인 여부 (true/false, 기본값: 서버 설정)",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "confirm",
+                openapi.IN_QUERY,
+                description="예상 비용 임계값 초과(CONFIRMATION_REQUIRED)를 확인하고 실행 (true/false)",
+                type=openapi.TYPE_STRING,
+                default="false",
+            ),
+            openapi.Parameter(
+                "shape",
+                openapi.IN_QUERY,
+                description=(
+                    "결과 형태 (rows: 행별 dict, columnar: columns(타입 태그) + 컬럼별 값 배열 values, "
+                    "tuples: columns(타입 태그) + 행별 값 배열 rows). decimal/date/datetime 값은 문자열로 전달됩니다."
+                ),
+                type=openapi.TYPE_STRING,
+                enum=["rows", "columnar", "tuples"],
+                default="rows",
+            ),
+            openapi.Parameter(
+                "format",
+                openapi.IN_QUERY,
+                description=(
+                    "응답 형식 (json: 기본 응답, ndjson/csv: 헤더 → 행 → trailer(row_count, elapsed_ms) 순서의 "
+                    "스트리밍 응답. csv의 trailer는 '#' 주석 줄, arrow: Arrow IPC stream, parquet: Parquet 파일. "
+                    "arrow/parquet은 pyarrow 설치 필요: poetry install --extras arrow)"
+                ),
+                type=openapi.TYPE_STRING,
+                enum=["json", "ndjson", "csv", "arrow", "parquet"],
+                default="json",
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -45,6 +174,20 @@ class QueryExecutionView(APIView):
                 description="데이터베이스를 찾을 수 없음",
                 examples={"application/json": {"error": "Database not found"}},
             ),
+            409: openapi.Response(
+                description="예상 비용 임계값 초과로 확인 필요 (confirm=true로 다시 요청)",
+                examples={"application/json": {"error": "...", "status": "CONFIRMATION_REQUIRED", "estimate": {}}},
+            ),
+            422: openapi.Response(
+                description="예상 비용 임계값 초과로 실행 거부",
+                examples={"application/json": {"error": "...", "status": "REJECTED", "estimate": {}}},
+            ),
+            504: openapi.Response(
+                description="실행 프로파일의 시간 제한 초과",
+                examples={
+                    "application/json": {"error": "Query exceeded the execution time limit", "status": "TIMEOUT"}
+                },
+            ),
         },
     )
     def post(self, request, database_id: int, session_id: int):
@@ -59,15 +202,143 @@ class QueryExecutionView(APIView):
         Returns:
             Response: 실행 결과 또는 오류 메시지
         """
-        summarize = request.query_params.get("summarize", "false").lower() == "true"
+        try:
+            options = parse_execution_options(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            db = Database.objects.get(pk=database_id)
+        except Database.DoesNotExist:
+            return Response({"error": "Database not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        fmt = request.query_params.get("format", "json").lower()
+        if fmt in RESULT_FORMATTERS:
+            return self.stream(
+                request, db, session_id, fmt, preflight=options["preflight"], confirmed=options["confirmed"]
+            )
+
+        result = execute_query(database=db, session_id=session_id, **options)
+        return Response(result, status=execution_status(result))
+
+    def stream(
+        self, request: Request, db: Database, session_id: str, fmt: str, preflight: bool = None, confirmed: bool = False
+    ):
+        """
+        쿼리 결과를 NDJSON/CSV 형식의 StreamingHttpResponse로 반환합니다.
+
+        EXPLAIN 예상 비용 확인은 첫 조각(헤더)을 만들기 전에 끝나므로, 먼저 첫 조각을 생성해
+        임계값을 넘으면 JSON 응답과 같은 409/422 응답을 반환합니다.
 
+        Args:
+            request (Request): HTTP 요청 객체 (ASGI이면 조각마다 스레드에서 생성)
+            db (Database): 실행할 데이터베이스
+            session_id (str): LLM 실행 세션 ID
+            fmt (str): "ndjson", "csv", "arrow", "parquet" 중 하나
+            preflight (bool, optional): EXPLAIN 비용 사전 확인 여부
+            confirmed (bool): 예상 비용 초과를 확인하고 실행을 승인했는지 여부
+
+        Returns:
+            StreamingHttpResponse: 행 단위 스트리밍 응답
+        """
+        formatter = RESULT_FORMATTERS[fmt]
+        if not formatter.available:
+            return Response(
+                {"error": f"'{fmt}' format requires pyarrow (poetry install --extras arrow)."},
+                status=status.HTTP_406_NOT_ACCEPTABLE,
+            )
+
+        try:
+            query, _ = get_session_query(session_id)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        chunks = iter_query_export(db, query, session_id=session_id, fmt=fmt, preflight=preflight, confirmed=confirmed)
+        try:
+            first = next(chunks, None)
+        except PreflightRejected as e:
+            result = {"error": str(e), "status": e.status, "estimate": e.estimate}
+            return Response(result, status=execution_status(result))
+
+        content_type = formatter.media_type
+        if content_type.startswith("text/") or content_type.endswith("ndjson"):
+            content_type += "; charset=utf-8"
+        response = streaming_response(request, prepend_chunk(first, chunks), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="result-{session_id}.{formatter.extension}"'
+        response["X-Accel-Buffering"] = "no"  # NGINX 응답 버퍼링 비활성화
+        return response
+
+
+class QueryExplainView(APIView):
+    """
+    Query Dry-run API
+
+    세션에 저장된 SQL을 실행하지 않고 EXPLAIN FORMAT=JSON 예상 비용을 반환합니다.
+    """
+
+    http_method_names = ["get"]
+
+    @swagger_auto_schema(
+        operation_description="SQL 쿼리 예상 비용 조회 (실행하지 않음)",
+        responses={
+            200: openapi.Response(
+                description="조회 성공",
+                examples={
+                    "application/json": {
+                        "query": "SELECT ...",
+                        "query_cost": 1520.4,
+                        "rows_examined": 2400000,
+                        "full_scans": [{"table": "orders", "access_type": "ALL", "rows_per_scan": 2400000}],
+                        "reasons": ["full scan on orders (2400000 rows)"],
+                        "action": "confirm",
+                    }
+                },
+            ),
+            400: openapi.Response(
+                description="잘못된 요청 또는 EXPLAIN 실패",
+                examples={"application/json": {"error": "No query provided"}},
+            ),
+            404: openapi.Response(
+                description="데이터베이스를 찾을 수 없음",
+                examples={"application/json": {"error": "Database not found"}},
+            ),
+        },
+    )
+    def get(self, request, database_id: int, session_id: str):
         try:
             db = Database.objects.get(pk=database_id)
         except Database.DoesNotExist:
             return Response({"error": "Database not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        result = execute_query(database=db, session_id=session_id, summarize=summarize)
+        try:
+            return Response(estimate_session_query(db, session_id), status=status.HTTP_200_OK)
+        except (ValueError, MySQLdb.Error) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncQueryExecutionView(View):
+    """
+    Query Execution API (async)
+
+    QueryExecutionView의 JSON 응답과 같은 결과를 반환하는 비동기 뷰입니다.
+    쿼리 실행은 스레드 풀에서, 결과 요약 LLM 호출은 ainvoke로 기다립니다.
+    동시 처리량 이점은 ASGI 서버(app.asgi)로 실행할 때 얻을 수 있습니다.
+    스트리밍 형식(format=ndjson|csv|arrow|parquet)은 QueryExecutionView를 사용합니다.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request, database_id: int, session_id: str):
+        try:
+            options = parse_execution_options(request.GET)
+        except ValueError as e:
+            return envelope_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+        try:
+            db = await Database.objects.aget(pk=database_id)
+        except Database.DoesNotExist:
+            return envelope_response({"error": "Database not found"}, status.HTTP_404_NOT_FOUND)
 
-        if "error" in result:
-            return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        return Response(result, status=status.HTTP_200_OK)
+        result = await aexecute_query(db, session_id=session_id, **options)
+        return envelope_response(result, execution_status(result))
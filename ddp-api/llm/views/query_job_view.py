@@ -0,0 +1,190 @@
+import json
+
+from ddp.models import Database
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from llm.models import QueryJob
+from llm.services.job_service import cancel_job, get_job, serialize_job, submit_job
+from llm.views.query_execution_view import parse_execution_options
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class QueryJobView(APIView):
+    """
+    Query Job 등록 API
+
+    쿼리를 백그라운드 워커에서 실행하도록 등록하고 작업 ID를 바로 반환합니다.
+    """
+
+    http_method_names = ["post"]
+
+    @swagger_auto_schema(
+        operation_description="SQL 쿼리 비동기 실행 작업 등록 API",
+        manual_parameters=[
+            openapi.Parameter(
+                "summarize",
+                openapi.IN_QUERY,
+                description="결과 요약 여부 (true/false)",
+                type=openapi.TYPE_STRING,
+                default="false",
+            ),
+            openapi.Parameter(
+                "mode",
+                openapi.IN_QUERY,
+                description="실행 방식 (buffered: 전체 조회, stream: 서버 사이드 커서로 행/용량 상한까지만 조회)",
+                type=openapi.TYPE_STRING,
+                enum=["buffered", "stream"],
+                default="buffered",
+            ),
+            openapi.Parameter(
+                "cache",
+                openapi.IN_QUERY,
+                description="결과 캐시 사용 여부 (true/false)",
+                type=openapi.TYPE_STRING,
+                default="true",
+            ),
+            openapi.Parameter(
+                "preflight",
+                openapi.IN_QUERY,
+                description="실행 전 EXPLAIN 예상 비용 확인 여부 (true/false, 기본값: 서버 설정)",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "confirm",
+                openapi.IN_QUERY,
+                description="예상 비용 임계값 초과를 확인하고 실행 (true/false). 없으면 초과 시 작업이 failed로 종료",
+                type=openapi.TYPE_STRING,
+                default="false",
+            ),
+            openapi.Parameter(
+                "shape",
+                openapi.IN_QUERY,
+                description="결과 형태 (rows, columnar, tuples)",
+                type=openapi.TYPE_STRING,
+                enum=["rows", "columnar", "tuples"],
+                default="rows",
+            ),
+        ],
+        responses={
+            202: openapi.Response(
+                description="작업 등록 성공",
+                examples={"application/json": {"job_id": "...", "status": "pending"}},
+            ),
+            404: openapi.Response(
+                description="데이터베이스를 찾을 수 없음",
+                examples={"application/json": {"error": "Database not found"}},
+            ),
+            503: openapi.Response(
+                description="작업 대기열이 가득 참",
+                examples={"application/json": {"error": "Too many query jobs are queued. Please retry later."}},
+            ),
+        },
+    )
+    def post(self, request, database_id: int, session_id: str):
+        """
+        쿼리 실행 작업을 등록합니다.
+
+        Args:
+            request (Request): HTTP 요청 객체
+            database_id (int): 실행할 데이터베이스의 ID
+            session_id (str): LLM 실행 세션 ID
+
+        Returns:
+            Response: 작업 ID와 상태
+        """
+        try:
+            options = parse_execution_options(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            db = Database.objects.get(pk=database_id)
+        except Database.DoesNotExist:
+            return Response({"error": "Database not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            job = submit_job(db, session_id, **options)
+        except RuntimeError as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(serialize_job(job), status=status.HTTP_202_ACCEPTED)
+
+
+class QueryJobDetailView(APIView):
+    """
+    Query Job 상태 조회 / 취소 API
+    """
+
+    http_method_names = ["get", "delete"]
+
+    @swagger_auto_schema(
+        operation_description="작업 상태 조회 (pending, running, succeeded, failed, cancelled)",
+        responses={
+            200: openapi.Response(
+                description="조회 성공",
+                examples={"application/json": {"job_id": "...", "status": "running"}},
+            ),
+            404: openapi.Response(
+                description="작업을 찾을 수 없음 (또는 보관 시간 만료)",
+                examples={"application/json": {"error": "Job not found"}},
+            ),
+        },
+    )
+    def get(self, request, job_id: str):
+        try:
+            job = get_job(job_id)
+        except QueryJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(serialize_job(job), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="작업 취소. 실행 중인 작업은 KILL QUERY로 MySQL 쿼리를 중단합니다.",
+        responses={
+            200: openapi.Response(
+                description="취소 처리 결과 (이미 종료된 작업은 상태가 변경되지 않음)",
+                examples={"application/json": {"job_id": "...", "status": "cancelled"}},
+            ),
+            404: openapi.Response(
+                description="작업을 찾을 수 없음",
+                examples={"application/json": {"error": "Job not found"}},
+            ),
+        },
+    )
+    def delete(self, request, job_id: str):
+        try:
+            job = cancel_job(job_id)
+        except QueryJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(serialize_job(job), status=status.HTTP_200_OK)
+
+
+class QueryJobResultView(APIView):
+    """
+    Query Job 결과 조회 API
+    """
+
+    http_method_names = ["get"]
+
+    @swagger_auto_schema(
+        operation_description="완료된 작업의 실행 결과 조회 (QueryExecutionView 응답과 같은 형식)",
+        responses={
+            200: openapi.Response(description="조회 성공"),
+            404: openapi.Response(
+                description="작업을 찾을 수 없음 (또는 보관 시간 만료)",
+                examples={"application/json": {"error": "Job not found"}},
+            ),
+            409: openapi.Response(
+                description="결과가 없는 상태 (실행 중, 실패, 취소)",
+                examples={"application/json": {"job_id": "...", "status": "running"}},
+            ),
+        },
+    )
+    def get(self, request, job_id: str):
+        try:
+            job = get_job(job_id)
+        except QueryJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != QueryJob.STATUS_SUCCEEDED:
+            return Response(serialize_job(job), status=status.HTTP_409_CONFLICT)
+        return Response(json.loads(job.result), status=status.HTTP_200_OK)
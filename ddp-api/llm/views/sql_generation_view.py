@@ -1,11 +1,19 @@
 # llm/views/sql_generation_view.py
 
+import json
 import logging
 
+from app.renderers import CustomJSONRenderer, EventStreamRenderer, envelope_response
+from app.streaming import streaming_response
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from llm.agents.query_generator import generate_sql_query
+from llm.services.generation_service import agenerate_sql, iter_sql_generation_events
 from llm.services.meta_service import get_filtered_metadata_by_llm
+from llm.services.sql_cache import get_cached_sql
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -13,7 +21,12 @@ from rest_framework.views import APIView
 
 
 class SQLGenerationView(APIView):
-    """자연어 질문 → SQL 쿼리 생성 API"""
+    """
+    자연어 질문 → SQL 쿼리 생성 API
+
+    같은 카탈로그 버전에서 정규화한 질문이 같은 SQL이 이미 실행에 성공했다면
+    LLM 호출 없이 해당 SQL과 새 세션 ID를 반환합니다. (cache_hit: true)
+    """
 
     http_method_names = ["post"]
 
@@ -47,6 +60,7 @@ class SQLGenerationView(APIView):
                         "id": "...",
                         "query": "SELECT ... FROM ... WHERE ...;",
                         "result": "SUCCESS",
+                        "cache_hit": False,
                     }
                 },
             ),
@@ -62,13 +76,108 @@ class SQLGenerationView(APIView):
             return Response({"result": "ERROR", "message": "질문이 비어 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            meta_info = get_filtered_metadata_by_llm(question=question, database_id=database_id)
-            logging.info(f"Meta info: {meta_info}")
+            cached = get_cached_sql(database_id, question)
+            if cached:
+                return Response(cached, status=status.HTTP_200_OK)
+
+            meta_info, meta_tokens = get_filtered_metadata_by_llm(question=question, database_id=database_id)
+            logging.info(f"Meta info ({meta_tokens} tokens): {meta_info}")
             if not meta_info:
                 return Response(
                     {"result": "ERROR", "message": "메타 정보가 없습니다."}, status=status.HTTP_400_BAD_REQUEST
                 )
-            result_json = generate_sql_query(question=question, meta_info=meta_info)
+            result_json = generate_sql_query(question=question, meta_info=meta_info, meta_tokens=meta_tokens)
+            result_json["cache_hit"] = False
             return Response(result_json, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"result": "ERROR", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class SQLGenerationStreamView(APIView):
+    """
+    자연어 질문 → SQL 쿼리 생성 스트리밍 API (Server-Sent Events)
+
+    테이블 선택이 끝나면 stage 이벤트를, 이후 SQL 생성 LLM 응답을 token 이벤트로 도착하는 대로,
+    마지막에 SQLGenerationView와 같은 결과를 result 이벤트로 보냅니다.
+    클라이언트가 연결을 끊으면 진행 중인 LLM 스트림도 중단됩니다.
+    """
+
+    http_method_names = ["post"]
+    renderer_classes = [CustomJSONRenderer, EventStreamRenderer]
+
+    @swagger_auto_schema(
+        operation_description="자연어 질문을 기반으로 SQL 쿼리를 생성하며 진행 상황과 LLM 토큰을 SSE로 스트리밍합니다.",
+        manual_parameters=[
+            openapi.Parameter(
+                name="database_id",
+                in_=openapi.IN_PATH,
+                type=openapi.TYPE_INTEGER,
+                required=True,
+                description="타겟 데이터베이스의 ID",
+            )
+        ],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "question": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="자연어로 된 질문",
+                    example="30대 이상 사용자들의 주문 총액을 알려줘",
+                )
+            },
+            required=["question"],
+        ),
+        responses={
+            200: openapi.Response(
+                description="text/event-stream (stage → token... → result 또는 error)",
+                examples={
+                    "text/event-stream": 'event: stage\ndata: {"stage": "tables_selected", "meta_tokens": 812}\n\n'
+                    'event: token\ndata: {"content": "SELECT"}\n\n'
+                    'event: result\ndata: {"query": "SELECT ...", "result": "SUCCESS", "id": "...", "cache_hit": false}\n\n'
+                },
+            ),
+            400: openapi.Response(
+                description="잘못된 요청",
+                examples={"application/json": {"result": "ERROR"}},
+            ),
+        },
+    )
+    def post(self, request: Request, database_id: int):
+        question = request.data.get("question", "").strip()
+        if not question:
+            return Response({"result": "ERROR", "message": "질문이 비어 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = streaming_response(
+            request, iter_sql_generation_events(database_id, question), content_type="text/event-stream; charset=utf-8"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # NGINX 응답 버퍼링 비활성화
+        return response
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSQLGenerationView(View):
+    """
+    자연어 질문 → SQL 쿼리 생성 API (async)
+
+    SQLGenerationView와 같은 응답을 반환하는 비동기 뷰입니다. LLM 호출(ainvoke)과 ORM 접근을
+    기다리는 동안 이벤트 루프가 다른 요청을 처리하므로, ASGI 서버(app.asgi)로 실행하면
+    한 프로세스가 스레드 수와 관계없이 많은 LLM 요청을 동시에 유지할 수 있습니다.
+    """
+
+    http_method_names = ["post"]
+
+    async def post(self, request, database_id: int):
+        try:
+            question = (json.loads(request.body or b"{}").get("question") or "").strip()
+        except (ValueError, AttributeError):
+            question = ""
+        if not question:
+            return envelope_response(
+                {"result": "ERROR", "message": "질문이 비어 있습니다."}, status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            return envelope_response(await agenerate_sql(database_id, question))
+        except Exception as e:
+            return envelope_response({"result": "ERROR", "message": str(e)}, status.HTTP_400_BAD_REQUEST)